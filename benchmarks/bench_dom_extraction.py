@@ -0,0 +1,105 @@
+"""Micro-benchmark for WebDriver round trips during DOM extraction.
+
+Compares the original per-element extraction (one `find_element` plus one
+`.text` / `get_attribute` request per field or card) with the batched
+`execute_script` extraction used by sysco_scraper, on the local fixtures in
+benchmarks/fixtures. Every WebDriver command is counted, so the round-trip
+reduction is shown independently of network speed.
+
+Usage:
+    python benchmarks/bench_dom_extraction.py [--iterations 20]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sysco_scraper  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+def legacy_read_product_fields(driver):
+    """Per-element field extraction as originally done by `extract_product_details()`."""
+    product_details = {}
+    for field, _, selector, attribute in sysco_scraper.PRODUCT_FIELD_SELECTORS:
+        try:
+            element = driver.find_element(By.CSS_SELECTOR, selector)
+            if attribute:
+                product_details[field] = element.get_attribute(attribute) or "N/A"
+            else:
+                product_details[field] = element.text.strip() or "N/A"
+        except Exception:
+            product_details[field] = "N/A"
+    return product_details
+
+def legacy_get_card_links(driver):
+    """Per-card link extraction as originally done by `get_product_links()`."""
+    links = []
+    for card in driver.find_elements(By.CSS_SELECTOR, "div.product-card-container"):
+        href = card.find_element(By.CSS_SELECTOR, "a.product-card-link").get_attribute("href")
+        if href:
+            links.append(href)
+    return links
+
+def batched_get_card_links(driver):
+    """Batched link extraction as done by `get_product_links()`."""
+    return [href for href in driver.execute_script(sysco_scraper.READ_CARD_LINKS_SCRIPT) if href]
+
+def count_commands(driver):
+    """Wraps `driver.execute` so every WebDriver command is counted."""
+    counter = {'commands': 0}
+    execute = driver.execute
+    
+    def counting_execute(command, params=None):
+        counter['commands'] += 1
+        return execute(command, params)
+    
+    driver.execute = counting_execute
+    return counter
+
+def measure(driver, counter, extract, iterations):
+    """Runs an extractor repeatedly and returns (result, commands per call, ms per call)."""
+    counter['commands'] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = extract(driver)
+    elapsed = time.perf_counter() - start
+    return result, counter['commands'] / iterations, elapsed * 1000 / iterations
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    driver = webdriver.Chrome(options=options)
+    counter = count_commands(driver)
+    
+    try:
+        cases = [
+            ("product_page.html", "product fields", legacy_read_product_fields,
+             lambda d: sysco_scraper.read_product_fields(d, verbose=False)),
+            ("listing_page.html", "card links", legacy_get_card_links, batched_get_card_links),
+        ]
+        print(f"{'extraction':<16}{'mode':<10}{'round trips':>12}{'ms/call':>10}")
+        for fixture, label, legacy, batched in cases:
+            driver.get((FIXTURES / fixture).as_uri())
+            legacy_result, legacy_trips, legacy_ms = measure(driver, counter, legacy, args.iterations)
+            batched_result, batched_trips, batched_ms = measure(driver, counter, batched, args.iterations)
+            if legacy_result != batched_result:
+                print(f"WARNING: {label} differ between modes")
+            print(f"{label:<16}{'legacy':<10}{legacy_trips:>12.0f}{legacy_ms:>10.1f}")
+            print(f"{label:<16}{'batched':<10}{batched_trips:>12.0f}{batched_ms:>10.1f}")
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    main()
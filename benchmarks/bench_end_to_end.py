@@ -0,0 +1,147 @@
+"""End-to-end throughput benchmark against the offline mock Sysco site.
+
+Starts benchmarks/mock_sysco_server.py in the background and runs the full
+`sysco_scraper.main()` pipeline against it (guest sign-in, category
+discovery, paging and product extraction), then reports products per
+second, navigations per product and the peak memory of the scraper and its
+browsers. Scraper options go after `--`. Save a run with --save and compare
+later runs against it with --baseline to catch regressions.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--latency 50] [--jitter 20] [--failure-rate 0.02] -- --workers 2
+    python benchmarks/bench_end_to_end.py --baseline bench_baseline.json -- --profile lean
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mock_sysco_server  # noqa: E402
+import sysco_scraper  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # Peak memory then only covers this process
+    psutil = None
+
+# Requests that are page loads (by the browser or the HTTP fast path); API calls and images are not
+NAVIGATION_KINDS = ('home', 'auth', 'dashboard', 'listing', 'product', 'redirects', 'failures')
+
+def sample_memory(stop, peak, interval=0.2):
+    """Tracks the peak combined RSS of this process and all its children (chromedriver, Chrome)."""
+    process = psutil.Process()
+    while not stop.wait(interval):
+        try:
+            processes = [process] + process.children(recursive=True)
+            rss = 0
+            for child in processes:
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            peak['rss'] = max(peak['rss'], rss)
+        except psutil.Error:
+            pass
+
+def peak_rss_fallback():
+    """Peak RSS of this process alone, used when psutil is not installed."""
+    import resource
+    kilobytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kilobytes * (1 if sys.platform == 'darwin' else 1024)
+
+def run(args, scraper_args):
+    """Runs the scraper against a fresh mock site and returns the benchmark results."""
+    server = mock_sysco_server.start_server(
+        latency=args.latency / 1000, jitter=args.jitter / 1000, failure_rate=args.failure_rate,
+        products=args.products, page_param=not args.ignore_page_param)
+    sysco_scraper.TARGET_ITEMS = args.target
+    
+    peak = {'rss': 0}
+    stop = threading.Event()
+    if psutil is not None:
+        threading.Thread(target=sample_memory, args=(stop, peak), daemon=True).start()
+    
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            argv = ['--base-url', server.base_url, '--no-cache',
+                    '--output', os.path.join(workdir, 'products.csv'),
+                    '--journal', os.path.join(workdir, 'journal.db')] + scraper_args
+            start = time.perf_counter()
+            sysco_scraper.main(argv)
+            elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        server.shutdown()
+    
+    products = sysco_scraper.metrics_summary()['counters'].get('products', 0)
+    navigations = sum(server.stats.get(kind, 0) for kind in NAVIGATION_KINDS)
+    return {
+        'products': products,
+        'seconds': round(elapsed, 2),
+        'products_per_second': round(products / elapsed, 3) if elapsed else 0.0,
+        'navigations': navigations,
+        'navigations_per_product': round(navigations / products, 3) if products else None,
+        'peak_rss_mb': round((peak['rss'] or peak_rss_fallback()) / 2 ** 20, 1),
+        'server': dict(sorted(server.stats.items())),
+        'scraper_args': scraper_args,
+    }
+
+def regressions(result, baseline, tolerance):
+    """Lists the metrics that got worse than the baseline by more than the tolerance."""
+    found = []
+    if result['products_per_second'] < baseline['products_per_second'] * (1 - tolerance):
+        found.append(f"products/s {result['products_per_second']} < baseline {baseline['products_per_second']}")
+    for key in ('navigations_per_product', 'peak_rss_mb'):
+        if result[key] is not None and baseline.get(key) and result[key] > baseline[key] * (1 + tolerance):
+            found.append(f"{key} {result[key]} > baseline {baseline[key]}")
+    return found
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    scraper_args = []
+    if '--' in argv:
+        argv, scraper_args = argv[:argv.index('--')], argv[argv.index('--') + 1:]
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0, help="mean mock response delay in ms")
+    parser.add_argument('--jitter', type=float, default=0, help="+/- delay variation in ms")
+    parser.add_argument('--failure-rate', type=float, default=0, help="share of mock requests answered with 503")
+    parser.add_argument('--products', type=int, default=mock_sysco_server.PRODUCTS_PER_CATEGORY,
+                        help="products per mock category")
+    parser.add_argument('--ignore-page-param', action='store_true',
+                        help="make the mock ignore the page parameter, forcing pagination clicks")
+    parser.add_argument('--target', type=int, default=sysco_scraper.TARGET_ITEMS,
+                        help="stop after this many products")
+    parser.add_argument('--save', metavar='PATH', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='PATH', help="fail if results regress against this saved run")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="allowed relative regression against the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+    
+    result = run(args, scraper_args)
+    print("\nEnd-to-end benchmark")
+    print(f"{'products':<26}{result['products']:>10}")
+    print(f"{'seconds':<26}{result['seconds']:>10.2f}")
+    print(f"{'products/s':<26}{result['products_per_second']:>10.3f}")
+    print(f"{'navigations/product':<26}{result['navigations_per_product'] or 0:>10.3f}")
+    print(f"{'peak RSS (MB)':<26}{result['peak_rss_mb']:>10.1f}")
+    print(f"{'mock requests':<26}{json.dumps(result['server'])}")
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            found = regressions(result, json.load(f), args.tolerance)
+        for message in found:
+            print(f"REGRESSION: {message}")
+        if found:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
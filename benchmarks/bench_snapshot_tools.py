@@ -0,0 +1,90 @@
+"""Throughput benchmark for snapshot_tools.py on synthetic snapshots.
+
+Builds two CSV snapshots of --rows products (the second with some products
+added, removed and changed), then times each diff strategy (in-memory hash
+join, partitioned hash join, sorted merge) and the packaging normalizer,
+vectorized with pyarrow against the row-by-row fallback.
+
+Usage:
+    python benchmarks/bench_snapshot_tools.py [--rows 200000] [--churn 0.05]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import snapshot_tools  # noqa: E402
+
+FIELDS = ['sku', 'brand', 'name', 'packaging', 'image_url', 'description']
+PACKAGINGS = ['1/75CT', '2/5 LB', '4/10#AVG', '9/16Z', '72/2.6OZ', '1/3 GAL', '80/5.00', '2/1 PC', '1/22-25#', '5/EACH', '36/9X6X2', 'Read More"']
+
+def make_snapshots(workdir, rows, churn, seed=0):
+    """Writes old and new snapshots (unsorted, plus copies sorted by SKU) and returns their paths."""
+    rng = random.Random(seed)
+    old = [{'sku': str(1000000 + index), 'brand': f"Brand {index % 300}", 'name': f"Product {index}",
+            'packaging': rng.choice(PACKAGINGS),
+            'image_url': f"https://mediacdn.sysco.com/images/rendition?id={index % 5000:040x}",
+            'description': "Product description is not available"} for index in range(rows)]
+    new = [dict(record) for record in old[int(rows * churn):]]
+    for record in rng.sample(new, int(rows * churn)):
+        record['packaging'] = rng.choice(PACKAGINGS)
+        record['name'] += " NEW"
+    new += [{'sku': str(2000000 + index), 'name': f"New {index}", 'packaging': '1/2 LB'}
+            for index in range(int(rows * churn))]
+    rng.shuffle(old)
+    rng.shuffle(new)
+    
+    paths = {}
+    for name, records in (('old', old), ('new', new), ('old_sorted', sorted(old, key=lambda r: r['sku'])),
+                          ('new_sorted', sorted(new, key=lambda r: r['sku']))):
+        paths[name] = os.path.join(workdir, f"{name}.csv")
+        with open(paths[name], 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS, restval='N/A')
+            writer.writeheader()
+            writer.writerows(records)
+    return paths, [record['packaging'] for record in old]
+
+def time_diff(old_path, new_path, **kwargs):
+    """Runs one diff to completion and returns (seconds, stats)."""
+    stats = snapshot_tools.new_diff_stats()
+    start = time.perf_counter()
+    for _ in snapshot_tools.diff_snapshots(old_path, new_path, stats=stats, **kwargs):
+        pass
+    return time.perf_counter() - start, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000, help="products per snapshot")
+    parser.add_argument('--churn', type=float, default=0.05, help="share of products added, removed and changed")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        paths, packagings = make_snapshots(workdir, args.rows, args.churn)
+        size_mb = os.path.getsize(paths['old']) / 2 ** 20
+        runs = [
+            ("hash join", paths['old'], paths['new'], {}),
+            ("partitioned hash join", paths['old'], paths['new'], {'partition_mb': max(size_mb / 8, 0.1)}),
+            ("sorted merge", paths['old_sorted'], paths['new_sorted'], {'strategy': 'merge'}),
+        ]
+        print(f"\nSnapshot diff ({args.rows} rows, {size_mb:.1f} MB)")
+        for label, old_path, new_path, kwargs in runs:
+            seconds, stats = time_diff(old_path, new_path, **kwargs)
+            print(f"{label:<26}{seconds:>8.2f}s {args.rows / seconds:>12,.0f} rows/s  "
+                  f"+{stats['added']} -{stats['removed']} ~{stats['changed']}")
+    
+    print(f"\nPackaging normalizer ({len(packagings)} values)")
+    normalizers = [("row by row", snapshot_tools.normalize_packaging_rows)]
+    if snapshot_tools.pa is not None:
+        normalizers.append(("vectorized (pyarrow)", snapshot_tools.normalize_packaging))
+    for label, normalize in normalizers:
+        start = time.perf_counter()
+        normalize(packagings)
+        seconds = time.perf_counter() - start
+        print(f"{label:<26}{seconds:>8.3f}s {len(packagings) / seconds:>12,.0f} values/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Offline stand-in for the Sysco site, for benchmarking the scraper end to end.
+
+Serves a synthetic, deterministic catalog through the same flow and markup
+the scraper relies on: the home page's "Shop Now" link, the guest / ZIP code
+sign-in, the dashboard's category grid, listing pages with
+`catalog-cards-wrapper`, `product-card-container` cards, the results total
+and `pagination-btn-right`, a listing JSON API for network capture, and
+product pages with the `data-id` fields. Latency, jitter and a failure rate
+can be injected, and every request is counted so benchmarks can report
+navigations per product.
+
+Only part of this markup comes from the selectors the scraper was written
+against on the live site: the guest sign-in (`Continue as Guest`,
+`initial_zipcode_modal_input`, `Start Shopping`), `category-grid-container` /
+`category-grid-button` with their `lbl_category_...` labels,
+`catalog-cards-wrapper`, `product-card-container` / `product-card-link`,
+`ss-searchPage-header-label-searchResultsTotalText`, `pagination-btn-right` and
+the product page's `data-id` fields. The rest is assumed and has not been
+checked against captured pages or traffic:
+
+* numbered `pagination-btn` buttons with an `active` class on the current page
+  (read by direct paging to confirm which page is shown);
+* `product-card-name` / `product-card-pack-size` on listing cards (read by
+  incremental runs);
+* the `page` and `category` query parameters of `/app/catalog` and the
+  `/app/product-details/opco/<opco>/product/<sku>` product URLs;
+* the listing JSON API at `/api/catalog`, answering
+  `{"results": [{"supc", "brand", "name", "packSize", "imageUrl"}], "totalResults"}`
+  (network capture accepts several key spellings; the mock only serves these);
+* image URLs of the form `.../rendition?id=<hash>` served from `/images/`;
+* the session kept in a `guest_zip` cookie plus a `guestZip` localStorage entry.
+
+Benchmarks of those code paths measure the scraper against these shapes; if
+the live site differs, the numbers say nothing about it.
+
+Usage:
+    python benchmarks/mock_sysco_server.py [--port 8765] [--latency 50] [--jitter 20] [--failure-rate 0.02]
+    python sysco_scraper.py --base-url http://127.0.0.1:8765/ --no-cache
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sysco_scraper  # noqa: E402
+
+PRODUCTS_PER_CATEGORY = 96
+OPCO = "056"
+SESSION_COOKIE = "guest_zip"
+
+# Word lists the synthetic product names, brands and pack sizes are drawn from
+BRANDS = ["Sysco Classic", "Sysco Imperial", "Packer", "Wholesome Farms", "Casa Solana", "Block & Barrel"]
+ADJECTIVES = ["Fresh", "Frozen", "Organic", "Sliced", "Whole", "Diced", "Premium", "Petite"]
+NOUNS = ["Banana", "Cucumber", "Salmon Fillet", "Sourdough Loaf", "Cheddar", "Tomato Paste", "Cola",
+         "Chafing Fuel", "Foam Container", "Degreaser", "Chicken Breast", "Mushroom"]
+PACK_SIZES = ["1/75CT", "1/36CT", "1/10 LB", "4/1 GAL", "6/#10 CAN", "2/5 LB", "24/12 OZ", "500/CT"]
+
+# A 1x1 transparent GIF served for every product image
+PIXEL_GIF = (b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+             b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;")
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title} | Sysco Shop</title></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+SHOP_BODY = """<div class="guest-landing">
+  <button onclick="showZipModal()">Continue as Guest</button>
+  <div id="modal-root"></div>
+</div>
+<script>
+function showZipModal() {
+  document.getElementById('modal-root').innerHTML =
+    '<input data-id="initial_zipcode_modal_input" type="text">' +
+    '<button onclick="startShopping()">Start Shopping</button>';
+}
+function startShopping() {
+  var zip = document.querySelector("input[data-id='initial_zipcode_modal_input']").value || '00000';
+  document.cookie = '""" + SESSION_COOKIE + """=' + encodeURIComponent(zip) + '; path=/';
+  window.localStorage.setItem('guestZip', zip);
+  window.location.href = '/app/dashboard';
+}
+</script>"""
+
+CATALOG_SCRIPT = """<script>
+fetch('/api/catalog' + window.location.search).then(function (response) { return response.json(); });
+</script>"""
+
+def catalog(products_per_category=PRODUCTS_PER_CATEGORY):
+    """Builds the synthetic catalog.
+    
+    Args:
+        products_per_category (int, optional): Products listed in every category.
+    
+    Returns:
+        dict: Product lists keyed by category id, and 'by_sku' mapping every SKU to its product.
+    """
+    categories = {}
+    by_sku = {}
+    for index, category in enumerate(sysco_scraper.CATEGORIES):
+        products = []
+        for position in range(products_per_category):
+            sku = str(1000000 + index * 100000 + position)
+            rng = random.Random(sku)
+            name = f"{rng.choice(NOUNS)} {rng.choice(ADJECTIVES)}"
+            product = {
+                'sku': sku,
+                'brand': rng.choice(BRANDS),
+                'name': name,
+                'packaging': rng.choice(PACK_SIZES),
+                'image_id': hashlib.sha1(sku.encode()).hexdigest(),
+                'description': f"{name} from the {category['name']} aisle, item {position + 1}.",
+            }
+            products.append(product)
+            by_sku[sku] = product
+        categories[category['id']] = products
+    return {'categories': categories, 'by_sku': by_sku}
+
+def product_path(sku):
+    """Returns the path of a product page."""
+    return f"/app/product-details/opco/{OPCO}/product/{sku}"
+
+class MockSyscoHandler(BaseHTTPRequestHandler):
+    """Serves the mock site; configuration and counters live on the server."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        path = parts.path.rstrip('/') or '/'
+        
+        if path.startswith('/images/'):
+            self.count('images')
+            return self.respond(200, PIXEL_GIF, 'image/gif')
+        
+        self.delay()
+        if path == '/':
+            self.count('home')
+            return self.page("Home", '<a href="/shop">Shop Now</a>')
+        if path == '/shop':
+            self.count('auth')
+            return self.page("Welcome", SHOP_BODY)
+        
+        # Everything in the shop needs a guest session
+        if SESSION_COOKIE not in self.headers.get('Cookie', ''):
+            self.count('redirects')
+            return self.respond(302, b"", 'text/plain', {'Location': '/shop'})
+        
+        if path == '/app/dashboard':
+            self.count('dashboard')
+            return self.page("Dashboard", self.dashboard_body())
+        if path in ('/app/catalog', '/api/catalog'):
+            kind = 'api' if path.startswith('/api') else 'listing'
+            products = self.server.catalog['categories'].get(query.get('category'))
+            if products is None:
+                return self.not_found()
+            if self.inject_failure(kind):
+                return
+            page = self.page_number(query, len(products))
+            start = (page - 1) * sysco_scraper.ITEMS_PER_PAGE
+            shown = products[start:start + sysco_scraper.ITEMS_PER_PAGE]
+            self.count(kind)
+            if kind == 'api':
+                return self.json_response({'results': [self.api_record(product) for product in shown],
+                                           'totalResults': len(products)})
+            return self.page("Catalog", self.listing_body(query['category'], page, start, shown, len(products)))
+        if path.startswith('/app/product-details/'):
+            product = self.server.catalog['by_sku'].get(path.rsplit('/', 1)[-1])
+            if product is None:
+                return self.not_found()
+            if self.inject_failure('product'):
+                return
+            self.count('product')
+            return self.page(product['name'], self.product_body(product))
+        return self.not_found()
+    
+    # Responses
+    
+    def respond(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def page(self, title, body):
+        document = PAGE.format(title=html.escape(title), body=body)
+        self.respond(200, document.encode('utf-8'), 'text/html; charset=utf-8')
+    
+    def json_response(self, payload):
+        self.respond(200, json.dumps(payload).encode('utf-8'), 'application/json')
+    
+    def not_found(self):
+        self.count('not_found')
+        self.respond(404, b"Not found", 'text/plain')
+    
+    # Injected latency and failures
+    
+    def delay(self):
+        config = self.server.config
+        seconds = config['latency'] + random.uniform(-config['jitter'], config['jitter'])
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    def inject_failure(self, kind):
+        """Answers with a 503 at the configured rate; returns True if it did."""
+        if random.random() >= self.server.config['failure_rate']:
+            return False
+        self.count('failures')
+        self.count(f'failures:{kind}')
+        self.respond(503, b"Service temporarily unavailable", 'text/plain')
+        return True
+    
+    def count(self, name):
+        with self.server.stats_lock:
+            self.server.stats[name] = self.server.stats.get(name, 0) + 1
+    
+    # Page bodies
+    
+    def page_number(self, query, total):
+        pages = max(1, -(-total // sysco_scraper.ITEMS_PER_PAGE))
+        if not self.server.config['page_param']:
+            return 1  # Simulate a site that ignores the page parameter
+        try:
+            return min(max(1, int(query.get('page', 1))), pages)
+        except ValueError:
+            return 1
+    
+    def dashboard_body(self):
+        buttons = "\n".join(
+            f'  <div class="category-grid-button" '
+            f'onclick="window.location.href=\'/app/catalog?category={category["id"]}\'">'
+            f'<span data-id="lbl_category_app.dashboard.{category["id"]}.title">'
+            f'{html.escape(category["name"])}</span></div>'
+            for category in sysco_scraper.CATEGORIES
+        )
+        return f'<div class="category-grid-container">\n{buttons}\n</div>'
+    
+    def listing_body(self, category_id, page, start, products, total):
+        pages = max(1, -(-total // sysco_scraper.ITEMS_PER_PAGE))
+        cards = "\n".join(
+            f'  <div class="product-card-container">'
+            f'<a class="product-card-link" href="{product_path(product["sku"])}">'
+            f'<div data-id="product-card-name" class="product-card-name">{html.escape(product["name"])}</div>'
+            f'<div data-id="product-card-pack-size" class="product-card-pack-size">'
+            f'{html.escape(product["packaging"])}</div></a></div>'
+            for product in products
+        )
+        numbers = "".join(
+            f'<button class="pagination-btn{" active" if number == page else ""}">{number}</button>'
+            for number in range(max(1, page - 2), min(pages, page + 2) + 1)
+        )
+        next_page = f"/app/catalog?category={category_id}&page={page + 1}"
+        next_button = (f'<button class="pagination-btn-right" '
+                       f'onclick="window.location.href=\'{next_page}\'"'
+                       f'{" disabled" if page >= pages else ""}>Next</button>')
+        return (f'<span data-id="ss-searchPage-header-label-searchResultsTotalText">'
+                f'Showing {start + 1} - {start + len(products)} of {total} results</span>\n'
+                f'<div class="catalog-cards-wrapper">\n{cards}\n</div>\n'
+                f'<div class="pagination">{numbers}{next_button}</div>\n{CATALOG_SCRIPT}')
+    
+    def product_body(self, product):
+        image = self.image_url(product)
+        return f"""<div class="image-header-info-section">
+  <img data-id="main-product-img-v2" alt="{html.escape(product['name'])}" src="{image}">
+  <button data-id="product_brand_link">{html.escape(product['brand'])}</button>
+  <div data-id="product_name">{html.escape(product['name'])}</div>
+  <div data-id="product_id">{product['sku']}</div>
+  <div data-id="pack_size">{html.escape(product['packaging'])}</div>
+</div>
+<div data-id="product_description_text">{html.escape(product['description'])}</div>"""
+
+    def api_record(self, product):
+        return {'supc': product['sku'], 'brand': product['brand'], 'name': product['name'],
+                'packSize': product['packaging'], 'imageUrl': self.image_url(product)}
+    
+    def image_url(self, product):
+        # Absolute like the live site's CDN URLs
+        return f"http://{self.headers.get('Host')}/images/rendition?id={product['image_id']}"
+
+def start_server(port=0, latency=0.0, jitter=0.0, failure_rate=0.0, products=PRODUCTS_PER_CATEGORY,
+                 page_param=True):
+    """Starts the mock site in a background thread.
+    
+    Args:
+        port (int, optional): Port to listen on, 0 for any free port. Defaults to 0.
+        latency (float, optional): Mean delay of every page and API response, in seconds.
+        jitter (float, optional): Uniform +/- variation of the delay, in seconds.
+        failure_rate (float, optional): Share of listing, API and product requests answered with a 503.
+        products (int, optional): Products per category. Defaults to PRODUCTS_PER_CATEGORY.
+        page_param (bool, optional): Honour the listing page URL parameter. Defaults to True.
+    
+    Returns:
+        ThreadingHTTPServer: Running server; its `base_url` is the home page and
+            `stats` counts requests by kind. Stop it with `shutdown()`.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockSyscoHandler)
+    server.daemon_threads = True
+    server.config = {'latency': latency, 'jitter': jitter, 'failure_rate': failure_rate,
+                     'page_param': page_param}
+    server.catalog = catalog(products)
+    server.stats = {}
+    server.stats_lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help="mean response delay in ms")
+    parser.add_argument('--jitter', type=float, default=0, help="+/- delay variation in ms")
+    parser.add_argument('--failure-rate', type=float, default=0, help="share of requests answered with 503")
+    parser.add_argument('--products', type=int, default=PRODUCTS_PER_CATEGORY, help="products per category")
+    parser.add_argument('--ignore-page-param', action='store_true',
+                        help="ignore the listing page parameter, forcing pagination clicks")
+    args = parser.parse_args(argv)
+    
+    server = start_server(args.port, args.latency / 1000, args.jitter / 1000, args.failure_rate,
+                          args.products, not args.ignore_page_param)
+    print(f"Mock Sysco site on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(server.stats, indent=2, sort_keys=True))
+
+if __name__ == "__main__":
+    main()
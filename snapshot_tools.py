@@ -0,0 +1,479 @@
+"""Diff and normalize product snapshots written by sysco_scraper.py.
+
+`diff` compares two snapshots by SKU and reports added, removed and changed
+products, streaming both files so memory stays bounded however large they
+grow. `normalize` parses the free-text `packaging` field (`1/75CT`,
+`4/10#AVG`, `6/2 LB`) into pack count, size and unit columns, a whole batch
+at a time. Snapshots may be CSV, JSONL or Parquet (needs pyarrow); pyarrow
+also makes normalizing vectorized, and without it rows are parsed one by one.
+
+Usage:
+    python snapshot_tools.py diff OLD.csv NEW.csv [--output changes.csv] [--fields name packaging]
+    python snapshot_tools.py diff OLD.csv NEW.csv --strategy merge     # both sorted by SKU
+    python snapshot_tools.py normalize sysco_products.csv --output sysco_products_normalized.csv
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import tempfile
+import zlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for Parquet snapshots and vectorized normalizing
+    pa = None
+
+# The old snapshot is hashed in partitions of at most this many megabytes of file
+PARTITION_MB = 64
+
+# Records normalized per batch
+NORMALIZE_BATCH = 10000
+
+# The whole value must be "<count>/<size>[-<size_max>]<unit>[AVG]" (1/75CT, 6/2 LB, 9/16Z,
+# 1/22-25#, 4/10#AVG) or "<count>/<unit>" (5/EACH, 1/BLK); without "<count>/" it is one pack.
+# Anything else (360/3/8OZ, 36/9X6X2, Read More) is left unparsed rather than guessed at.
+_PACKAGING_SIZE = r'\d+(?:\.\d+)?|\.\d+'
+PACKAGING_PATTERN = (
+    r'^(?:(?P<count>\d+)\s*/\s*)?'
+    r'(?:(?P<size>' + _PACKAGING_SIZE + r')(?:\s*-\s*(?P<size_max>' + _PACKAGING_SIZE + r'))?'
+    r'\s*(?P<unit>#|"|[A-Z]+)?|(?P<bare_unit>[A-Z]+))'
+    r'\s*(?:AVG)?$'
+)
+PACKAGING_RE = re.compile(PACKAGING_PATTERN)
+PACKAGING_COLUMNS = ['pack_count', 'pack_size', 'pack_size_max', 'pack_unit']
+
+# Spellings of the same unit in Sysco pack sizes ('AVG', for catch weight, is dropped before this)
+UNIT_ALIASES = {
+    '#': 'LB', 'LBS': 'LB', 'Z': 'OZ', 'OZS': 'OZ', 'FZ': 'FLOZ', 'GR': 'G', 'GM': 'G', 'GRM': 'G',
+    'GA': 'GAL', 'GL': 'GAL', 'LT': 'L', 'LTR': 'L', 'CNT': 'CT', 'COUNT': 'CT', 'PCS': 'PC', 'EACH': 'EA',
+    '"': 'IN',
+}
+
+def iter_snapshot(path):
+    """Streams the records of a snapshot file.
+    
+    Args:
+        path (str): CSV, JSONL or Parquet file, told apart by extension.
+    
+    Yields:
+        dict: One record per product row.
+    
+    Raises:
+        ValueError: If the file is Parquet and pyarrow is not installed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        if pa is None:
+            raise ValueError("Parquet snapshots need pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=NORMALIZE_BATCH):
+            yield from batch.to_pylist()
+        return
+    
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension == '.jsonl':
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+def snapshot_fields(path):
+    """Column names of a snapshot, read from its first record."""
+    for record in iter_snapshot(path):
+        return list(record)
+    return []
+
+def open_writer(path, fields):
+    """Opens a CSV or JSONL output (told apart by extension) for `write_rows()`."""
+    writer = {'file': open(path, 'w', newline='', encoding='utf-8'), 'fields': fields, 'count': 0}
+    if os.path.splitext(path)[1].lower() != '.jsonl':
+        writer['csv'] = csv.DictWriter(writer['file'], fieldnames=fields, restval='', extrasaction='ignore')
+        writer['csv'].writeheader()
+    return writer
+
+def write_rows(writer, rows):
+    """Writes a batch of records to an output opened by `open_writer()`."""
+    if 'csv' in writer:
+        writer['csv'].writerows(rows)
+    else:
+        writer['file'].write(''.join(
+            json.dumps({field: row.get(field) for field in writer['fields']}, ensure_ascii=False) + '\n'
+            for row in rows))
+    writer['count'] += len(rows)
+
+def _text(value):
+    """Value as compared between snapshots; surrounding whitespace does not count as a change."""
+    return '' if value is None else str(value).strip()
+
+def keyed_records(path, stats):
+    """Streams (sku, record) pairs, skipping records that have no SKU to match on."""
+    for record in iter_snapshot(path):
+        sku = _text(record.get('sku'))
+        if not sku or sku == "N/A":
+            stats['unkeyed'] += 1
+            continue
+        yield sku, record
+
+def compare_records(sku, old, new, fields, stats):
+    """Compares the two versions of a product.
+    
+    Returns:
+        dict or None: 'changed' record naming the fields that differ, or None
+            if the product is unchanged.
+    """
+    changed = [field for field in fields if _text(old.get(field)) != _text(new.get(field))]
+    if not changed:
+        stats['unchanged'] += 1
+        return None
+    stats['changed'] += 1
+    for field in changed:
+        stats['fields'][field] = stats['fields'].get(field, 0) + 1
+    return {'change': 'changed', 'sku': sku, 'changed_fields': changed, 'old': old, 'record': new}
+
+def hash_join(old_items, new_items, fields, stats):
+    """Diffs two streams of (sku, record) pairs by holding the old one in a dict.
+    
+    A SKU that appears more than once in a snapshot keeps its first record.
+    
+    Yields:
+        dict: One change per added, removed or changed product.
+    """
+    old = {}
+    for sku, record in old_items:
+        if sku in old:
+            stats['duplicates'] += 1
+        else:
+            old[sku] = record
+    
+    seen = set()
+    for sku, record in new_items:
+        if sku in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(sku)
+        previous = old.pop(sku, None)
+        if previous is None:
+            stats['added'] += 1
+            yield {'change': 'added', 'sku': sku, 'changed_fields': [], 'old': None, 'record': record}
+        else:
+            change = compare_records(sku, previous, record, fields, stats)
+            if change:
+                yield change
+    
+    for sku, record in old.items():
+        stats['removed'] += 1
+        yield {'change': 'removed', 'sku': sku, 'changed_fields': [], 'old': record, 'record': record}
+
+def partition_records(items, partitions, workdir, name):
+    """Spreads (sku, record) pairs over JSONL partition files by a hash of the SKU.
+    
+    Returns:
+        list[str]: Partition file paths; a SKU always lands in the same partition.
+    """
+    paths = [os.path.join(workdir, f"{name}_{index}.jsonl") for index in range(partitions)]
+    files = [open(path, 'w', encoding='utf-8') for path in paths]
+    try:
+        for sku, record in items:
+            files[zlib.crc32(sku.encode('utf-8')) % partitions].write(
+                json.dumps([sku, record], ensure_ascii=False) + '\n')
+    finally:
+        for file in files:
+            file.close()
+    return paths
+
+def read_partition(path):
+    """Streams the (sku, record) pairs of a partition file."""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            sku, record = json.loads(line)
+            yield sku, record
+
+def diff_hashed(old_path, new_path, fields, stats, partition_mb=PARTITION_MB):
+    """Hash-join diff of two unsorted snapshots.
+    
+    A snapshot that fits in `partition_mb` is joined in memory. Larger ones
+    are first split into SKU-hash partitions on disk (a Grace hash join), so
+    only one partition of the old snapshot is held in memory at a time.
+    
+    Yields:
+        dict: One change per added, removed or changed product.
+    """
+    partitions = max(1, math.ceil(os.path.getsize(old_path) / (partition_mb * 2 ** 20)))
+    if partitions == 1:
+        yield from hash_join(keyed_records(old_path, stats), keyed_records(new_path, stats), fields, stats)
+        return
+    
+    with tempfile.TemporaryDirectory(prefix='snapshot_diff_') as workdir:
+        old_parts = partition_records(keyed_records(old_path, stats), partitions, workdir, 'old')
+        new_parts = partition_records(keyed_records(new_path, stats), partitions, workdir, 'new')
+        for old_part, new_part in zip(old_parts, new_parts):
+            yield from hash_join(read_partition(old_part), read_partition(new_part), fields, stats)
+
+def sorted_records(path, stats):
+    """Streams (sku, record) pairs of a snapshot sorted by SKU, checking the order.
+    
+    Raises:
+        ValueError: If a SKU sorts before the one preceding it.
+    """
+    previous = None
+    for sku, record in keyed_records(path, stats):
+        if previous is not None and sku <= previous:
+            if sku == previous:
+                stats['duplicates'] += 1
+                continue
+            raise ValueError(f"{path} is not sorted by SKU ({sku} after {previous}); "
+                             "use the hash strategy")
+        previous = sku
+        yield sku, record
+
+def diff_sorted(old_path, new_path, fields, stats):
+    """Sorted-merge diff of two snapshots that are both sorted by SKU as text.
+    
+    Holds one record of each snapshot in memory at a time.
+    
+    Yields:
+        dict: One change per added, removed or changed product, in SKU order.
+    """
+    old_items = sorted_records(old_path, stats)
+    new_items = sorted_records(new_path, stats)
+    old = next(old_items, None)
+    new = next(new_items, None)
+    while old or new:
+        if new is None or (old is not None and old[0] < new[0]):
+            stats['removed'] += 1
+            yield {'change': 'removed', 'sku': old[0], 'changed_fields': [], 'old': old[1], 'record': old[1]}
+            old = next(old_items, None)
+        elif old is None or new[0] < old[0]:
+            stats['added'] += 1
+            yield {'change': 'added', 'sku': new[0], 'changed_fields': [], 'old': None, 'record': new[1]}
+            new = next(new_items, None)
+        else:
+            change = compare_records(new[0], old[1], new[1], fields, stats)
+            if change:
+                yield change
+            old = next(old_items, None)
+            new = next(new_items, None)
+
+def new_diff_stats():
+    """Counters filled in by `diff_snapshots()` as its changes are consumed."""
+    return {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 0, 'duplicates': 0, 'unkeyed': 0,
+            'fields': {}}
+
+def diff_snapshots(old_path, new_path, fields=None, strategy='hash', stats=None, partition_mb=PARTITION_MB):
+    """Diffs two snapshots by SKU.
+    
+    Args:
+        old_path (str): Earlier snapshot.
+        new_path (str): Later snapshot.
+        fields (list[str], optional): Fields to compare. Defaults to every
+            column the snapshots share except the SKU.
+        strategy (str, optional): 'hash' for any snapshots, or 'merge' for
+            snapshots already sorted by SKU as text. Defaults to 'hash'.
+        stats (dict, optional): Counters from `new_diff_stats()` to fill in.
+        partition_mb (int, optional): Most of the old snapshot the hash
+            strategy joins in memory at once. Defaults to PARTITION_MB.
+    
+    Yields:
+        dict: One change per product with keys 'change' ('added', 'removed'
+            or 'changed'), 'sku', 'changed_fields', 'old' (the earlier record,
+            None if added) and 'record' (the later record, or the earlier one
+            if removed).
+    
+    Raises:
+        ValueError: If the strategy is unknown, or 'merge' meets unsorted input.
+    """
+    stats = new_diff_stats() if stats is None else stats
+    if fields is None:
+        new_fields = set(snapshot_fields(new_path))
+        fields = [field for field in snapshot_fields(old_path) if field in new_fields and field != 'sku']
+    
+    if strategy == 'hash':
+        yield from diff_hashed(old_path, new_path, fields, stats, partition_mb)
+    elif strategy == 'merge':
+        yield from diff_sorted(old_path, new_path, fields, stats)
+    else:
+        raise ValueError(f"unknown diff strategy: {strategy}")
+
+def print_diff_report(stats):
+    """Prints the counts of a finished diff."""
+    print(f"added {stats['added']}, removed {stats['removed']}, changed {stats['changed']}, "
+          f"unchanged {stats['unchanged']}")
+    if stats['duplicates'] or stats['unkeyed']:
+        print(f"skipped {stats['duplicates']} duplicate SKUs and {stats['unkeyed']} records without a SKU")
+    for field, count in sorted(stats['fields'].items(), key=lambda item: -item[1]):
+        print(f"  {field:<16}{count:>8} changed")
+
+def normalize_packaging_rows(values):
+    """Row-by-row fallback of `normalize_packaging()` for when pyarrow is missing."""
+    columns = {column: [] for column in PACKAGING_COLUMNS}
+    for value in values:
+        match = PACKAGING_RE.match(value.strip().upper()) if isinstance(value, str) else None
+        if match:
+            unit = re.sub('AVG$', '', match['unit'] or match['bare_unit'] or '') or None
+            size = float(match['size']) if match['size'] else 1.0  # "5/EACH" is 5 packs of one
+            columns['pack_count'].append(int(match['count']) if match['count'] else 1)
+            columns['pack_size'].append(size)
+            columns['pack_size_max'].append(float(match['size_max']) if match['size_max'] else size)
+            columns['pack_unit'].append(UNIT_ALIASES.get(unit, unit))
+        else:
+            for column in PACKAGING_COLUMNS:
+                columns[column].append(None)
+    return columns
+
+def _empty_to_null(array):
+    """Turns the empty strings `extract_regex` leaves for unmatched groups into nulls."""
+    return pc.if_else(pc.equal(array, ''), pa.scalar(None, pa.string()), array)
+
+def normalize_packaging(values):
+    """Parses a batch of packaging strings into pack count, size and unit.
+    
+    `4/10#AVG` becomes 4 packs of 10.0 LB, `9/16Z` 9 packs of 16.0 OZ,
+    `1/22-25#` one pack of 22.0 to 25.0 LB and `5/EACH` 5 packs of 1.0 EA;
+    unit spellings are unified through UNIT_ALIASES. Values that do not
+    match PACKAGING_PATTERN as a whole are left unparsed. With pyarrow the
+    whole batch is parsed by vectorized compute kernels in one pass per
+    step; otherwise each value is matched on its own.
+    
+    Args:
+        values (list[str] or pyarrow.Array or pandas.Series): Packaging
+            strings; None or NaN for missing ones.
+    
+    Returns:
+        dict: Lists 'pack_count' (int), 'pack_size' and 'pack_size_max'
+            (float, equal unless the size is a range) and 'pack_unit' (str),
+            aligned with `values`, all None where the packaging could not be
+            parsed. A pandas DataFrame takes them with
+            `df.assign(**normalize_packaging(df['packaging']))`.
+    """
+    if pa is None:
+        return normalize_packaging_rows(values)
+    
+    if not isinstance(values, (pa.Array, pa.ChunkedArray)):
+        values = pa.array(values, type=pa.string(), from_pandas=True)
+    parts = pc.extract_regex(pc.utf8_upper(pc.utf8_trim_whitespace(values)), PACKAGING_PATTERN)
+    
+    matched = pc.is_valid(parts)  # Rows that do not match as a whole have a null struct
+    
+    # A bare unit ("5/EACH") is a size of one
+    size = pc.cast(_empty_to_null(pc.struct_field(parts, 'size')), pa.float64())
+    size = pc.if_else(matched, pc.coalesce(size, pa.scalar(1.0)), pa.scalar(None, pa.float64()))
+    size_max = pc.coalesce(pc.cast(_empty_to_null(pc.struct_field(parts, 'size_max')), pa.float64()), size)
+    count = pc.cast(_empty_to_null(pc.struct_field(parts, 'count')), pa.int64())
+    count = pc.if_else(matched, pc.coalesce(count, pa.scalar(1, pa.int64())), pa.scalar(None, pa.int64()))
+    
+    unit = pc.coalesce(_empty_to_null(pc.struct_field(parts, 'unit')),
+                       _empty_to_null(pc.struct_field(parts, 'bare_unit')))
+    unit = _empty_to_null(pc.replace_substring_regex(unit, 'AVG$', ''))
+    aliased = pc.take(pa.array(list(UNIT_ALIASES.values())),
+                      pc.index_in(unit, value_set=pa.array(list(UNIT_ALIASES))))
+    
+    return {'pack_count': count.to_pylist(),
+            'pack_size': size.to_pylist(),
+            'pack_size_max': size_max.to_pylist(),
+            'pack_unit': pc.coalesce(aliased, unit).to_pylist()}
+
+def normalize_snapshot(input_path, output_path, batch_size=NORMALIZE_BATCH):
+    """Writes a copy of a snapshot with pack count, size and unit columns added.
+    
+    Args:
+        input_path (str): Snapshot to normalize.
+        output_path (str): CSV or JSONL output file.
+        batch_size (int, optional): Records parsed per batch. Defaults to NORMALIZE_BATCH.
+    
+    Returns:
+        int: Number of records written.
+    """
+    fields = snapshot_fields(input_path)
+    writer = open_writer(output_path, fields + [column for column in PACKAGING_COLUMNS if column not in fields])
+    
+    def flush(batch):
+        columns = normalize_packaging([record.get('packaging') for record in batch])
+        for index, record in enumerate(batch):
+            for column in PACKAGING_COLUMNS:
+                record[column] = columns[column][index]
+        write_rows(writer, batch)
+    
+    try:
+        batch = []
+        for record in iter_snapshot(input_path):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        flush(batch)
+    finally:
+        writer['file'].close()
+    return writer['count']
+
+def parse_args(argv=None):
+    """Parses command line options.
+    
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+    
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Diff and normalize Sysco product snapshots.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    diff = commands.add_parser('diff', help="report added, removed and changed products between two snapshots")
+    diff.add_argument('old', help="earlier snapshot (CSV, JSONL or Parquet)")
+    diff.add_argument('new', help="later snapshot")
+    diff.add_argument('--output', default=None,
+                      help="write one row per change to this CSV or JSONL file: change, changed_fields "
+                           "and the product's fields")
+    diff.add_argument('--fields', nargs='+', default=None,
+                      help="fields to compare (default: every shared column except sku)")
+    diff.add_argument('--strategy', choices=['hash', 'merge'], default='hash',
+                      help="'hash' works on any snapshots; 'merge' streams snapshots already sorted by SKU "
+                           "as text (default: hash)")
+    diff.add_argument('--partition-mb', type=int, default=PARTITION_MB,
+                      help=f"most of the old snapshot the hash strategy holds in memory at once "
+                           f"(default: {PARTITION_MB})")
+    
+    normalize = commands.add_parser('normalize', help="add pack_count, pack_size, pack_size_max and pack_unit columns")
+    normalize.add_argument('input', help="snapshot to normalize (CSV, JSONL or Parquet)")
+    normalize.add_argument('--output', default=None,
+                           help="CSV or JSONL output (default: <input>_normalized.csv)")
+    normalize.add_argument('--batch-size', type=int, default=NORMALIZE_BATCH,
+                           help=f"records parsed per batch (default: {NORMALIZE_BATCH})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Runs the `diff` or `normalize` command.
+    
+    Args:
+        argv (list[str], optional): Command line arguments. Defaults to sys.argv.
+    """
+    args = parse_args(argv)
+    if args.command == 'normalize':
+        output_path = args.output or f"{os.path.splitext(args.input)[0]}_normalized.csv"
+        count = normalize_snapshot(args.input, output_path, args.batch_size)
+        print(f"Normalized {count} records into {output_path}")
+        return
+    
+    stats = new_diff_stats()
+    changes = diff_snapshots(args.old, args.new, args.fields, args.strategy, stats, args.partition_mb)
+    if args.output:
+        fields = ['change', 'changed_fields'] + snapshot_fields(args.new)
+        writer = open_writer(args.output, fields)
+        try:
+            for change in changes:
+                write_rows(writer, [dict(change['record'], change=change['change'],
+                                         changed_fields=';'.join(change['changed_fields']))])
+        finally:
+            writer['file'].close()
+        print(f"Wrote {writer['count']} changes to {args.output}")
+    else:
+        for _ in changes:
+            pass
+    print_diff_report(stats)
+
+if __name__ == "__main__":
+    main()
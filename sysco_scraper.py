@@ -2,36 +2,776 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import argparse
+import functools
+import hashlib
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from html.parser import HTMLParser
+import queue
+import threading
 import time
 import csv
 import re
+import socket
+import sqlite3
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
-def setup_driver():
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:  # Only needed for the optional HTTP fast path
+    requests = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for Parquet output
+    pa = None
+
+try:
+    import psutil
+except ImportError:  # Only needed to recycle browsers by memory use
+    psutil = None
+
+# Stop collecting once this many products have been gathered
+TARGET_ITEMS = 3000
+
+# Categories shown in the shop's category grid
+CATEGORIES = [
+    {'id': 'produce', 'name': 'Produce'},
+    {'id': 'meatseafood', 'name': 'Meat & Seafood'},
+    {'id': 'bakerybread', 'name': 'Bakery & Breads'},
+    {'id': 'dairyeggs', 'name': 'Dairy & Eggs'},
+    {'id': 'canneddry', 'name': 'Canned & Dry'},
+    {'id': 'frozenfoods', 'name': 'Frozen Foods'},
+    {'id': 'beverages', 'name': 'Beverages'},
+    {'id': 'equipmentsupplies', 'name': 'Equipment & Supplies'},
+    {'id': 'disposables', 'name': 'Disposables'},
+    {'id': 'chemicals', 'name': 'Chemicals'}
+]
+
+# Guest sessions are opened for this ZIP code (Oregon)
+ZIP_CODE = "97201"
+
+# Multi-ZIP output: one row per SKU listed in a ZIP code, joined with its shared product content
+MULTI_ZIP_FIELDS = ['zip', 'sku', 'category', 'brand', 'name', 'packaging', 'image_url', 'description']
+
+# Site home page the guest sign-in starts from (a local mock site can stand in for it)
+HOME_URL = "https://www.sysco.com"
+
+# Startup cache: guest sessions per ZIP code and discovered category URLs
+CACHE_PATH = "sysco_cache.json"
+SESSION_CACHE_TTL = 12 * 60 * 60
+CATEGORY_CACHE_TTL = 7 * 24 * 60 * 60
+SESSION_CHECK_TIMEOUT = 5  # Seconds a restored session gets to show the category grid
+
+# Browsers are restarted after serving this many listing pages or growing past this RSS
+RECYCLE_PAGES = 200
+RECYCLE_RSS_MB = 2048
+
+# Cookie fields accepted by the DevTools Network.setCookies command
+CDP_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+# Work units are retried on a fresh browser this many times before being dropped
+MAX_TASK_ATTEMPTS = 3
+
+# A product record needs at least this many fields that are not "N/A"
+MIN_VALID_FIELDS = 3
+
+# Resources the lean browser profile never downloads (Chrome URL patterns, * is a wildcard)
+LEAN_BLOCKED_URLS = [
+    # Images and media, only the image URL string is scraped
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*mediacdn.sysco.com/images/*',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    # Fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Third-party analytics and trackers
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*nr-data.net*',
+    '*newrelic.com*', '*optimizely.com*', '*segment.io*', '*segment.com*',
+    '*quantummetric.com*', '*adobedtm.com*', '*demdex.net*', '*omtrdc.net*',
+    '*bing.com/bat*', '*clarity.ms*', '*linkedin.com/px*', '*tiktok.com*',
+]
+
+# Listing pages show this many product cards; page k is addressed with ?<PAGE_PARAM>=k
+ITEMS_PER_PAGE = 24
+PAGE_PARAM = 'page'
+
+# HTTP fast path: parallel requests per browser session and per-request timeout
+HTTP_THREADS = 8
+HTTP_TIMEOUT = 15
+
+# Product page elements read by both the browser and the HTTP parser (data-id -> field)
+PRODUCT_FIELD_DATA_IDS = {
+    'product_id': 'sku',
+    'product_brand_link': 'brand',
+    'product_name': 'name',
+    'pack_size': 'packaging',
+    'product_description_text': 'description',
+}
+PRODUCT_IMAGE_DATA_ID = 'main-product-img-v2'
+PRODUCT_FIELDS = ['sku', 'brand', 'name', 'packaging', 'image_url', 'description']
+
+# Product page selectors read in the browser: (field, label, CSS selector, attribute or None for text)
+PRODUCT_FIELD_SELECTORS = [
+    ('sku', "SKU", "div[data-id='product_id']", None),
+    ('brand', "Brand", "button[data-id='product_brand_link']", None),
+    ('name', "Name", "div[data-id='product_name']", None),
+    ('packaging', "Packaging", "div[data-id='pack_size']", None),
+    ('image_url', "Image URL", "img[data-id='main-product-img-v2']", 'src'),
+    ('description', "Description", "div[data-id='product_description_text']", None),
+]
+
+# Reads every product field in one WebDriver round trip; null marks a missing element.
+# Attributes are read as properties first so URLs come back absolute, like get_attribute().
+READ_FIELDS_SCRIPT = """
+return arguments[0].map(function (spec) {
+    var element = document.querySelector(spec[0]);
+    if (!element) { return null; }
+    if (spec[1]) {
+        var value = element[spec[1]];
+        return value == null ? element.getAttribute(spec[1]) : String(value);
+    }
+    return element.innerText;
+});
+"""
+
+# Listing-level signals read from each product card (used to detect changed products)
+LISTING_CARD_SELECTORS = {
+    'name': "[data-id='product-card-name'], .product-card-name",
+    'packaging': "[data-id='product-card-pack-size'], .product-card-pack-size",
+}
+
+# Reads link, name and pack size of every product card in one round trip
+READ_CARDS_SCRIPT = """
+var selectors = arguments[0];
+return Array.prototype.map.call(
+    document.querySelectorAll('div.product-card-container'),
+    function (card) {
+        var link = card.querySelector('a.product-card-link');
+        var result = {url: link ? link.href : null};
+        Object.keys(selectors).forEach(function (field) {
+            var element = card.querySelector(selectors[field]);
+            result[field] = element ? element.innerText.trim() : null;
+        });
+        return result;
+    }
+);
+"""
+
+# Reads the link of every product card in one round trip; null marks a card without a link
+READ_CARD_LINKS_SCRIPT = """
+return Array.prototype.map.call(
+    document.querySelectorAll('div.product-card-container'),
+    function (card) {
+        var link = card.querySelector('a.product-card-link');
+        return link ? link.href : null;
+    }
+);
+"""
+
+# Whether a product page in a tab has loaded and shows its name, as `extract_product_details()` waits for
+TAB_SETTLED_SCRIPT = """
+var name = document.querySelector("div[data-id='product_name']");
+return document.readyState === 'complete' && !!name && name.textContent.trim().length > 0;
+"""
+
+# Failed pages and products are dead-lettered and retried after the main pass, up to this
+# many attempts in total; the main pass tries everything once and moves on
+DEAD_LETTER_ATTEMPTS = 3
+MAIN_PASS_ATTEMPTS = 1
+
+# Shared frontier: units are leased for this long and renewed by a heartbeat; a unit whose
+# lease expires (its node died) goes back to pending, and is given up after this many leases
+FRONTIER_LEASE_SECONDS = 120
+FRONTIER_MAX_ATTEMPTS = 3
+FRONTIER_POLL_SECONDS = 5
+# Units are leased deepest first, so started categories finish before new ones open
+FRONTIER_PRIORITY = {'product': 0, 'page': 1, 'category': 2}
+
+# Journal writes are committed (and fsynced) after this many entries or seconds
+JOURNAL_BATCH = 50
+JOURNAL_FLUSH_SECONDS = 5
+
+# Query parameters that do not change which product a URL points to
+DEDUP_IGNORED_PARAMS = {'page', 'ref', 'source', 'searchTerm', 'position', 'fromCatalog',
+                        'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content'}
+
+# Output sinks buffer this many records before writing them out (one Parquet row group per batch)
+SINK_BATCH = 500
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Post-extraction image download (--images): concurrent downloads and file extension per content type
+IMAGE_THREADS = 16
+IMAGE_TIMEOUT = 30
+IMAGE_EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp',
+                    'image/gif': '.gif', 'image/avif': '.avif'}
+
+# Upper bound (seconds) for waits on each kind of page; learned timeouts never exceed these
+WAIT_TIMEOUTS = {
+    'home': 10,
+    'auth': 10,
+    'dashboard': 10,
+    'category': 15,
+    'listing': 15,
+    'pagination': 5,
+    'product': 15,
+}
+WAIT_MIN_TIMEOUT = 2  # Learned timeouts never drop below this
+WAIT_MIN_SAMPLES = 10  # Observations needed before a page type's timeout is learned
+WAIT_POLL = 0.1  # Seconds between readiness checks
+WAIT_QUIET_PERIOD = 0.3  # Seconds a count must stay unchanged to count as stable
+WAIT_RETRY_BASE = 0.5  # First retry delay, doubled on every further attempt
+WAIT_RETRY_MAX = 8
+
+# Global request budget (page loads per second, 0 for none) and its burst allowance
+REQUEST_RATE = 10
+REQUEST_BURST = 20
+# Concurrent requests grow by one per window of successes and are cut on errors or slow pages
+CONCURRENCY_MIN = 1
+CONCURRENCY_DECREASE = 0.5
+SLOW_REQUEST_SECONDS = 10
+# HTTP statuses that mean the site is overloaded or throttling us
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Latencies kept per phase for the run summary's percentiles
+METRICS_SAMPLES = 2000
+METRICS_PREFIX = 'sysco_scraper'
+
+# Per-phase timings and counters for the whole run, see `timed()`
+_metrics = {'phases': {}, 'counters': {}, 'log': None, 'started': time.time()}
+_metrics_lock = threading.Lock()
+
+def _phase_metrics(phase):
+    """Returns the metrics entry of a phase, creating it. Call with the lock held."""
+    entry = _metrics['phases'].get(phase)
+    if entry is None:
+        entry = _metrics['phases'][phase] = {'calls': 0, 'failures': 0, 'retries': 0, 'seconds': 0.0,
+                                             'samples': deque(maxlen=METRICS_SAMPLES)}
+    return entry
+
+def log_event(event, **fields):
+    """Writes one structured event to the JSON log, if one is open.
+    
+    Args:
+        event (str): Event name, e.g. 'timing' or 'retry'.
+        **fields: JSON-serializable event fields.
+    """
+    if _metrics['log'] is None:
+        return
+    record = {'ts': round(time.time(), 3), 'event': event, 'thread': threading.current_thread().name}
+    record.update(fields)
+    line = json.dumps(record, default=str) + "\n"
+    with _metrics_lock:
+        if _metrics['log'] is not None:
+            _metrics['log'].write(line)
+
+def record_timing(phase, seconds, failed=False):
+    """Records one call of a phase.
+    
+    Args:
+        phase (str): Phase name, usually the instrumented function's name.
+        seconds (float): Wall time the call took.
+        failed (bool, optional): The call raised or reported failure. Defaults to False.
+    """
+    with _metrics_lock:
+        entry = _phase_metrics(phase)
+        entry['calls'] += 1
+        entry['seconds'] += seconds
+        entry['samples'].append(seconds)
+        if failed:
+            entry['failures'] += 1
+    log_event('timing', phase=phase, seconds=round(seconds, 4), failed=failed)
+
+def record_retry(phase):
+    """Counts one retry of a phase.
+    
+    Args:
+        phase (str): Phase that is about to be retried.
+    """
+    with _metrics_lock:
+        _phase_metrics(phase)['retries'] += 1
+    log_event('retry', phase=phase)
+
+def count_event(name, amount=1):
+    """Adds to a run-wide counter, e.g. 'products'.
+    
+    Args:
+        name (str): Counter name.
+        amount (int, optional): Amount to add. Defaults to 1.
+    """
+    with _metrics_lock:
+        _metrics['counters'][name] = _metrics['counters'].get(name, 0) + amount
+
+def timed(function):
+    """Decorator that records the wall time and failures of every call.
+    
+    A call counts as failed if it raises or returns None, False or an empty
+    list, which is how the scraping functions report giving up.
+    """
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = result is None or result is False or result == []
+            return result
+        finally:
+            record_timing(function.__name__, time.perf_counter() - start, failed)
+    return wrapper
+
+def open_metrics_log(path):
+    """Starts writing structured JSON events (one object per line) to a file.
+    
+    Args:
+        path (str): JSON lines file to append to.
+    """
+    _metrics['log'] = open(path, 'a', encoding='utf-8', buffering=1)
+
+def close_metrics_log():
+    """Closes the JSON event log, if one is open."""
+    with _metrics_lock:
+        log, _metrics['log'] = _metrics['log'], None
+    if log is not None:
+        log.close()
+
+def percentile(samples, fraction):
+    """Returns a percentile of a sorted, non-empty list by nearest rank."""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+def metrics_summary():
+    """Summarizes the run's metrics so far.
+    
+    Returns:
+        dict: 'duration' in seconds, run-wide 'counters', and per phase its
+            'calls', 'failures', 'retries', 'seconds' (total) and the 'p50',
+            'p95' and 'max' call latency.
+    """
+    with _metrics_lock:
+        phases = {phase: dict(entry, samples=sorted(entry['samples']))
+                  for phase, entry in _metrics['phases'].items()}
+        counters = dict(_metrics['counters'])
+    
+    summary = {'duration': time.time() - _metrics['started'], 'counters': counters, 'phases': {}}
+    for phase, entry in sorted(phases.items()):
+        samples = entry.pop('samples')
+        entry.update({'p50': percentile(samples, 0.5), 'p95': percentile(samples, 0.95), 'max': samples[-1]}
+                     if samples else {'p50': 0.0, 'p95': 0.0, 'max': 0.0})
+        summary['phases'][phase] = entry
+    return summary
+
+def print_metrics_report(summary):
+    """Prints the per-phase timing table of a run summary.
+    
+    Args:
+        summary (dict): Result of `metrics_summary()`.
+    """
+    print(f"\nRun time: {summary['duration']:.1f}s")
+    print(f"{'phase':<28}{'calls':>7}{'fail':>6}{'retry':>7}{'total s':>10}{'p50 s':>8}{'p95 s':>8}")
+    for phase, entry in summary['phases'].items():
+        print(f"{phase:<28}{entry['calls']:>7}{entry['failures']:>6}{entry['retries']:>7}"
+              f"{entry['seconds']:>10.1f}{entry['p50']:>8.2f}{entry['p95']:>8.2f}")
+    for name, value in sorted(summary['counters'].items()):
+        print(f"{name}: {value}")
+
+def write_prometheus_textfile(path, summary):
+    """Writes a run summary in the Prometheus text format for node_exporter's textfile collector.
+    
+    The file is replaced atomically so the collector never reads a partial write.
+    
+    Args:
+        path (str): Target `.prom` file.
+        summary (dict): Result of `metrics_summary()`.
+    """
+    name = METRICS_PREFIX
+    lines = [f"# HELP {name}_phase_seconds Wall time of scraper phases.",
+             f"# TYPE {name}_phase_seconds summary"]
+    for phase, entry in summary['phases'].items():
+        label = f'phase="{phase}"'
+        lines.append(f'{name}_phase_seconds{{{label},quantile="0.5"}} {entry["p50"]:.6f}')
+        lines.append(f'{name}_phase_seconds{{{label},quantile="0.95"}} {entry["p95"]:.6f}')
+        lines.append(f'{name}_phase_seconds_sum{{{label}}} {entry["seconds"]:.6f}')
+        lines.append(f'{name}_phase_seconds_count{{{label}}} {entry["calls"]}')
+    for metric, key, description in (('failures', 'failures', 'Failed calls'), ('retries', 'retries', 'Retries')):
+        lines.append(f"# HELP {name}_phase_{metric}_total {description} per scraper phase.")
+        lines.append(f"# TYPE {name}_phase_{metric}_total counter")
+        lines.extend(f'{name}_phase_{metric}_total{{phase="{phase}"}} {entry[key]}'
+                     for phase, entry in summary['phases'].items())
+    for counter, value in sorted(summary['counters'].items()):
+        lines.append(f"# TYPE {name}_{counter}_total counter")
+        lines.append(f"{name}_{counter}_total {value}")
+    lines.append(f"# TYPE {name}_run_duration_seconds gauge")
+    lines.append(f"{name}_run_duration_seconds {summary['duration']:.3f}")
+    
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(temp_path, path)
+
+# Shared request scheduler: token bucket for the request budget, AIMD concurrency limit
+_scheduler = {'rate': REQUEST_RATE, 'burst': REQUEST_BURST, 'tokens': REQUEST_BURST,
+              'refilled': time.time(), 'max': None, 'limit': None, 'in_flight': 0,
+              'successes': 0, 'last_decrease': 0.0}
+_scheduler_cond = threading.Condition()
+
+def configure_scheduler(rate=REQUEST_RATE, burst=REQUEST_BURST, max_concurrency=None):
+    """Sets the global request budget and concurrency ceiling for the run.
+    
+    Args:
+        rate (float, optional): Requests per second across all browsers, tabs and
+            HTTP threads; 0 disables the budget. Defaults to REQUEST_RATE.
+        burst (int, optional): Requests that may be made at once after an idle
+            period. Defaults to REQUEST_BURST.
+        max_concurrency (int, optional): Most requests in flight at once; None
+            for no limit. Defaults to None.
+    """
+    with _scheduler_cond:
+        _scheduler.update({'rate': rate, 'burst': max(1, burst), 'tokens': max(1, burst),
+                           'refilled': time.time(), 'max': max_concurrency, 'limit': max_concurrency,
+                           'successes': 0})
+        _scheduler_cond.notify_all()
+
+def _refill_tokens(now):
+    """Adds the tokens earned since the last refill. Call with the condition held."""
+    if _scheduler['rate'] > 0:
+        earned = (now - _scheduler['refilled']) * _scheduler['rate']
+        _scheduler['tokens'] = min(_scheduler['burst'], _scheduler['tokens'] + earned)
+    _scheduler['refilled'] = now
+
+def acquire_request(block=True):
+    """Waits for permission to start a request (page load, click navigation or HTTP fetch).
+    
+    A request needs a token from the budget and a free slot under the current
+    concurrency limit. Every acquired request must be handed back with
+    `release_request()`.
+    
+    Args:
+        block (bool, optional): Wait until allowed. If False, return None
+            straight away when the request would have to wait. Defaults to True.
+        
+    Returns:
+        float or None: Start time to pass to `release_request()`, or None if
+            not blocking and no request may start now.
+    """
+    waited = time.time()
+    with _scheduler_cond:
+        while True:
+            now = time.time()
+            _refill_tokens(now)
+            limit = _scheduler['limit']
+            slot_free = limit is None or _scheduler['in_flight'] < max(CONCURRENCY_MIN, int(limit))
+            token_free = _scheduler['rate'] <= 0 or _scheduler['tokens'] >= 1
+            if slot_free and token_free:
+                if _scheduler['rate'] > 0:
+                    _scheduler['tokens'] -= 1
+                _scheduler['in_flight'] += 1
+                break
+            if not block:
+                return None
+            # Sleep until the next token is due, or until a slot is released
+            _scheduler_cond.wait((1 - _scheduler['tokens']) / _scheduler['rate'] if slot_free else 1.0)
+    if now - waited > 0.001:
+        record_timing('sleep:scheduler', now - waited)
+    return now
+
+def release_request(started, failed=False):
+    """Hands back a request and adapts the concurrency limit to how it went.
+    
+    Failed or slow requests cut the limit multiplicatively (at most once per
+    round of requests started before the previous cut); a full window of
+    successes raises it by one.
+    
+    Args:
+        started (float): Value returned by `acquire_request()`.
+        failed (bool, optional): The request errored, was throttled or never
+            became ready. Defaults to False.
+    """
+    now = time.time()
+    slow = now - started > SLOW_REQUEST_SECONDS
+    with _scheduler_cond:
+        _scheduler['in_flight'] -= 1
+        limit = _scheduler['limit']
+        if limit is not None:
+            if failed or slow:
+                _scheduler['successes'] = 0
+                if started >= _scheduler['last_decrease']:
+                    _scheduler['limit'] = max(CONCURRENCY_MIN, limit * CONCURRENCY_DECREASE)
+                    _scheduler['last_decrease'] = now
+            else:
+                _scheduler['successes'] += 1
+                if _scheduler['successes'] >= limit:
+                    _scheduler['limit'] = min(_scheduler['max'], limit + 1)
+                    _scheduler['successes'] = 0
+        new_limit = _scheduler['limit']
+        _scheduler_cond.notify_all()
+    if new_limit != limit:
+        log_event('concurrency', limit=new_limit, reason='failure' if failed else 'slow' if slow else 'success')
+
+@contextmanager
+def request_slot():
+    """Runs a request under the scheduler.
+    
+    Yields a dict; set its 'failed' key when the request went wrong without
+    raising (an error status, a page that never became ready). Exceptions
+    count as failures and are re-raised.
+    
+    Example:
+        with request_slot() as slot:
+            driver.get(url)
+            slot['failed'] = not wait_until(driver, document_ready, 'product', required=False)
+    """
+    slot = {'failed': False}
+    started = acquire_request()
+    try:
+        yield slot
+    except BaseException:
+        slot['failed'] = True
+        raise
+    finally:
+        release_request(started, slot['failed'])
+
+# Recent readiness latencies per (page type, condition); a wait that timed out counts at its limit
+_wait_samples = {}
+_wait_lock = threading.Lock()
+
+def condition_name(condition):
+    """Names a readiness condition, e.g. 'presence_of_element_located' for Selenium's closures."""
+    name = getattr(condition, '__qualname__', None) or type(condition).__name__
+    return name.split('.<locals>')[0]
+
+def record_wait(page_type, seconds, condition=None):
+    """Records how long a page of the given type took to become ready.
+    
+    Args:
+        page_type (str): Kind of page waited on (a key of WAIT_TIMEOUTS).
+        seconds (float): Observed time until the readiness condition held, or
+            the timeout for a wait that gave up (a censored sample).
+        condition (str, optional): Name of the condition waited for, see
+            `condition_name()`. Defaults to None.
+    """
+    with _wait_lock:
+        _wait_samples.setdefault((page_type, condition), deque(maxlen=200)).append(seconds)
+
+def learned_timeout(page_type, condition=None):
+    """Returns the timeout to use for the next wait on a page type and condition.
+    
+    Until enough latencies have been observed this is the configured upper
+    bound from WAIT_TIMEOUTS. After that it is three times the observed p95,
+    clamped between WAIT_MIN_TIMEOUT and the configured bound, so broken
+    pages are given up on quickly once the site's real speed is known.
+    Timeouts are recorded at their limit, so a slow spell pushes the p95 back
+    up instead of the timeout only ever shrinking. Samples are kept per
+    condition, so quick checks do not cut the timeout of slow ones on the
+    same kind of page.
+    
+    Args:
+        page_type (str): Kind of page waited on (a key of WAIT_TIMEOUTS).
+        condition (str, optional): Name of the condition waited for. Defaults to None.
+        
+    Returns:
+        float: Timeout in seconds.
+    """
+    upper = WAIT_TIMEOUTS.get(page_type, 10)
+    with _wait_lock:
+        samples = sorted(_wait_samples.get((page_type, condition), ()))
+    if len(samples) < WAIT_MIN_SAMPLES:
+        return upper
+    p95 = percentile(samples, 0.95)
+    return min(upper, max(WAIT_MIN_TIMEOUT, p95 * 3))
+
+def wait_until(driver, condition, page_type, timeout=None, required=True):
+    """Waits until a readiness condition holds, learning the page type's latency.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance to poll.
+        condition (callable): Selenium-style condition taking the driver and
+            returning a truthy value once ready.
+        page_type (str): Kind of page waited on (a key of WAIT_TIMEOUTS).
+        timeout (float, optional): Explicit timeout overriding the learned one.
+        required (bool, optional): Raise on timeout if True, otherwise return
+            False. Defaults to True.
+            
+    Returns:
+        The condition's truthy result, or False if it timed out and was not required.
+        
+    Raises:
+        TimeoutException: If `required` and the condition did not hold in time.
+    """
+    name = condition_name(condition)
+    limit = timeout or learned_timeout(page_type, name)
+    start = time.time()
+    try:
+        result = WebDriverWait(driver, limit, poll_frequency=WAIT_POLL).until(condition)
+    except TimeoutException:
+        record_wait(page_type, limit, name)
+        record_timing(f"wait:{page_type}", time.time() - start, failed=True)
+        if required:
+            raise
+        return False
+    record_wait(page_type, time.time() - start, name)
+    record_timing(f"wait:{page_type}", time.time() - start)
+    return result
+
+def document_ready(driver):
+    """Condition: the current document has finished parsing."""
+    return driver.execute_script("return document.readyState") in ("interactive", "complete")
+
+def network_idle(quiet_period=WAIT_QUIET_PERIOD):
+    """Builds a condition that holds once no new network requests have started for a while.
+    
+    Args:
+        quiet_period (float, optional): Seconds without new resource entries.
+        
+    Returns:
+        callable: Condition taking the driver.
+    """
+    state = {'count': -1, 'since': 0.0}
+    
+    def condition(driver):
+        count = driver.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.time()
+        if count != state['count']:
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= quiet_period
+    return condition
+
+def element_count_stable(css_selector, minimum=1, quiet_period=WAIT_QUIET_PERIOD):
+    """Builds a condition that holds once the number of matching elements stops changing.
+    
+    Args:
+        css_selector (str): Elements to count, e.g. product cards.
+        minimum (int, optional): Fewest elements that count as loaded. Defaults to 1.
+        quiet_period (float, optional): Seconds the count must stay unchanged.
+        
+    Returns:
+        callable: Condition taking the driver and returning the elements.
+    """
+    state = {'count': -1, 'since': 0.0}
+    
+    def condition(driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, css_selector)
+        now = time.time()
+        if len(elements) != state['count']:
+            state['count'], state['since'] = len(elements), now
+            return False
+        if len(elements) >= minimum and now - state['since'] >= quiet_period:
+            return elements
+        return False
+    return condition
+
+def product_fields_rendered(driver):
+    """Condition: the product page has rendered its name text."""
+    names = driver.find_elements(By.CSS_SELECTOR, "div[data-id='product_name']")
+    return bool(names) and bool(names[0].text.strip())
+
+def wait_backoff(attempt):
+    """Pauses before retrying a failed step, doubling the delay on every attempt.
+    
+    The delay is jittered between half and all of the exponential step so
+    workers that failed together do not retry in lockstep.
+    
+    Args:
+        attempt (int): 0-based number of the attempt that just failed.
+    """
+    delay = min(WAIT_RETRY_MAX, WAIT_RETRY_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+    time.sleep(delay)
+    record_timing('sleep:backoff', delay)
+
+def wait_poll():
+    """Pauses for one readiness polling interval."""
+    time.sleep(WAIT_POLL)
+    record_timing('sleep:poll', WAIT_POLL)
+
+def setup_driver(capture_network=False, profile='default', block_patterns=None):
     """Sets up Chrome WebDriver with optimized options for stability and performance.
     
     Configures Chrome options including memory management, stability fixes,
     and UI improvements to handle web scraping operations reliably.
     
+    The 'lean' profile runs headless with the eager page-load strategy and
+    blocks images, media, fonts and third-party trackers through the DevTools
+    protocol, since only the image URL string is needed. No fixed DevTools
+    port is used, so any number of instances can run side by side.
+    
+    Args:
+        capture_network (bool, optional): Record network events in the performance
+            log so listing API responses can be decoded. Defaults to False.
+        profile (str, optional): 'default' for a visible browser loading
+            everything, or 'lean'. Defaults to 'default'.
+        block_patterns (list[str], optional): URL patterns to block in the lean
+            profile. Defaults to LEAN_BLOCKED_URLS.
+    
     Returns:
         webdriver.Chrome: Configured Chrome WebDriver instance with stability options.
     """
-    # Setup Chrome driver with stability improvementד
+    # Setup Chrome driver with stability improvements
     options = webdriver.ChromeOptions()
-    options.add_argument('--start-maximized')
     options.add_argument('--disable-notifications')
     
     # Memory and stability fixes
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
-    options.add_argument('--remote-debugging-port=9222')
     options.add_argument('--disable-extensions')
     options.add_argument('--disable-plugins')
     
-    return webdriver.Chrome(options=options)
+    if profile == 'lean':
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+        # Return from driver.get() at DOMContentLoaded; readiness is checked by the waits
+        options.page_load_strategy = 'eager'
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+        })
+    else:
+        options.add_argument('--start-maximized')
+    
+    if capture_network:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    driver = webdriver.Chrome(options=options)
+    
+    if profile == 'lean':
+        # Requests matching these patterns fail immediately instead of being downloaded
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {
+            'urls': LEAN_BLOCKED_URLS if block_patterns is None else block_patterns,
+        })
+    return driver
 
-def initial_auth(driver):
+def setup_browser(options=None):
+    """Starts a browser configured by the run options.
+    
+    Args:
+        options (dict, optional): Run options from `parse_args()`. Defaults to None.
+        
+    Returns:
+        webdriver.Chrome: Configured Chrome WebDriver instance.
+    """
+    options = options or {}
+    block_patterns = None
+    if options.get('block') or options.get('unblock'):
+        unblock = set(options.get('unblock') or [])
+        block_patterns = [pattern for pattern in LEAN_BLOCKED_URLS if pattern not in unblock]
+        block_patterns += options.get('block') or []
+    return setup_driver(capture_network=options.get('capture', False),
+                        profile=options.get('profile', 'default'),
+                        block_patterns=block_patterns)
+
+@timed
+def initial_auth(driver, zip_code=ZIP_CODE, home_url=HOME_URL):
     """Handles initial authentication steps to access Sysco's shopping interface as a guest.
 
     Navigates through the authentication flow including clicking "Shop Now",
@@ -39,6 +779,8 @@ def initial_auth(driver):
     
     Args:
         driver (webdriver.Chrome): Chrome WebDriver instance to perform authentication.
+        zip_code (str, optional): ZIP code that sets the shopping location. Defaults to ZIP_CODE.
+        home_url (str, optional): Site home page to start from. Defaults to HOME_URL.
         
     Returns:
         bool: True if authentication was successful, False otherwise.
@@ -47,38 +789,43 @@ def initial_auth(driver):
     try:
         # Navigate to main page
         print("Navigating to Sysco...")
-        driver.get("https://www.sysco.com")
+        with request_slot():
+            driver.get(home_url)
         
         # Click "Shop Now"
         print("Clicking Shop Now...")
-        shop_now = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Shop Now')]"))
+        shop_now = wait_until(driver,
+            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Shop Now')]")), 'home'
         )
-        shop_now.click()
+        with request_slot():
+            shop_now.click()
         
         # Click "Continue as Guest"
         print("Continuing as guest...")
-        guest_btn = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue as Guest')]"))
+        guest_btn = wait_until(driver,
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Continue as Guest')]")), 'auth'
         )
         guest_btn.click()
         
         # Enter ZIP code
         print("Entering ZIP code...")
-        zip_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-id='initial_zipcode_modal_input']"))
+        zip_input = wait_until(driver,
+            EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-id='initial_zipcode_modal_input']")), 'auth'
         )
-        zip_input.send_keys("97201")
+        zip_input.send_keys(zip_code)
         
         # Click "Start Shopping"
         print("Starting shopping...")
-        start_shopping = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Start Shopping')]"))
+        start_shopping = wait_until(driver,
+            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Start Shopping')]")), 'auth'
         )
-        start_shopping.click()
+        with request_slot():
+            start_shopping.click()
         
-        # Add a longer wait after clicking Start Shopping to ensure page loads
-        time.sleep(5)
+        # Wait for the ZIP modal to close and the shop's startup requests to settle
+        wait_until(driver, EC.invisibility_of_element_located(
+            (By.CSS_SELECTOR, "input[data-id='initial_zipcode_modal_input']")), 'dashboard', required=False)
+        wait_until(driver, network_idle(), 'dashboard', required=False)
         return True
     
     except Exception as e:
@@ -105,23 +852,13 @@ def get_all_categories(driver):
         print("Getting categories from grid...")
         
         # Wait for category grid to load
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "category-grid-container"))
+        wait_until(driver,
+            EC.presence_of_element_located((By.CLASS_NAME, "category-grid-container")), 'dashboard'
         )
-        time.sleep(3)
-        
-        categories = [
-            {'id': 'produce', 'name': 'Produce'},
-            {'id': 'meatseafood', 'name': 'Meat & Seafood'},
-            {'id': 'bakerybread', 'name': 'Bakery & Breads'},
-            {'id': 'dairyeggs', 'name': 'Dairy & Eggs'},
-            {'id': 'canneddry', 'name': 'Canned & Dry'},
-            {'id': 'frozenfoods', 'name': 'Frozen Foods'},
-            {'id': 'beverages', 'name': 'Beverages'},
-            {'id': 'equipmentsupplies', 'name': 'Equipment & Supplies'},
-            {'id': 'disposables', 'name': 'Disposables'},
-            {'id': 'chemicals', 'name': 'Chemicals'}
-        ]
+        wait_until(driver, element_count_stable("div.category-grid-button"), 'dashboard', required=False)
+        dashboard_url = driver.current_url
+        
+        categories = [dict(category) for category in CATEGORIES]
         
         # Get URLs for each category
         for category in categories:
@@ -131,17 +868,21 @@ def get_all_categories(driver):
                 
                 # Click element to get URL
                 driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(1)
-                element.click()
-                time.sleep(3)
+                wait_until(driver, EC.element_to_be_clickable(element), 'dashboard')
+                with request_slot():
+                    element.click()
+                    wait_until(driver, EC.url_changes(dashboard_url), 'category')
                 
                 # Store URL
                 category['url'] = driver.current_url
                 print(f"Captured URL for {category['name']}: {category['url']}")
                 
                 # Go back
-                driver.back()
-                time.sleep(2)
+                with request_slot() as slot:
+                    driver.back()
+                    slot['failed'] = not wait_until(driver, EC.url_to_be(dashboard_url), 'dashboard',
+                                                    required=False)
+                wait_until(driver, element_count_stable("div.category-grid-button"), 'dashboard', required=False)
                 
             except Exception as e:
                 print(f"Error processing {category['name']}: {str(e)}")
@@ -154,6 +895,199 @@ def get_all_categories(driver):
         print(f"Error getting categories: {str(e)}")
         return []
 
+_cache_lock = threading.Lock()
+
+def load_cache(path=CACHE_PATH):
+    """Loads the startup cache, returning an empty cache if it is missing or unreadable."""
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def update_cache(path, section, key, value):
+    """Stores a timestamped entry in the startup cache.
+    
+    The file is rewritten atomically so concurrent workers and crashes never
+    leave a half-written cache behind.
+    
+    Args:
+        path (str): Cache file path.
+        section (str): Cache section, 'sessions' or 'categories'.
+        key (str): Entry key within the section (e.g. the ZIP code).
+        value: JSON-serialisable entry, or None to drop the entry.
+    """
+    with _cache_lock:
+        cache = load_cache(path)
+        entries = cache.setdefault(section, {})
+        if value is None:
+            entries.pop(key, None)
+        else:
+            entries[key] = {'saved_at': time.time(), 'value': value}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(cache, file)
+        os.replace(temp_path, path)
+
+def cached_value(path, section, key, ttl):
+    """Returns a cache entry's value, or None if it is missing or older than `ttl` seconds."""
+    entry = load_cache(path).get(section, {}).get(key)
+    if not entry or time.time() - entry.get('saved_at', 0) > ttl:
+        return None
+    return entry['value']
+
+def capture_session(driver, url=None):
+    """Captures the browser's guest session (cookies and local storage).
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        url (str, optional): Shop page a restored session should open. Defaults
+            to the current URL.
+        
+    Returns:
+        dict: Session that `restore_session()` can load into another browser.
+    """
+    cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    storage = driver.execute_script(
+        "return {origin: window.location.origin, "
+        "items: Object.assign({}, window.localStorage)};"
+    )
+    return {
+        'url': url or driver.current_url,
+        'cookies': [{field: cookie[field] for field in CDP_COOKIE_FIELDS if field in cookie}
+                    for cookie in cookies],
+        'local_storage': storage,
+    }
+
+def cache_key(options):
+    """Returns the startup cache key for a run: its ZIP code, qualified by a non-default site."""
+    zip_code = options.get('zip') or ZIP_CODE
+    home_url = options.get('base_url') or HOME_URL
+    return zip_code if home_url == HOME_URL else f"{zip_code}@{home_url}"
+
+def save_session(driver, path, key):
+    """Caches the browser's guest session (cookies and local storage) for a ZIP code.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        path (str): Cache file path.
+        key (str): Cache key of the session, see `cache_key()`.
+    """
+    try:
+        update_cache(path, 'sessions', key, capture_session(driver))
+    except Exception as e:
+        print(f"Could not cache session: {str(e)}")
+
+@timed
+def restore_session(driver, session):
+    """Restores a cached guest session into a fresh browser.
+    
+    Cookies are set through the DevTools protocol. Local storage can only be
+    written once a document of its origin exists, so it is injected by a
+    script that runs before the page's own scripts on the first document of
+    that origin. The only navigation is the one to the cached shop page.
+    
+    Args:
+        driver (webdriver.Chrome): Fresh Chrome WebDriver instance.
+        session (dict): Session stored by `save_session()`.
+        
+    Returns:
+        bool: True if the restored session shows the shop's category grid.
+    """
+    try:
+        cookies = [dict(cookie) for cookie in session['cookies']]
+        for cookie in cookies:
+            # Session cookies carry a negative expiry, which setCookies rejects
+            if cookie.get('expires', 0) < 0:
+                cookie.pop('expires')
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+        
+        storage = session.get('local_storage') or {}
+        script = None
+        if storage.get('items'):
+            script = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': (
+                f"if (window.location.origin === {json.dumps(storage['origin'])}) {{"
+                f" const items = {json.dumps(storage['items'])};"
+                " for (const key in items) { window.localStorage.setItem(key, items[key]); } }"
+            )})
+        
+        try:
+            with request_slot():
+                driver.get(session['url'])
+        finally:
+            # Later navigations must not overwrite what the site stores from here on
+            if script:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument',
+                                       {'identifier': script['identifier']})
+        return bool(wait_until(driver, EC.presence_of_element_located((By.CLASS_NAME, "category-grid-container")),
+                               'dashboard', timeout=SESSION_CHECK_TIMEOUT, required=False))
+    except Exception as e:
+        print(f"Could not restore session: {str(e)}")
+        return False
+
+@timed
+def start_session(driver, options=None):
+    """Opens a guest shopping session, reusing a cached one when it is still fresh.
+    
+    A cached session younger than SESSION_CACHE_TTL is restored and checked;
+    if it is missing, stale or rejected by the site, the full `initial_auth()`
+    flow runs and its result is cached for the next start.
+    
+    Args:
+        driver (webdriver.Chrome): Fresh Chrome WebDriver instance.
+        options (dict, optional): Run options ('zip', 'cache', 'base_url'). Defaults to None.
+        
+    Returns:
+        bool: True if the browser is in an authenticated guest session.
+    """
+    options = options or {}
+    zip_code = options.get('zip') or ZIP_CODE
+    cache_path = options.get('cache')
+    key = cache_key(options)
+    
+    if cache_path:
+        session = cached_value(cache_path, 'sessions', key, SESSION_CACHE_TTL)
+        if session:
+            if restore_session(driver, session):
+                print(f"Restored cached session for ZIP {zip_code}")
+                return True
+            print("Cached session is no longer valid, signing in again")
+            update_cache(cache_path, 'sessions', key, None)
+    
+    if not initial_auth(driver, zip_code, options.get('base_url') or HOME_URL):
+        return False
+    if cache_path:
+        save_session(driver, cache_path, key)
+    return True
+
+@timed
+def get_categories(driver, options=None):
+    """Returns the category URLs, from the cache when it is still fresh.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on the shop dashboard.
+        options (dict, optional): Run options ('zip', 'cache', 'base_url'). Defaults to None.
+        
+    Returns:
+        list[dict]: Categories as returned by `get_all_categories()`.
+    """
+    options = options or {}
+    cache_path = options.get('cache')
+    key = cache_key(options)
+    
+    if cache_path:
+        categories = cached_value(cache_path, 'categories', key, CATEGORY_CACHE_TTL)
+        if categories:
+            print(f"Using {len(categories)} cached category URLs")
+            return categories
+    
+    categories = get_all_categories(driver)
+    # Only a complete discovery is worth caching
+    if cache_path and len(categories) == len(CATEGORIES):
+        update_cache(cache_path, 'categories', key, categories)
+    return categories
+
+@timed
 def get_product_links(driver, retry_count=3):
     """Extracts product links from the current category page with retry logic.
     
@@ -173,37 +1107,33 @@ def get_product_links(driver, retry_count=3):
             print(f"Getting product links (attempt {attempt + 1}/{retry_count})...")
             
             # Wait for catalog wrapper to load
-            WebDriverWait(driver, 15).until(  # Increased wait time
-                EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper"))
+            wait_until(driver,
+                EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper")), 'listing'
             )
             
-            # Additional wait for products to load
-            time.sleep(2)
+            # Wait until the number of rendered product cards stops growing
+            wait_until(driver, element_count_stable("div.product-card-container"), 'listing', required=False)
             
-            # Get all product cards and extract links
-            product_cards = driver.find_elements(By.CSS_SELECTOR, "div.product-card-container")
+            # Get the link of every product card in a single script call
+            card_links = driver.execute_script(READ_CARD_LINKS_SCRIPT)
             
-            if not product_cards:
+            if not card_links:
                 print(f"No product cards found on attempt {attempt + 1}")
                 if attempt < retry_count - 1:
                     print("Refreshing page and retrying...")
-                    driver.refresh()
-                    time.sleep(5)
+                    record_retry('get_product_links')
+                    wait_backoff(attempt)
+                    with request_slot() as slot:
+                        driver.refresh()
+                        slot['failed'] = not wait_until(driver, document_ready, 'listing', required=False)
                     continue
                 else:
                     return []
             
-            # Extract links from product cards
-            links = []
-            for card in product_cards:
-                try:
-                    link_element = card.find_element(By.CSS_SELECTOR, "a.product-card-link")
-                    href = link_element.get_attribute("href")
-                    if href:
-                        links.append(href)
-                except Exception as e:
-                    print(f"Could not extract link from product card: {e}")
-                    continue
+            # Keep the cards that have a link
+            links = [href for href in card_links if href]
+            if len(links) < len(card_links):
+                print(f"Could not extract link from {len(card_links) - len(links)} product cards")
             
             # print(f"Found {len(links)} product links")
             return links
@@ -212,7 +1142,8 @@ def get_product_links(driver, retry_count=3):
             print(f"Attempt {attempt + 1} failed: {str(e)}")
             if attempt < retry_count - 1:
                 print("Retrying...")
-                time.sleep(3)
+                record_retry('get_product_links')
+                wait_backoff(attempt)
                 continue
             else:
                 print("All attempts failed")
@@ -220,6 +1151,44 @@ def get_product_links(driver, retry_count=3):
     
     return []
 
+def read_product_fields(driver, verbose=True):
+    """Reads the six product fields from the product page currently displayed.
+    
+    All fields are read with one `execute_script` call instead of a
+    `find_element` and `.text` round trip per field.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on a product page.
+        verbose (bool, optional): Report fields that could not be found. Defaults to True.
+        
+    Returns:
+        dict: Product details keyed by the CSV field names, with "N/A" for
+            every field that could not be found.
+    """
+    # All six fields come back from a single script call
+    values = driver.execute_script(
+        READ_FIELDS_SCRIPT, [[selector, attribute] for _, _, selector, attribute in PRODUCT_FIELD_SELECTORS]
+    )
+    
+    product_details = {}
+    for (field, label, _, _), value in zip(PRODUCT_FIELD_SELECTORS, values):
+        if value is None and verbose:
+            print(f"Could not find {label}")
+        product_details[field] = (value or "").strip() or "N/A"
+    return product_details
+
+def count_valid_fields(product_details):
+    """Counts the fields of a product record that hold real data.
+    
+    Args:
+        product_details (dict): Product record as returned by `read_product_fields()`.
+        
+    Returns:
+        int: Number of fields whose value is not "N/A".
+    """
+    return sum(1 for value in product_details.values() if value != "N/A")
+
+@timed
 def extract_product_details(driver, product_link, retry_count=2):
     """Extracts detailed product information from a product page.
     
@@ -245,44 +1214,25 @@ def extract_product_details(driver, product_link, retry_count=2):
     for attempt in range(retry_count):
         try:
             print(f"Extracting product details (attempt {attempt + 1}/{retry_count})...")
-            driver.get(product_link)
-            time.sleep(3)  # Wait for page load
             
-            # Wait for main product container
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "image-header-info-section"))
-            )
+            # Load the page and wait for its main product container, then for its fields to render
+            with request_slot():
+                driver.get(product_link)
+                wait_until(driver,
+                    EC.presence_of_element_located((By.CLASS_NAME, "image-header-info-section")), 'product'
+                )
+            wait_until(driver, product_fields_rendered, 'product', required=False)
             
             # Extract all required fields with error handling for each field
-            product_details = {}
-            
-            # Helper function to safely extract field
-            def safe_extract(selector, field_name, get_attribute=None):
-                try:
-                    element = driver.find_element(By.CSS_SELECTOR, selector)
-                    if get_attribute:
-                        return element.get_attribute(get_attribute) or "N/A"
-                    else:
-                        return element.text.strip() or "N/A"
-                except Exception as e:
-                    print(f"Could not find {field_name}: {e}")
-                    return "N/A"
-            
-            # Extract each field safely
-            product_details['sku'] = safe_extract("div[data-id='product_id']", "SKU")
-            product_details['brand'] = safe_extract("button[data-id='product_brand_link']", "Brand")
-            product_details['name'] = safe_extract("div[data-id='product_name']", "Name")
-            product_details['packaging'] = safe_extract("div[data-id='pack_size']", "Packaging")
-            product_details['image_url'] = safe_extract("img[data-id='main-product-img-v2']", "Image URL", "src")
-            product_details['description'] = safe_extract("div[data-id='product_description_text']", "Description")
+            product_details = read_product_fields(driver)
             
             # Check if we got at least some data
-            valid_fields = sum(1 for value in product_details.values() if value != "N/A")
-            if valid_fields >= 3:  # At least 3 fields should be valid
+            if count_valid_fields(product_details) >= MIN_VALID_FIELDS:
                 return product_details
             elif attempt < retry_count - 1:
                 print("Not enough valid data, retrying...")
-                time.sleep(2)
+                record_retry('extract_product_details')
+                wait_backoff(attempt)
                 continue
             else:
                 print("Could not extract sufficient product details")
@@ -292,7 +1242,8 @@ def extract_product_details(driver, product_link, retry_count=2):
             print(f"Attempt {attempt + 1} failed: {str(e)}")
             if attempt < retry_count - 1:
                 print("Retrying product extraction...")
-                time.sleep(3)
+                record_retry('extract_product_details')
+                wait_backoff(attempt)
                 continue
             else:
                 print("All extraction attempts failed")
@@ -300,185 +1251,2645 @@ def extract_product_details(driver, product_link, retry_count=2):
     
     return None
 
-def get_total_pages(driver):
-    """Determines the total number of pages in the current product category.
+def extract_products_in_tabs(driver, product_links, tab_count, timeout=15, retry_count=2):
+    """Extracts product details by loading several product pages in parallel tabs.
     
-    Analyzes the search results text to calculate how many pages of products
-    are available in the current category.
+    Keeps up to `tab_count` product pages loading at once in tabs of the same
+    browser session. Each tab is harvested once its `image-header-info-section`
+    is present and either every field has rendered or the page has finished
+    loading with its name shown (what `extract_product_details()` waits for),
+    then closed and reused for the next link. A tab that reaches `timeout`
+    with enough fields is harvested as it is; others are extracted again one
+    by one with `extract_product_details()`.
     
     Args:
-        driver (webdriver.Chrome): Chrome WebDriver instance on a category page.
+        driver (webdriver.Chrome): Chrome WebDriver instance to open the tabs in.
+        product_links (list[str]): URLs of the product pages to extract.
+        tab_count (int): Maximum number of tabs loading at the same time.
+        timeout (int, optional): Seconds a tab may take to become ready. Defaults to 15.
+        retry_count (int, optional): Attempts of the one-by-one extraction. Defaults to 2.
         
     Returns:
-        int: Total number of pages available (defaults to 1 if calculation fails).
+        dict: Product details keyed by product URL, for the products that
+            could be extracted.
     """
+    main_handle = driver.current_window_handle
+    pending = list(enumerate(product_links))
+    open_tabs = {}  # window handle -> (index, link, opened_at)
+    results = {}
+    fallback = []
+    
     try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper"))
-        )
-        
-        results_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "span[data-id='ss-searchPage-header-label-searchResultsTotalText']"))
-        )
-        
-        results_text = results_element.text
-        
-        
-        numbers = re.findall(r'\d+', results_text)
-        total_items = int(numbers[-1])
-        total_pages = (total_items + 23) // 24
-        print(f"Total items: {total_items}, Pages: {total_pages}")
-        return total_pages
-        
-    except Exception as e:
-        print(f"Error getting total pages: {str(e)}")
+        while pending or open_tabs:
+            # Fill free tab slots; window.open returns without waiting for the load.
+            # Only wait for the scheduler while no tab is open, or tabs held here could
+            # keep it from ever granting a request.
+            while pending and len(open_tabs) < tab_count:
+                started = acquire_request(block=not open_tabs)
+                if started is None:
+                    break
+                index, link = pending.pop(0)
+                known_handles = set(driver.window_handles)
+                driver.switch_to.window(main_handle)
+                driver.execute_script("window.open(arguments[0], '_blank');", link)
+                new_handles = [h for h in driver.window_handles if h not in known_handles]
+                if not new_handles:
+                    release_request(started, failed=True)
+                    fallback.append((index, link))
+                    continue
+                open_tabs[new_handles[0]] = (index, link, started)
+            
+            # Harvest every tab whose product section has rendered
+            for handle, (index, link, opened_at) in list(open_tabs.items()):
+                broken = False
+                try:
+                    driver.switch_to.window(handle)
+                    ready = driver.find_elements(By.CLASS_NAME, "image-header-info-section")
+                    product_details = read_product_fields(driver, verbose=False) if ready else None
+                    valid = count_valid_fields(product_details) if product_details else 0
+                    # Late fields such as the description may still be rendering until the page has loaded
+                    settled = valid == len(PRODUCT_FIELDS) or (
+                        valid >= MIN_VALID_FIELDS and driver.execute_script(TAB_SETTLED_SCRIPT))
+                except Exception as e:
+                    print(f"Tab for {link} failed: {str(e)}")
+                    product_details, valid, settled, broken = None, 0, False, True  # Treat as timed out
+                
+                timed_out = broken or time.time() - opened_at > timeout
+                if not settled and not timed_out:
+                    continue
+                finished = valid >= MIN_VALID_FIELDS
+                
+                release_request(opened_at, failed=not finished)
+                if finished:
+                    results[index] = product_details
+                else:
+                    print(f"Tab for {link} did not become ready, will retry it separately")
+                    fallback.append((index, link))
+                
+                try:
+                    driver.close()
+                except Exception:
+                    pass
+                del open_tabs[handle]
+            
+            if open_tabs:
+                wait_poll()
+    finally:
+        # Never leave stray tabs behind, and hand the session back on the main window
+        for handle, (_, _, opened_at) in list(open_tabs.items()):
+            release_request(opened_at, failed=True)
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        driver.switch_to.window(main_handle)
+    
+    for index, link in fallback:
+        product_details = extract_product_details(driver, link, retry_count)
+        if product_details:
+            results[index] = product_details
+    
+    return {product_links[index]: results[index] for index in sorted(results)}
+
+# Tags that never have a closing tag, so they must not change the nesting depth
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+             'meta', 'param', 'source', 'track', 'wbr'}
+
+class ProductPageParser(HTMLParser):
+    """Single-pass parser collecting product fields from server-rendered HTML.
+    
+    Reads the text of the elements identified by PRODUCT_FIELD_DATA_IDS, the
+    main product image and any JSON-LD blocks, without building a DOM.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+        self.json_ld = []
+        self._field = None
+        self._depth = 0
+        self._text = []
+        self._in_json_ld = False
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self._field:
+            if tag in VOID_TAGS:
+                self._text.append(' ')  # Keep <br> separated lines apart
+            else:
+                self._depth += 1
+            return
+        
+        data_id = attrs.get('data-id')
+        if tag == 'img' and data_id == PRODUCT_IMAGE_DATA_ID and attrs.get('src'):
+            self.fields.setdefault('image_url', attrs['src'])
+        elif data_id in PRODUCT_FIELD_DATA_IDS and tag not in VOID_TAGS:
+            self._field = PRODUCT_FIELD_DATA_IDS[data_id]
+            self._depth = 1
+            self._text = []
+        elif tag == 'script' and attrs.get('type') == 'application/ld+json':
+            self._in_json_ld = True
+            self._text = []
+    
+    def handle_endtag(self, tag):
+        if self._field:
+            if tag in VOID_TAGS:
+                return  # `<br/>` reaches here through handle_startendtag but never opened a level
+            self._depth -= 1
+            if self._depth == 0:
+                text = ' '.join(''.join(self._text).split())
+                if text:
+                    self.fields.setdefault(self._field, text)
+                self._field = None
+        elif self._in_json_ld and tag == 'script':
+            self.json_ld.append(''.join(self._text))
+            self._in_json_ld = False
+    
+    def handle_data(self, data):
+        if self._field or self._in_json_ld:
+            self._text.append(data)
+
+def product_from_json_ld(blocks):
+    """Maps a schema.org Product from JSON-LD blocks onto the CSV fields.
+    
+    Args:
+        blocks (list[str]): Raw contents of `application/ld+json` script tags.
+        
+    Returns:
+        dict: Whatever product fields the blocks provide (may be empty).
+    """
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get('@graph', [data])
+        for item in items:
+            if not isinstance(item, dict) or item.get('@type') != 'Product':
+                continue
+            brand = item.get('brand')
+            image = item.get('image')
+            offers = item.get('offers')
+            fields = {
+                'sku': item.get('sku') or item.get('productID'),
+                'brand': brand.get('name') if isinstance(brand, dict) else brand,
+                'name': item.get('name'),
+                'packaging': offers.get('eligibleQuantity', {}).get('value') if isinstance(offers, dict) else None,
+                'image_url': image[0] if isinstance(image, list) and image else image,
+                'description': item.get('description'),
+            }
+            return {key: str(value).strip() for key, value in fields.items() if value}
+    return {}
+
+def parse_product_html(html):
+    """Parses the six product fields out of a product page's HTML.
+    
+    Element text identified by the page's data-id attributes wins; JSON-LD
+    fills in anything the markup lacks.
+    
+    Args:
+        html (str): Product page HTML as returned by the server.
+        
+    Returns:
+        dict: Product details keyed by the CSV field names, with "N/A" for
+            fields that are not present without JavaScript.
+    """
+    parser = ProductPageParser()
+    parser.feed(html)
+    parser.close()
+    
+    fields = dict(product_from_json_ld(parser.json_ld))
+    fields.update(parser.fields)
+    return {field: fields.get(field) or "N/A" for field in PRODUCT_FIELDS}
+
+def build_http_session(driver, pool_size=HTTP_THREADS):
+    """Creates a pooled HTTP session that reuses the browser's guest session.
+    
+    Copies the driver's cookies (guest login and ZIP code) and its user agent
+    into a `requests.Session` whose connection pool is sized for `pool_size`
+    concurrent requests.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        pool_size (int, optional): Number of concurrent connections to keep
+            alive. Defaults to HTTP_THREADS.
+        
+    Returns:
+        requests.Session or None: Session ready for product requests, or None if
+            the `requests` package is not installed.
+    """
+    if requests is None:
+        print("requests is not installed, HTTP fast path disabled")
+        return None
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': driver.execute_script("return navigator.userAgent"),
+        'Accept': 'text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Referer': driver.current_url,
+    })
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return session
+
+@timed
+def fetch_product_http(session, product_link):
+    """Fetches and parses a product page without the browser.
+    
+    Args:
+        session (requests.Session): Session from `build_http_session()`.
+        product_link (str): URL of the product page.
+        
+    Returns:
+        dict or None: Product details, or None if the request failed or the
+            page needs JavaScript to show enough fields.
+    """
+    try:
+        with request_slot() as slot:
+            response = session.get(product_link, timeout=HTTP_TIMEOUT)
+            slot['failed'] = response.status_code in THROTTLE_STATUSES
+        if response.status_code != 200:
+            return None
+        product_details = parse_product_html(response.text)
+    except Exception as e:
+        print(f"HTTP fetch failed for {product_link}: {str(e)}")
+        return None
+    
+    if count_valid_fields(product_details) < MIN_VALID_FIELDS:
+        return None
+    return product_details
+
+def extract_products_http(session, product_links, threads=HTTP_THREADS):
+    """Fetches several product pages concurrently over HTTP.
+    
+    Args:
+        session (requests.Session): Session from `build_http_session()`.
+        product_links (list[str]): URLs of the product pages.
+        threads (int, optional): Concurrent requests. Defaults to HTTP_THREADS.
+        
+    Returns:
+        dict: Product details keyed by product URL, for the pages that could be
+            parsed without JavaScript. Missing URLs need the browser.
+    """
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = executor.map(lambda link: fetch_product_http(session, link), product_links)
+        return {link: product for link, product in zip(product_links, results) if product}
+
+# Keys under which the catalog API may return each product field, in order of preference
+LISTING_FIELD_KEYS = {
+    'sku': ('supc', 'sku', 'materialId', 'productId', 'productID'),
+    'brand': ('brand', 'brandName', 'brandDescription'),
+    'name': ('name', 'productName', 'title', 'shortDescription'),
+    'packaging': ('packSize', 'pack_size', 'packSizeDescription', 'packaging'),
+    'image_url': ('imageUrl', 'imageURL', 'image', 'images', 'primaryImage', 'thumbnailUrl'),
+    'description': ('productDescription', 'longDescription', 'marketingDescription', 'descriptionText'),
+}
+
+def read_network_responses(driver):
+    """Collects JSON responses recorded in the browser's performance log.
+    
+    Reading the log clears it, so each call only sees responses received since
+    the previous call. Bodies that Chrome has already discarded are skipped.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver started with `capture_network=True`.
+        
+    Returns:
+        list: Decoded JSON payloads, oldest first.
+    """
+    payloads = []
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            response = message['params']['response']
+            if 'json' not in response.get('mimeType', ''):
+                continue
+            body = driver.execute_cdp_cmd('Network.getResponseBody',
+                                          {'requestId': message['params']['requestId']})
+            payloads.append(json.loads(body['body']))
+        except Exception:
+            continue
+    return payloads
+
+def listing_value(value):
+    """Flattens an API value (string, number, dict or list) into a CSV string."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        if 'pack' in value and 'size' in value:
+            return f"{value['pack']}/{value['size']}"
+        for key in ('name', 'url', 'value', 'description'):
+            if value.get(key):
+                return listing_value(value[key])
+        return None
+    if value is None or value == '':
+        return None
+    return str(value).strip()
+
+def find_product_records(payload):
+    """Walks an API payload and yields every object that looks like a product.
+    
+    Args:
+        payload: Decoded JSON response.
+        
+    Yields:
+        dict: Product details keyed by the CSV field names, "N/A" for missing fields.
+    """
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        
+        record = {}
+        for field, keys in LISTING_FIELD_KEYS.items():
+            for key in keys:
+                value = listing_value(node.get(key))
+                if value:
+                    record[field] = value
+                    break
+        if record.get('sku') and record.get('name'):
+            yield {field: record.get(field, "N/A") for field in PRODUCT_FIELDS}
+        else:
+            stack.extend(node.values())
+
+def capture_listing_products(driver, product_links):
+    """Decodes the products shown on a listing page from its API responses.
+    
+    Product records are matched to the page's card links by their SKU, which
+    appears in the product URL.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver started with `capture_network=True`.
+        product_links (list[str]): Product URLs found on the listing page.
+        
+    Returns:
+        dict: Product details keyed by product URL, for the links whose product
+            was found in the captured responses.
+    """
+    try:
+        payloads = read_network_responses(driver)
+    except Exception as e:
+        print(f"Could not read network log: {str(e)}")
+        return {}
+    
+    records = {}
+    for payload in payloads:
+        for record in find_product_records(payload):
+            records.setdefault(record['sku'], record)
+    
+    captured = {}
+    for link in product_links:
+        for sku in re.findall(r'\d{5,}', link):
+            if sku in records:
+                captured[link] = records[sku]
+                break
+    return captured
+
+def merge_product_fields(listing_record, page_record):
+    """Combines a product decoded from the listing with one read from its page.
+    
+    Listing values are kept; the product page only fills fields the listing
+    payload lacked.
+    
+    Args:
+        listing_record (dict or None): Product decoded from listing responses.
+        page_record (dict or None): Product extracted from the product page.
+        
+    Returns:
+        dict or None: Merged product details, or None if neither source has
+            enough valid fields.
+    """
+    if not listing_record:
+        return page_record
+    merged = dict(listing_record)
+    for field in PRODUCT_FIELDS:
+        if merged.get(field, "N/A") == "N/A" and page_record:
+            merged[field] = page_record.get(field, "N/A")
+    return merged if count_valid_fields(merged) >= MIN_VALID_FIELDS else page_record
+
+class ListingPageParser(HTMLParser):
+    """Single-pass parser collecting product card links from listing page HTML."""
+    
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = []
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'a' and 'product-card-link' in (attrs.get('class') or '').split() and attrs.get('href'):
+            link = urljoin(self.base_url, attrs['href'])
+            if link not in self.links:
+                self.links.append(link)
+
+@timed
+def fetch_listing_links_http(session, listing_url):
+    """Fetches a listing page over HTTP and returns its product links.
+    
+    Args:
+        session (requests.Session): Session from `build_http_session()`.
+        listing_url (str): URL of the listing page, see `category_page_url()`.
+        
+    Returns:
+        list[str]: Product URLs, empty if the request failed or the cards are
+            only rendered by JavaScript.
+    """
+    try:
+        with request_slot() as slot:
+            response = session.get(listing_url, timeout=HTTP_TIMEOUT)
+            slot['failed'] = response.status_code in THROTTLE_STATUSES
+        if response.status_code != 200:
+            return []
+        parser = ListingPageParser(listing_url)
+        parser.feed(response.text)
+        parser.close()
+        return parser.links
+    except Exception as e:
+        print(f"HTTP fetch failed for {listing_url}: {str(e)}")
+        return []
+
+@timed
+def get_total_pages(driver):
+    """Determines the total number of pages in the current product category.
+    
+    Analyzes the search results text to calculate how many pages of products
+    are available in the current category.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on a category page.
+        
+    Returns:
+        int: Total number of pages available (defaults to 1 if calculation fails).
+    """
+    try:
+        wait_until(driver,
+            EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper")), 'category'
+        )
+        
+        results_element = wait_until(driver,
+            EC.presence_of_element_located((By.CSS_SELECTOR, "span[data-id='ss-searchPage-header-label-searchResultsTotalText']")), 'category'
+        )
+        
+        results_text = results_element.text
+        
+        
+        numbers = re.findall(r'\d+', results_text)
+        total_items = int(numbers[-1])
+        total_pages = (total_items + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
+        print(f"Total items: {total_items}, Pages: {total_pages}")
+        return total_pages
+        
+    except Exception as e:
+        print(f"Error getting total pages: {str(e)}")
+        return 1
+    
+def go_to_next_page(driver):
+    """Navigates to the next page of products in the current category.
+    
+    Attempts to click the pagination "next" button to advance to the next
+    page of product listings.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on a category page.
+        
+    Returns:
+        bool: True if navigation was successful, None if it failed.
+    """
+    print("Navigating to next page...")
+    
+    try:
+        next_button = wait_until(driver,
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.pagination-btn-right")), 'pagination'
+        )
+        driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
+        wait_until(driver, EC.element_to_be_clickable(next_button), 'pagination')
+        
+        # Remember a current card so we can tell when the next page has replaced it
+        current_cards = driver.find_elements(By.CSS_SELECTOR, "div.product-card-container")
+        with request_slot() as slot:
+            next_button.click()
+            print("Success with original selector")
+            if current_cards:
+                wait_until(driver, EC.staleness_of(current_cards[0]), 'pagination', required=False)
+            slot['failed'] = not wait_until(driver, element_count_stable("div.product-card-container"),
+                                            'listing', required=False)
+        return True
+    except Exception as e:
+        print(f"Navigating failed...")
+
+# Whether the site honours the page URL parameter (None until a deep page proves it either way),
+# shared by every browser; until then also the first product card of page 1 per browser session
+# and category (ZIP sessions may list different products), for pages whose number cannot be read
+_direct_paging = {'supported': None, 'first_links': {}}
+_direct_paging_lock = threading.Lock()
+
+def category_page_url(category_url, page, page_param=PAGE_PARAM):
+    """Builds the URL of a specific listing page of a category.
+    
+    Args:
+        category_url (str): URL of the category landing page (page 1).
+        page (int): 1-based page number.
+        page_param (str, optional): Query parameter holding the page number.
+            Defaults to PAGE_PARAM.
+        
+    Returns:
+        str: Category URL with the page parameter set (unchanged for page 1).
+    """
+    if page == 1:
+        return category_url
+    parts = urlsplit(category_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != page_param]
+    query.append((page_param, str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def current_page_number(driver):
+    """Reads the active page number from the pagination controls.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on a listing page.
+        
+    Returns:
+        int or None: Page number shown as active, or None if it cannot be read.
+    """
+    elements = driver.find_elements(
+        By.CSS_SELECTOR,
+        "button.pagination-btn.active, button.pagination-btn[aria-current='page'], "
+        "[data-id='pagination-current-page']"
+    )
+    for element in elements:
+        digits = re.findall(r'\d+', element.text)
+        if digits:
+            return int(digits[0])
+    return None
+
+def first_card_link(driver):
+    """Returns the canonical URL of the first product card on the listing page, or None."""
+    try:
+        links = [href for href in driver.execute_script(READ_CARD_LINKS_SCRIPT) if href]
+    except Exception:
+        return None
+    return canonical_product_url(links[0]) if links else None
+
+def remember_first_link(driver, key):
+    """Records the first card of a page 1 while direct paging is unproven, and returns it."""
+    link = first_card_link(driver)
+    with _direct_paging_lock:
+        if _direct_paging['supported'] is None:
+            _direct_paging['first_links'][key] = link
+    return link
+
+def settle_direct_paging(supported):
+    """Records whether the page parameter works; the page 1 cards are no longer needed."""
+    with _direct_paging_lock:
+        _direct_paging['supported'] = supported
+        _direct_paging['first_links'].clear()
+
+def load_listing(driver, url):
+    """Loads a listing page and waits for its product cards."""
+    with request_slot() as slot:
+        driver.get(url)
+        slot['failed'] = not wait_until(driver, EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper")),
+                                        'category', required=False)  # Wait for category page to load
+
+@timed
+def open_category_page(driver, category_url, page, page_param=PAGE_PARAM):
+    """Opens a specific page of a category listing.
+    
+    Jumps straight to the page through its URL parameter, so every page costs
+    one navigation regardless of depth. If the site turns out to ignore the
+    parameter, this (and every later call) falls back to clicking through the
+    pagination controls from wherever the browser landed. The parameter counts
+    as ignored when the active page number is wrong or, if it cannot be read,
+    when the first product card is page 1's; until that is settled, deep
+    pages also load page 1 once per category to compare against.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance to navigate with.
+        category_url (str): URL of the category landing page (page 1).
+        page (int): 1-based page number to open.
+        page_param (str, optional): Query parameter holding the page number.
+            Defaults to PAGE_PARAM.
+        
+    Returns:
+        bool: True if the requested page is displayed, False otherwise.
+    """
+    key = (getattr(driver, 'session_id', None), category_url)
+    with _direct_paging_lock:
+        supported = _direct_paging['supported']
+        known = key in _direct_paging['first_links']
+        first_link = _direct_paging['first_links'].get(key)
+    direct = page > 1 and supported is not False
+    if direct and supported is None and not known:
+        # Until the parameter is proven, page 1's cards tell an ignored parameter apart
+        load_listing(driver, category_url)
+        first_link = remember_first_link(driver, key)
+    load_listing(driver, category_page_url(category_url, page, page_param) if direct else category_url)
+    if page == 1 and supported is None:
+        remember_first_link(driver, key)
+    
+    landed = 1
+    if direct:
+        shown = current_page_number(driver)
+        if shown is None and supported:
+            return True
+        if shown is None:
+            # No readable page number: page 1's cards mean the parameter was ignored
+            link = first_card_link(driver)
+            if link and first_link and link != first_link:
+                shown = page
+            elif not link or not first_link:
+                # Nothing to compare; click through from page 1 without deciding for later pages
+                load_listing(driver, category_url)
+                return all(go_to_next_page(driver) for _ in range(page - 1))
+            else:
+                shown = 1
+        if shown == page:
+            settle_direct_paging(True)
+            return True
+        print(f"Page URL parameter ignored (asked for page {page}, got {shown}), using pagination clicks")
+        settle_direct_paging(False)
+        landed = shown
+    
+    for _ in range(page - landed):
+        if not go_to_next_page(driver):
+            return False
+    return True
+
+def extract_products_in_browser(driver, product_links, options=None, retry_count=2):
+    """Extracts product details by loading each product page in the browser.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance to load the pages in.
+        product_links (list[str]): URLs of the product pages to extract.
+        options (dict, optional): Run options; 'tabs' sets how many pages load
+            in parallel tabs. Defaults to None.
+        retry_count (int, optional): Attempts per product page. Defaults to 2.
+        
+    Returns:
+        dict: Product details keyed by product URL, for the products that
+            could be extracted.
+    """
+    tabs = (options or {}).get('tabs', 1)
+    if tabs > 1:
+        print(f"Extracting {len(product_links)} products in {tabs} tabs")
+        return extract_products_in_tabs(driver, product_links, tabs, retry_count=retry_count)
+    
+    products = {}
+    for index, link in enumerate(product_links, 1):
+        print(f"Processing product {index}/{len(product_links)}")
+        product_details = extract_product_details(driver, link, retry_count)
+        if product_details:
+            products[link] = product_details
+    return products
+
+def scrape_current_page(driver, page, total_pages, options=None, http_session=None, product_links=None):
+    """Collects product details for every product listed on the current page.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance positioned on a listing page.
+        page (int): 1-based number of the page being processed (for progress output).
+        total_pages (int): Total number of pages in the category (for progress output).
+        options (dict, optional): Run options from `parse_args()` plus shared run
+            state such as the 'journal'. Defaults to None.
+        http_session (requests.Session, optional): Session sharing the browser's
+            cookies; when given, product pages are fetched over HTTP first and
+            only pages that need JavaScript are loaded in the browser. Defaults to None.
+        product_links (list[str], optional): Links already read from the listing
+            (e.g. over HTTP); read from the displayed page when omitted.
+        
+    Returns:
+        list[dict] or None: Product details newly recorded from the page (already
+            handed to the run's journal and sink), or None if no product links could
+            be found on it. Products a resumed run replayed from the journal and
+            duplicates of products scraped earlier are left out, and products that
+            failed or came back partial are dead-lettered for the retry pass.
+    """
+    options = options or {}
+    product_links = product_links or get_product_links(driver, MAIN_PASS_ATTEMPTS)
+    if not product_links:
+        return None
+    
+    print(f"Found {len(product_links)} products on page {page}/{total_pages}")
+    
+    # Products already scraped from another page or category cost nothing
+    dedup = options.get('dedup')
+    if dedup:
+        new_links = [link for link in product_links if dedup_claim(dedup, link)]
+        if len(new_links) < len(product_links):
+            print(f"Skipping {len(product_links) - len(new_links)} products already scraped")
+        product_links = new_links
+    
+    # Claims of links that were neither recorded nor queued are released if extraction
+    # raises (e.g. on a dead browser), so the page's retry does not skip them as seen
+    settled = set()
+    try:
+        # Products finished by an earlier (interrupted) run come straight from the journal
+        journal = options.get('journal')
+        journaled = {}
+        if journal:
+            for link in product_links:
+                product_details = journal_get_product(journal, link)
+                if product_details:
+                    journaled[link] = product_details
+            if journaled:
+                print(f"{len(journaled)} products already in the journal")
+        
+        # Products whose card still matches the previous snapshot are reused as they are
+        incremental = options.get('incremental')
+        unchanged = {}
+        if incremental:
+            unchanged = incremental_unchanged(driver, [link for link in product_links if link not in journaled],
+                                              incremental)
+            if unchanged:
+                print(f"{len(unchanged)} products unchanged since the previous snapshot")
+        
+        # Products decoded from the listing's own API responses need no page load
+        # unless the payload lacks some of their fields
+        captured = capture_listing_products(driver, product_links) if options.get('capture') else {}
+        if captured:
+            print(f"Decoded {len(captured)} of {len(product_links)} products from listing responses")
+        needed = [link for link in product_links if link not in journaled and link not in unchanged
+                  and (link not in captured or count_valid_fields(captured[link]) < len(PRODUCT_FIELDS))]
+        
+        details = {}
+        if http_session is not None and needed:
+            details = extract_products_http(http_session, needed, options.get('http_threads', HTTP_THREADS))
+            needed = [link for link in needed if link not in details]
+        
+        # Fall back to Selenium for pages whose fields are only rendered by JavaScript
+        if needed:
+            if http_session is not None:
+                print(f"{len(needed)} products need the browser")
+            details.update(extract_products_in_browser(driver, needed, options, MAIN_PASS_ATTEMPTS))
+        
+        products = []
+        for link in product_links:
+            if link in journaled:
+                settled.add(link)  # Already replayed to the output, so not counted again
+                continue
+            if link in unchanged:
+                if emit_product(options, link, unchanged[link], unchanged=True):
+                    products.append(unchanged[link])
+                settled.add(link)
+                continue
+            product_details = merge_product_fields(captured.get(link), details.get(link))
+            if not product_details or count_valid_fields(product_details) < MIN_VALID_FIELDS:
+                # Retried after the main pass; the link stays claimed so no other page redoes it
+                if journal:
+                    dead_letter_add(journal, 'product', link,
+                                    "partial record" if product_details else "extraction failed",
+                                    {'partial': product_details})
+                    settled.add(link)
+                continue  # Without a journal the claim is released below, so it can be tried again
+            if emit_product(options, link, product_details):
+                products.append(product_details)
+            settled.add(link)
+        return products
+    finally:
+        if dedup:
+            for link in product_links:
+                if link not in settled:
+                    dedup_release(dedup, link)
+
+def emit_product(options, product_link, product_details, unchanged=False):
+    """Hands a finished product to the run's outputs unless its SKU was already scraped.
+    
+    Args:
+        options (dict): Run options and shared run state.
+        product_link (str): URL the product was extracted from.
+        product_details (dict): Extracted product record.
+        unchanged (bool, optional): The record was reused from the previous
+            snapshot of an incremental run. Defaults to False.
+        
+    Returns:
+        bool: True if the product was recorded, False if it was a duplicate.
+    """
+    # The same SKU can hide behind a different URL
+    dedup = options.get('dedup')
+    if dedup and not dedup_add_sku(dedup, product_details.get('sku'), product_link):
+        return False
+    record_product(options, product_link, product_details)
+    if options.get('incremental'):
+        incremental_record(options['incremental'], product_details, unchanged=unchanged)
+    return True
+
+@timed
+def scrape_page(driver, category_url, page, total_pages, options=None, http_session=None, displayed=False):
+    """Opens one listing page of a category and scrapes it.
+    
+    With the HTTP fast path, the listing is fetched directly by its page URL
+    and the browser only navigates there if the cards need JavaScript.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance to use.
+        category_url (str): URL of the category landing page (page 1).
+        page (int): 1-based page number.
+        total_pages (int): Total number of pages in the category.
+        options (dict, optional): Run options and shared run state. Defaults to None.
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        displayed (bool, optional): The browser already shows this page. Defaults to False.
+        
+    Returns:
+        list[dict] or None: Product details for the page, or None if the page
+            could not be opened or had no products (it is then dead-lettered).
+    """
+    options = options or {}
+    page_param = options.get('page_param', PAGE_PARAM)
+    
+    # Capture and incremental modes need the browser on the listing to read it
+    product_links = None
+    if (http_session is not None and not options.get('capture') and not options.get('incremental')
+            and not displayed):
+        product_links = fetch_listing_links_http(http_session, category_page_url(category_url, page, page_param))
+    
+    journal = options.get('journal')
+    if not product_links and not displayed:
+        if not open_category_page(driver, category_url, page, page_param):
+            print(f"Could not navigate to page {page}")
+            if journal:
+                dead_letter_page(journal, category_url, page, total_pages, "could not open page")
+            return None
+    products = scrape_current_page(driver, page, total_pages, options, http_session, product_links)
+    if products is None and journal:
+        dead_letter_page(journal, category_url, page, total_pages, "no product links found")
+    return products
+
+def mark_category_if_done(journal, category_url, total_pages):
+    """Marks a category done in the journal if every one of its pages is.
+    
+    Returns:
+        bool: True if the whole category is done.
+    """
+    if not all(journal_is_done(journal, 'page', page_key(category_url, page))
+               for page in range(1, total_pages + 1)):
+        return False
+    journal_mark_done(journal, 'category', category_url)
+    return True
+
+def target_items(options):
+    """Products a run stops after: TARGET_ITEMS unless overridden, None for no target."""
+    return (options or {}).get('target_items', TARGET_ITEMS)
+
+def target_reached(options, count):
+    """Whether a run has collected enough products to stop early (never for an incremental run)."""
+    target = target_items(options)
+    return target is not None and count >= target
+
+def dead_letter_page(journal, category_url, page, total_pages, reason):
+    """Queues a listing page that could not be scraped for the retry pass."""
+    dead_letter_add(journal, 'page', page_key(category_url, page), reason,
+                    {'category_url': category_url, 'page': page, 'total_pages': total_pages})
+
+def process_products(driver, options=None, http_session=None, category_url=None, supervisor=None):
+    """Processes all products across all pages within the current category.
+    
+    Iterates through all pages of the current product category, extracts
+    product links from each page, and collects detailed product information.
+    Includes error handling and retry logic for failed pages.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance positioned on a category page.
+        options (dict, optional): Run options, see `parse_args()`. Defaults to None.
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        category_url (str, optional): URL the category was opened with. Defaults
+            to the driver's current URL.
+        supervisor (dict, optional): Supervisor that may recycle the browser between
+            pages; processing then continues on the new browser at the same page.
+            Defaults to None.
+        
+    Returns:
+        int: Number of products collected from the category. The records
+            themselves are streamed to the run's sink as they are extracted.
+    """
+    # Process products - retry pages instead of giving up
+    collected = 0
+    try:
+        total_pages = get_total_pages(driver)
+        
+        print(f"Starting to process {total_pages} pages")
+        
+        category_url = category_url or driver.current_url  # Store category page URL
+        original_driver = driver  # Page 1 is only displayed in the original browser
+        journal = (options or {}).get('journal')
+        consecutive_failed_pages = 0  # Track failed pages
+        max_failed_pages = 3  # Stop after 3 consecutive failures
+        
+        for page in range(1, total_pages + 1):
+            if journal and journal_is_done(journal, 'page', page_key(category_url, page)):
+                print(f"Page {page} of {total_pages} already in the journal, skipping")
+                continue
+            
+            print(f"\nProcessing page {page} of {total_pages}")
+            
+            # Page 1 is already displayed, later pages are opened directly by their URL
+            products = scrape_page(driver, category_url, page, total_pages, options, http_session,
+                                   displayed=(page == 1 and driver is original_driver))
+            if supervisor:
+                driver = supervise_driver(supervisor)
+            
+            if products is None:
+                consecutive_failed_pages += 1
+                print(f"No products found on page {page} (failure #{consecutive_failed_pages})")
+                
+                # If we've failed too many times in a row, leave the rest of this category
+                # to the retry pass
+                if consecutive_failed_pages >= max_failed_pages:
+                    print(f"Failed to find products on {consecutive_failed_pages} consecutive pages")
+                    print("Deferring the rest of this category to the retry pass")
+                    if journal:
+                        for later_page in range(page + 1, total_pages + 1):
+                            if not journal_is_done(journal, 'page', page_key(category_url, later_page)):
+                                dead_letter_page(journal, category_url, later_page, total_pages,
+                                                 "category deferred after consecutive failures")
+                    break
+                
+                # The failed page is dead-lettered; carry on with the next one
+                continue
+            
+            # Reset failure counter when we find products
+            consecutive_failed_pages = 0
+            collected += len(products)
+            if journal:
+                journal_mark_done(journal, 'page', page_key(category_url, page))
+        
+        # A resumed run skips the whole category only once every page is journaled
+        if journal:
+            mark_category_if_done(journal, category_url, total_pages)
+        
+        print(f"\nSuccessfully processed {collected} total products from this category")
+        return collected
+        
+    except Exception as e:
+        print(f"Error processing products: {str(e)}")
+        return collected
+
+def retry_dead_letters(driver, options, http_session=None, until_exhausted=True):
+    """Works through the dead-letter queue: failed listing pages first, then products.
+    
+    Pages that now load have their products scraped (failures among those are
+    queued and retried in the same pass). Products are fetched again with the
+    full inline retries; for partial records only the missing fields are
+    taken from the new fetch. Units that fail again stay queued with their
+    attempt count raised, as do units whose retry raised (e.g. on a dead
+    browser), and a product that runs out of attempts is written with
+    whatever fields it has.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        options (dict): Run options and shared run state ('journal', 'retry_attempts').
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        until_exhausted (bool, optional): Repeat the pass until every queued unit
+            succeeded or used up its attempts, so partial products are written in
+            the same run. False runs a single round, as the periodic pass does.
+            Defaults to True.
+        
+    Returns:
+        int: Number of products recovered.
+    """
+    collected = 0
+    while True:
+        recovered = retry_round(driver, options, http_session)
+        if recovered is None:
+            return collected
+        collected += recovered
+        if not until_exhausted:
+            return collected
+
+def retry_round(driver, options, http_session=None):
+    """Runs one round of `retry_dead_letters()` over everything currently queued.
+    
+    Returns:
+        int or None: Number of products recovered, or None if nothing was queued.
+    """
+    journal = options['journal']
+    max_attempts = options.get('retry_attempts') or DEAD_LETTER_ATTEMPTS
+    pages = dead_letters(journal, 'page', max_attempts)
+    queued_products = dead_letters(journal, 'product', max_attempts)
+    if not pages and not queued_products:
+        return None
+    print(f"\nRetry pass: {len(pages)} pages and {len(queued_products)} products queued")
+    
+    collected = 0
+    for item in pages:
+        context = item['context']
+        if journal_is_done(journal, 'page', item['key']):
+            dead_letter_remove(journal, 'page', item['key'])
+            continue
+        print(f"Retrying page {context['page']} of {context['category_url']} "
+              f"(attempt {item['attempts'] + 1}, last failure: {item['reason']})")
+        record_retry('scrape_page')
+        try:
+            products = scrape_page(driver, context['category_url'], context['page'], context['total_pages'],
+                                   options, http_session)
+        except Exception as e:
+            # E.g. a dead browser: the page stays queued with one more attempt used up
+            print(f"Error retrying page {context['page']}: {str(e)}")
+            dead_letter_add(journal, 'page', item['key'], f"error: {str(e)}", context)
+            continue
+        if products is not None:
+            journal_mark_done(journal, 'page', item['key'])
+            dead_letter_remove(journal, 'page', item['key'])
+            mark_category_if_done(journal, context['category_url'], context['total_pages'])
+            collected += len(products)
+    
+    # Re-read the queue: the retried pages may have added products
+    for item in dead_letters(journal, 'product', max_attempts):
+        try:
+            collected += retry_product(driver, item, options, http_session, max_attempts)
+        except Exception as e:
+            print(f"Error retrying product {item['key']}: {str(e)}")
+            dead_letter_add(journal, 'product', item['key'], f"error: {str(e)}", item['context'])
+    
+    print(f"Retry pass recovered {collected} products")
+    return collected
+
+def retry_product(driver, item, options, http_session, max_attempts):
+    """Retries one dead-lettered product; see `retry_dead_letters()`.
+    
+    Returns:
+        int: 1 if a product was recorded, 0 otherwise.
+    """
+    journal = options['journal']
+    link = item['key']
+    partial = item['context'].get('partial')
+    print(f"Retrying product {link} (attempt {item['attempts'] + 1}, last failure: {item['reason']})")
+    record_retry('extract_product_details')
+    
+    fresh = fetch_product_http(http_session, link) if http_session is not None else None
+    if not fresh:
+        fresh = extract_product_details(driver, link)
+    
+    # Keep what the earlier attempt got; take only the missing fields from the new fetch
+    product_details = dict(partial or {})
+    for field in PRODUCT_FIELDS:
+        if product_details.get(field, "N/A") == "N/A":
+            product_details[field] = (fresh or {}).get(field, "N/A")
+    valid = count_valid_fields(product_details)
+    
+    if valid >= MIN_VALID_FIELDS:
+        dead_letter_remove(journal, 'product', link)
+        return 1 if emit_product(options, link, product_details) else 0
+    
+    reason = "partial record" if valid else "extraction failed"
+    dead_letter_add(journal, 'product', link, reason, {'partial': product_details if valid else None})
+    if item['attempts'] + 1 < max_attempts:
+        return 0
+    # Out of attempts: write what there is, as the inline retries always did
+    print(f"Giving up on {link} after {max_attempts} attempts")
+    if valid and emit_product(options, link, product_details):
         return 1
+    return 0
+
+def is_driver_alive(driver):
+    """Checks whether a WebDriver session still responds to commands.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance to check.
+        
+    Returns:
+        bool: True if the browser answered, False if it has crashed or been closed.
+    """
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def start_worker_driver(worker_id, options=None):
+    """Starts a browser for a pool worker and opens its own guest session.
+    
+    Args:
+        worker_id (int): Identifier of the worker, used in progress output.
+        options (dict, optional): Run options selecting the browser profile and
+            network capture. Defaults to None.
+        
+    Returns:
+        webdriver.Chrome: Authenticated Chrome WebDriver instance.
+        
+    Raises:
+        RuntimeError: If the guest authentication flow fails.
+    """
+    print(f"[worker {worker_id}] Starting browser...")
+    driver = setup_browser(options)
+    if not start_session(driver, options):
+        try:
+            driver.quit()
+        except:
+            pass
+        raise RuntimeError(f"authentication failed for worker {worker_id}")
+    return driver
+
+def run_pool_task(driver, task, tasks, options=None, http_session=None):
+    """Executes a single work unit on a pool worker's browser.
+    
+    A 'category' unit opens the category, counts its pages, queues units for
+    pages 2..N and scrapes page 1 in place. A 'page' unit opens and scrapes
+    one listing page.
+    
+    Args:
+        driver (webdriver.Chrome): Worker's authenticated Chrome WebDriver instance.
+        task (dict): Work unit with keys 'kind', 'category' and, for pages,
+            'page' and 'total_pages'.
+        tasks (queue.Queue): Shared work queue that new page units are added to.
+        options (dict, optional): Run options, see `parse_args()`. Defaults to None.
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        
+    Returns:
+        list[dict] or None: Products collected by the unit, or None if the
+            listing page had no products.
+    """
+    category = task['category']
+    journal = (options or {}).get('journal')
+    
+    if task['kind'] == 'category':
+        with request_slot() as slot:
+            driver.get(category['url'])
+            slot['failed'] = not wait_until(driver, EC.presence_of_element_located((By.CLASS_NAME, "catalog-cards-wrapper")),
+                                            'category', required=False)
+        total_pages = get_total_pages(driver)
+        print(f"{category['name']}: queueing {total_pages} pages")
+        for page in range(2, total_pages + 1):
+            if journal and journal_is_done(journal, 'page', page_key(category['url'], page)):
+                continue
+            tasks.put({'kind': 'page', 'category': category, 'page': page,
+                       'total_pages': total_pages, 'attempts': 0})
+        # From here on the unit stands for page 1 only, so a retry does not queue pages twice
+        task.update({'kind': 'page', 'page': 1, 'total_pages': total_pages})
+        if journal and journal_is_done(journal, 'page', page_key(category['url'], 1)):
+            return []
+        products = scrape_page(driver, category['url'], 1, total_pages, options, http_session, displayed=True)
+    else:
+        products = scrape_page(driver, category['url'], task['page'], task['total_pages'], options, http_session)
+    
+    if products is not None and journal:
+        journal_mark_done(journal, 'page', page_key(category['url'], task['page']))
+        mark_category_if_done(journal, category['url'], task['total_pages'])
+    return products
+
+def pool_worker(worker_id, tasks, progress, lock, stop, driver=None, options=None):
+    """Worker loop that pulls units from the shared queue until it receives None.
+    
+    Each worker owns one browser. If the browser crashes while a unit is being
+    processed, the unit is put back on the queue and the worker starts a new
+    browser with a fresh guest session before continuing.
+    
+    Args:
+        worker_id (int): Identifier of the worker, used in progress output.
+        tasks (queue.Queue): Shared work queue of unit dictionaries.
+        progress (dict): Shared counter of collected products under key 'count'.
+        lock (threading.Lock): Lock guarding `progress`.
+        stop (threading.Event): Set once enough products have been collected.
+        driver (webdriver.Chrome, optional): Already authenticated browser to
+            adopt instead of starting a new one. Defaults to None.
+        options (dict, optional): Run options, see `parse_args()`. Defaults to None.
+    """
+    options = options or {}
+    http_session = None
+    supervisor = None
+    while True:
+        task = tasks.get()
+        if task is None:
+            tasks.task_done()
+            break
+        
+        try:
+            if stop.is_set():
+                continue
+            
+            if driver is None:
+                driver = start_worker_driver(worker_id, options)
+                http_session = None
+            if supervisor is None or supervisor['driver'] is not driver:
+                supervisor = start_supervisor(driver, options)
+            if options.get('http') and http_session is None:
+                http_session = build_http_session(driver, options.get('http_threads', HTTP_THREADS))
+            
+            products = run_pool_task(driver, task, tasks, options, http_session)
+            
+            # A unit that comes back empty may just mean the browser died under it
+            if not products and not is_driver_alive(driver):
+                raise WebDriverException("browser stopped responding")
+            
+            if products:
+                with lock:
+                    progress['count'] += len(products)
+                    print(f"[worker {worker_id}] Total items so far: {progress['count']}")
+                    if target_reached(options, progress['count']):
+                        print(f"Reached {target_items(options)} items target!")
+                        stop.set()
+            
+            # Restart a worn-out browser between units, keeping its session
+            try:
+                driver = supervise_driver(supervisor)
+            except Exception as e:
+                print(f"[worker {worker_id}] Could not recycle browser: {str(e)}")
+                driver = None  # The next unit starts a new one
+                        
+        except Exception as e:
+            print(f"[worker {worker_id}] Worker failed: {str(e)}")
+            task['attempts'] = task.get('attempts', 0) + 1
+            if task['attempts'] < MAX_TASK_ATTEMPTS:
+                print(f"[worker {worker_id}] Re-queueing {task['kind']} unit for {task['category']['name']}")
+                record_retry('pool_task')
+                tasks.put(task)
+            else:
+                print(f"[worker {worker_id}] Dropping {task['kind']} unit for {task['category']['name']}")
+            
+            # Replace the browser, the next unit starts a new one
+            if driver:
+                try:
+                    driver.quit()
+                except:
+                    pass
+            driver = None
+            
+        finally:
+            tasks.task_done()
+    
+    if driver:
+        try:
+            driver.quit()
+        except:
+            pass
+
+def scrape_with_pool(categories, num_workers, driver=None, options=None):
+    """Scrapes categories in parallel with a pool of independent browsers.
+    
+    Categories are queued as work units; each category unit in turn queues one
+    unit per listing page, so idle workers pick up pages of large categories
+    as well as whole categories.
+    
+    Args:
+        categories (list[dict]): Categories as returned by `get_all_categories()`.
+        num_workers (int): Number of browsers to run concurrently.
+        driver (webdriver.Chrome, optional): Authenticated browser that the first
+            worker adopts instead of starting its own. Defaults to None.
+        options (dict, optional): Run options, see `parse_args()`. Defaults to None.
+            
+    Returns:
+        int: Number of products collected by all workers. The records are
+            streamed to the run's sink as they are extracted.
+    """
+    tasks = queue.Queue()
+    progress = {'count': 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+    
+    for category in categories:
+        tasks.put({'kind': 'category', 'category': category, 'attempts': 0})
+    
+    threads = []
+    for worker_id in range(num_workers):
+        thread = threading.Thread(
+            target=pool_worker,
+            args=(worker_id, tasks, progress, lock, stop, driver if worker_id == 0 else None, options),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    
+    # Wait for every unit (including page units queued along the way) to finish
+    tasks.join()
+    for _ in threads:
+        tasks.put(None)
+    for thread in threads:
+        thread.join()
+    
+    return progress['count']
+
+def start_frontier_heartbeat(frontier, holder, stop):
+    """Renews the lease of the unit in `holder['unit']` until `stop` is set.
+    
+    Runs in a background thread so long units (a slow product page, a deep
+    category) keep their lease while the node is alive.
+    """
+    def beat():
+        while not stop.wait(FRONTIER_LEASE_SECONDS / 3):
+            unit = holder.get('unit')
+            if unit and not frontier_heartbeat(frontier, unit):
+                print(f"Lost the lease on {unit['kind']} {unit['key']}")
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    return thread
+
+def run_frontier_unit(driver, frontier, unit, options, http_session=None):
+    """Works one leased unit: a category queues its pages, a page its products.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        frontier (dict): Frontier handle from `open_frontier()`.
+        unit (dict): Unit from `frontier_lease()`.
+        options (dict): Run options.
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        
+    Returns:
+        str or None: Failure reason, or None if the unit succeeded.
+    """
+    payload = unit['payload']
+    if unit['kind'] == 'category':
+        with request_slot() as slot:
+            driver.get(unit['key'])
+            slot['failed'] = not wait_until(driver, EC.presence_of_element_located(
+                (By.CLASS_NAME, "catalog-cards-wrapper")), 'category', required=False)
+        total_pages = get_total_pages(driver)
+        for page in range(1, total_pages + 1):
+            frontier_add(frontier, 'page', page_key(unit['key'], page),
+                         {'category_url': unit['key'], 'page': page, 'total_pages': total_pages})
+        print(f"{payload.get('name', unit['key'])}: queued {total_pages} pages")
+        return None
+    
+    if unit['kind'] == 'page':
+        page_param = options.get('page_param', PAGE_PARAM)
+        listing_url = category_page_url(payload['category_url'], payload['page'], page_param)
+        links = fetch_listing_links_http(http_session, listing_url) if http_session is not None else None
+        if not links:
+            if not open_category_page(driver, payload['category_url'], payload['page'], page_param):
+                return "could not open page"
+            links = get_product_links(driver, MAIN_PASS_ATTEMPTS)
+        if not links:
+            return "no product links found"
+        added = sum(frontier_add(frontier, 'product', canonical_product_url(link), {'url': link})
+                    for link in links)
+        print(f"Page {payload['page']}/{payload['total_pages']}: {added} new of {len(links)} products")
+        return None
+    
+    link = payload.get('url', unit['key'])
+    product_details = fetch_product_http(http_session, link) if http_session is not None else None
+    if not product_details:
+        product_details = extract_product_details(driver, link, MAIN_PASS_ATTEMPTS)
+    if not product_details or count_valid_fields(product_details) < MIN_VALID_FIELDS:
+        if not product_details or not count_valid_fields(product_details) or unit['attempts'] < FRONTIER_MAX_ATTEMPTS:
+            return "partial record" if product_details else "extraction failed"
+        # Out of attempts: store what there is, as the single-node retry pass does
+        print(f"Giving up on {link} after {unit['attempts']} attempts, keeping the partial record")
+    frontier_add_product(frontier, unit['key'], product_details)
+    count_event('products')
+    return None
+
+def run_frontier_worker(driver, frontier, options, http_session=None):
+    """Leases and works frontier units until the crawl is finished.
+    
+    The crawl is finished once the frontier has been seeded and no unit is
+    pending or leased by any node, or once TARGET_ITEMS products are stored
+    (checked every FRONTIER_POLL_SECONDS, so the target may be overshot by
+    what the nodes finish in the meantime).
+    A browser that dies mid-unit is replaced; the unit goes back to pending.
+    
+    Args:
+        driver (webdriver.Chrome): Authenticated Chrome WebDriver instance.
+        frontier (dict): Frontier handle from `open_frontier()`.
+        options (dict): Run options.
+        http_session (requests.Session, optional): Session for the HTTP fast path. Defaults to None.
+        
+    Returns:
+        webdriver.Chrome or None: The browser in use at the end (it may have
+            been replaced), for the caller to close.
+    """
+    holder = {}
+    stop = threading.Event()
+    start_frontier_heartbeat(frontier, holder, stop)
+    supervisor = start_supervisor(driver, options)
+    next_target_check = 0.0
+    try:
+        while True:
+            # Products are counted over every node's results, so only every few seconds; checking
+            # before the lease means a node that stops holds no unit and charges no attempt
+            if time.time() >= next_target_check:
+                next_target_check = time.time() + FRONTIER_POLL_SECONDS
+                if target_reached(options, frontier_status(frontier)['products']):
+                    print(f"Reached {target_items(options)} items target!")
+                    return driver
+            
+            unit = frontier_lease(frontier)
+            if unit is None:
+                status = frontier_status(frontier)
+                if frontier_get(frontier, 'seeded') and not status.get('pending') and not status.get('leased'):
+                    print(f"Frontier finished: {status}")
+                    return driver
+                time.sleep(FRONTIER_POLL_SECONDS)  # Others may still add units or drop their leases
+                continue
+            holder['unit'] = unit
+            try:
+                reason = run_frontier_unit(driver, frontier, unit, options, http_session)
+            except Exception as e:
+                reason = f"error: {str(e)}"
+            holder['unit'] = None
+            frontier_finish(frontier, unit, failed=reason is not None, reason=reason)
+            if reason:
+                print(f"{unit['kind']} {unit['key']} failed ({reason}), attempt {unit['attempts']}")
+                record_retry(f"frontier:{unit['kind']}")
+            
+            if not is_driver_alive(driver):
+                print("Browser stopped responding, starting a new one")
+                driver = recycle_driver(supervisor)
+                if http_session is not None:
+                    http_session = build_http_session(driver, options.get('http_threads', HTTP_THREADS))
+            else:
+                driver = supervise_driver(supervisor)
+    finally:
+        stop.set()
+
+def merge_frontier_products(frontier, options):
+    """Writes every product stored in the frontier to the run's outputs, once per SKU.
+    
+    URLs are already unique in the frontier; products listed under several
+    URLs are merged by SKU.
+    
+    Returns:
+        int: Number of products written.
+    """
+    written = 0
+    for url, product_details in iter_frontier_products(frontier):
+        if emit_product(options, url, product_details):
+            written += 1
+    return written
+
+def open_content_cache(journal):
+    """Opens the product content cache shared by every ZIP session of a run.
+    
+    Product pages do not depend on the shopper's location, so each product is
+    fetched once and stored in the run journal, keyed by canonical URL. ZIP
+    sessions that list the same product at the same time wait for the one
+    fetch instead of repeating it.
+    
+    Args:
+        journal (dict): Journal handle from `open_journal()`.
+        
+    Returns:
+        dict: Cache handle for `cached_content()`.
+    """
+    return {'journal': journal, 'lock': threading.Lock(), 'inflight': {}, 'hits': 0, 'fetches': 0}
+
+def cached_content(cache, product_link, fetch):
+    """Returns a product's details from the content cache, fetching them on a miss.
+    
+    Args:
+        cache (dict): Cache from `open_content_cache()`.
+        product_link (str): Product URL as listed.
+        fetch (callable): Takes the URL and returns product details or None.
+        
+    Returns:
+        dict or None: Product details, or None if the fetch failed.
+    """
+    key = canonical_product_url(product_link)
+    with cache['lock']:
+        product_details = journal_get_product(cache['journal'], key)
+        if product_details:
+            cache['hits'] += 1
+            return product_details
+        inflight = cache['inflight'].get(key)
+        if inflight is None:
+            inflight = cache['inflight'][key] = {'done': threading.Event(), 'details': None}
+            owner = True
+        else:
+            owner = False
+    
+    if not owner:
+        # Another ZIP session is fetching this product right now; a partial record
+        # is not cached but is still what that fetch got
+        inflight['done'].wait()
+        return inflight['details']
+    
+    try:
+        product_details = inflight['details'] = fetch(product_link)
+        if product_details and count_valid_fields(product_details) >= MIN_VALID_FIELDS:
+            journal_add_product(cache['journal'], key, product_details)
+        with cache['lock']:
+            cache['fetches'] += 1
+        return product_details
+    finally:
+        with cache['lock']:
+            del cache['inflight'][key]
+        inflight['done'].set()
+
+def scrape_zip(zip_code, options, cache):
+    """Records which products one ZIP code's catalog lists, joined with the shared content.
+    
+    Opens a guest session for the ZIP code, then walks every category's
+    listing pages. Only the listing is read per ZIP; product details come
+    from the content cache, so each product page is loaded once per run.
+    
+    Args:
+        zip_code (str): ZIP code of the session.
+        options (dict): Run options and shared run state ('sink', 'http', ...).
+        cache (dict): Content cache from `open_content_cache()`.
+        
+    Returns:
+        int: Number of SKU x ZIP rows written.
+    """
+    options = dict(options, zip=zip_code)
+    driver = None
+    rows = 0
+    listed = set()
+    try:
+        driver = setup_browser(options)
+        if not start_session(driver, options):
+            print(f"[{zip_code}] Authentication failed")
+            return 0
+        http_session = None
+        if options.get('http'):
+            http_session = build_http_session(driver, options.get('http_threads', HTTP_THREADS))
+        
+        def fetch(product_link):
+            product_details = fetch_product_http(http_session, product_link) if http_session is not None else None
+            return product_details or extract_product_details(driver, product_link)
+        
+        page_param = options.get('page_param', PAGE_PARAM)
+        for category in get_categories(driver, options):
+            with request_slot() as slot:
+                driver.get(category['url'])
+                slot['failed'] = not wait_until(driver, EC.presence_of_element_located(
+                    (By.CLASS_NAME, "catalog-cards-wrapper")), 'category', required=False)
+            total_pages = get_total_pages(driver)
+            
+            for page in range(1, total_pages + 1):
+                links = None
+                if http_session is not None:
+                    links = fetch_listing_links_http(http_session, category_page_url(category['url'], page, page_param))
+                if not links:
+                    if page > 1 and not open_category_page(driver, category['url'], page, page_param):
+                        print(f"[{zip_code}] Could not open page {page} of {category['name']}")
+                        continue
+                    links = get_product_links(driver)
+                
+                for link in links:
+                    # Products without a known SKU must not collapse into one "N/A" row
+                    key = canonical_product_url(link)
+                    if key in listed:
+                        continue  # Listed again in another category
+                    listed.add(key)
+                    product_details = cached_content(cache, link, fetch) or {}
+                    sku = product_details.get('sku', "N/A")
+                    if sku == "N/A":
+                        sku = sku_from_url(link) or "N/A"
+                    sink_write(options['sink'], dict(product_details, zip=zip_code, sku=sku,
+                                                     category=category['name']))
+                    rows += 1
+            print(f"[{zip_code}] {category['name']}: {len(listed)} products listed so far")
+    except Exception as e:
+        print(f"[{zip_code}] ZIP session failed: {str(e)}")
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+    return rows
+
+def scrape_multi_zip(zip_codes, options):
+    """Scrapes the catalog listing of several ZIP codes into one long SKU x ZIP table.
+    
+    Each ZIP code gets its own browser and guest session; up to 'workers'
+    ZIP sessions run at once. Product content is shared between them through
+    the content cache.
+    
+    Args:
+        zip_codes (list[str]): ZIP codes to scrape.
+        options (dict): Run options and shared run state ('journal', 'sink', 'workers').
+        
+    Returns:
+        int: Number of SKU x ZIP rows written.
+    """
+    cache = open_content_cache(options['journal'])
+    workers = max(1, min(options.get('workers') or 1, len(zip_codes)))
+    print(f"Scraping {len(zip_codes)} ZIP codes with {workers} browser(s)")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        rows = sum(executor.map(lambda zip_code: scrape_zip(zip_code, options, cache), zip_codes))
+    print(f"Content cache: {cache['fetches']} product pages fetched, {cache['hits']} listings served from the cache")
+    return rows
+
+def open_journal(path):
+    """Opens (or creates) the append-only SQLite journal of a scraping run.
+    
+    The journal records every finished category, listing page and product
+    URL, plus each extracted product, so an interrupted run can be resumed.
+    It also holds the dead-letter queue of pages and products that failed.
+    Writes are committed in batches to keep fsync cost low.
+    
+    Args:
+        path (str): Journal file path.
+        
+    Returns:
+        dict: Journal handle used by the other `journal_*` functions.
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS done (kind TEXT, key TEXT, PRIMARY KEY (kind, key))")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS products (url TEXT PRIMARY KEY, sku TEXT, brand TEXT, "
+        "name TEXT, packaging TEXT, image_url TEXT, description TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS dead_letters (kind TEXT, key TEXT, reason TEXT, attempts INTEGER, "
+        "context TEXT, updated REAL, PRIMARY KEY (kind, key))"
+    )
+    conn.commit()
+    return {'path': path, 'conn': conn, 'lock': threading.Lock(),
+            'pending': 0, 'last_flush': time.time()}
+
+def _journal_write(journal, sql, params):
+    """Executes a journal write and commits once the batch is full or old enough."""
+    with journal['lock']:
+        journal['conn'].execute(sql, params)
+        journal['pending'] += 1
+        if (journal['pending'] >= JOURNAL_BATCH
+                or time.time() - journal['last_flush'] >= JOURNAL_FLUSH_SECONDS):
+            journal['conn'].commit()
+            journal['pending'] = 0
+            journal['last_flush'] = time.time()
+
+def journal_flush(journal):
+    """Commits any journal writes still waiting for their batch."""
+    with journal['lock']:
+        journal['conn'].commit()
+        journal['pending'] = 0
+        journal['last_flush'] = time.time()
+
+def journal_close(journal):
+    """Flushes and closes the journal."""
+    journal_flush(journal)
+    journal['conn'].close()
+
+def journal_set(journal, key, value):
+    """Stores a JSON-serialisable run setting, such as the discovered categories."""
+    _journal_write(journal, "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+def journal_get(journal, key):
+    """Returns a run setting stored with `journal_set()`, or None."""
+    with journal['lock']:
+        row = journal['conn'].execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def journal_mark_done(journal, kind, key):
+    """Records that a unit of work ('category', 'page' or 'product') has finished."""
+    _journal_write(journal, "INSERT OR IGNORE INTO done VALUES (?, ?)", (kind, key))
+
+def journal_is_done(journal, kind, key):
+    """Checks whether a unit of work finished in this or an earlier run."""
+    with journal['lock']:
+        row = journal['conn'].execute(
+            "SELECT 1 FROM done WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+    return row is not None
+
+def journal_add_product(journal, url, product_details):
+    """Records an extracted product and marks its URL as done."""
+    _journal_write(journal, "INSERT OR IGNORE INTO products VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   [url] + [product_details.get(field, "N/A") for field in PRODUCT_FIELDS])
+    journal_mark_done(journal, 'product', url)
+
+def journal_get_product(journal, url):
+    """Returns the journaled product for a URL, or None if it was not extracted yet."""
+    with journal['lock']:
+        row = journal['conn'].execute(
+            f"SELECT {', '.join(PRODUCT_FIELDS)} FROM products WHERE url = ?", (url,)).fetchone()
+    return dict(zip(PRODUCT_FIELDS, row)) if row else None
+
+def iter_journal_products(journal, batch_size=SINK_BATCH):
+    """Yields every journaled product in extraction order, reading in batches."""
+    journal_flush(journal)
+    last_rowid = 0
+    while True:
+        with journal['lock']:
+            rows = journal['conn'].execute(
+                f"SELECT rowid, {', '.join(PRODUCT_FIELDS)} FROM products "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_rowid, batch_size)).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(PRODUCT_FIELDS, row[1:]))
+        last_rowid = rows[-1][0]
+
+def page_key(category_url, page):
+    """Builds the journal key of a listing page."""
+    return f"{category_url}#page={page}"
+
+def dead_letter_add(journal, kind, key, reason, context=None):
+    """Queues a failed 'page' or 'product' for the retry pass, counting its attempts.
+    
+    Args:
+        journal (dict): Journal handle from `open_journal()`.
+        kind (str): 'page' (keyed by `page_key()`) or 'product' (keyed by URL).
+        key (str): Key of the failed unit.
+        reason (str): Why the last attempt failed.
+        context (dict, optional): What the retry needs, e.g. the page number or
+            a partial product record. Defaults to None.
+    """
+    _journal_write(journal,
+        "INSERT INTO dead_letters VALUES (?, ?, ?, 1, ?, ?) ON CONFLICT (kind, key) DO UPDATE SET "
+        "reason = excluded.reason, attempts = attempts + 1, context = excluded.context, "
+        "updated = excluded.updated",
+        (kind, key, reason, json.dumps(context), time.time()))
+
+def dead_letter_remove(journal, kind, key):
+    """Drops a unit from the dead-letter queue once it has succeeded."""
+    _journal_write(journal, "DELETE FROM dead_letters WHERE kind = ? AND key = ?", (kind, key))
+
+def dead_letters(journal, kind, max_attempts=None):
+    """Returns the queued failures of one kind, oldest first.
+    
+    Args:
+        journal (dict): Journal handle from `open_journal()`.
+        kind (str): 'page' or 'product'.
+        max_attempts (int, optional): Only return units tried fewer times than
+            this. Defaults to None (all).
+        
+    Returns:
+        list[dict]: Entries with 'key', 'reason', 'attempts' and 'context'.
+    """
+    with journal['lock']:
+        rows = journal['conn'].execute(
+            "SELECT key, reason, attempts, context FROM dead_letters WHERE kind = ? AND attempts < ? "
+            "ORDER BY updated", (kind, max_attempts or 2 ** 31)).fetchall()
+    return [{'key': key, 'reason': reason, 'attempts': attempts, 'context': json.loads(context) or {}}
+            for key, reason, attempts, context in rows]
+
+def open_frontier(path):
+    """Opens (or creates) a shared SQLite work frontier that several scraper nodes can use.
+    
+    Units of work ('category', 'page' and 'product') are leased to one node
+    at a time; finished products are stored in the frontier for the
+    coordinator to merge. Every node opens the same file (on one host, or a
+    network filesystem with working locks).
     
-def go_to_next_page(driver):
-    """Navigates to the next page of products in the current category.
+    Args:
+        path (str): Frontier file path.
+        
+    Returns:
+        dict: Frontier handle used by the other `frontier_*` functions.
+    """
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS units (kind TEXT, key TEXT, payload TEXT, priority INTEGER, "
+        "state TEXT DEFAULT 'pending', owner TEXT, lease_until REAL, attempts INTEGER DEFAULT 0, "
+        "reason TEXT, PRIMARY KEY (kind, key))"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS units_by_state ON units (state, priority)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS products (url TEXT PRIMARY KEY, sku TEXT, brand TEXT, "
+        "name TEXT, packaging TEXT, image_url TEXT, description TEXT, node TEXT)"
+    )
+    return {'path': path, 'conn': conn, 'lock': threading.Lock(),
+            'node': f"{socket.gethostname()}-{os.getpid()}"}
+
+def frontier_add(frontier, kind, key, payload=None):
+    """Adds a unit of work unless the frontier already has it (from any node).
     
-    Attempts to click the pagination "next" button to advance to the next
-    page of product listings.
+    Returns:
+        bool: True if the unit is new.
+    """
+    with frontier['lock']:
+        cursor = frontier['conn'].execute(
+            "INSERT OR IGNORE INTO units (kind, key, payload, priority) VALUES (?, ?, ?, ?)",
+            (kind, key, json.dumps(payload), FRONTIER_PRIORITY[kind]))
+    return cursor.rowcount > 0
+
+def frontier_lease(frontier, lease_seconds=FRONTIER_LEASE_SECONDS):
+    """Leases the next pending unit to this node.
+    
+    Units whose lease expired are put back first, so work held by a crashed
+    node is picked up again (or given up after FRONTIER_MAX_ATTEMPTS leases).
     
     Args:
-        driver (webdriver.Chrome): Chrome WebDriver instance on a category page.
+        frontier (dict): Frontier handle from `open_frontier()`.
+        lease_seconds (float, optional): How long the lease lasts without a heartbeat.
         
     Returns:
-        bool: True if navigation was successful, None if it failed.
+        dict or None: Unit with 'kind', 'key', 'payload' and 'attempts', or
+            None if nothing is pending.
     """
-    print("Navigating to next page...")
+    now = time.time()
+    with frontier['lock']:
+        conn = frontier['conn']
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE units SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, reason = 'lease expired' WHERE state = 'leased' AND lease_until < ?",
+                (FRONTIER_MAX_ATTEMPTS, now))
+            row = conn.execute(
+                "SELECT kind, key, payload, attempts FROM units WHERE state = 'pending' "
+                "ORDER BY priority, rowid LIMIT 1").fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE units SET state = 'leased', owner = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE kind = ? AND key = ?", (frontier['node'], now + lease_seconds, row[0], row[1]))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    if not row:
+        return None
+    return {'kind': row[0], 'key': row[1], 'payload': json.loads(row[2]) or {}, 'attempts': row[3] + 1}
+
+def frontier_heartbeat(frontier, unit, lease_seconds=FRONTIER_LEASE_SECONDS):
+    """Extends this node's lease on a unit.
     
-    try:
-        next_button = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.pagination-btn-right"))
-        )
-        driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-        time.sleep(1)
-        next_button.click()
-        print("Success with original selector")
-        time.sleep(3)
-        return True
-    except Exception as e:
-        print(f"Navigating failed...")
+    Returns:
+        bool: False if the lease was lost (it expired and the unit moved on).
+    """
+    with frontier['lock']:
+        cursor = frontier['conn'].execute(
+            "UPDATE units SET lease_until = ? WHERE kind = ? AND key = ? AND owner = ? AND state = 'leased'",
+            (time.time() + lease_seconds, unit['kind'], unit['key'], frontier['node']))
+    return cursor.rowcount > 0
 
-def process_products(driver):
-    """Processes all products across all pages within the current category.
+def frontier_finish(frontier, unit, failed=False, reason=None):
+    """Releases a leased unit as done, or back to pending (failed after its last attempt)."""
+    if not failed:
+        state = 'done'
+    else:
+        state = 'failed' if unit['attempts'] >= FRONTIER_MAX_ATTEMPTS else 'pending'
+    with frontier['lock']:
+        frontier['conn'].execute(
+            "UPDATE units SET state = ?, owner = NULL, reason = ? WHERE kind = ? AND key = ? AND owner = ?",
+            (state, reason, unit['kind'], unit['key'], frontier['node']))
+
+def frontier_add_product(frontier, url, product_details):
+    """Stores a finished product for the coordinator's merged output."""
+    with frontier['lock']:
+        frontier['conn'].execute(
+            "INSERT OR IGNORE INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [url] + [product_details.get(field, "N/A") for field in PRODUCT_FIELDS] + [frontier['node']])
+
+def frontier_set(frontier, key, value):
+    """Stores a JSON-serialisable crawl setting, such as whether the frontier was seeded."""
+    with frontier['lock']:
+        frontier['conn'].execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+def frontier_get(frontier, key):
+    """Returns a crawl setting stored with `frontier_set()`, or None."""
+    with frontier['lock']:
+        row = frontier['conn'].execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def frontier_status(frontier):
+    """Returns the number of units per state and the number of stored products."""
+    with frontier['lock']:
+        status = dict(frontier['conn'].execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+        status['products'] = frontier['conn'].execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    return status
+
+def iter_frontier_products(frontier, batch_size=SINK_BATCH):
+    """Yields every stored product in the order the nodes finished them, reading in batches."""
+    last_rowid = 0
+    while True:
+        with frontier['lock']:
+            rows = frontier['conn'].execute(
+                f"SELECT rowid, url, {', '.join(PRODUCT_FIELDS)} FROM products "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_rowid, batch_size)).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield row[1], dict(zip(PRODUCT_FIELDS, row[2:]))
+        last_rowid = rows[-1][0]
+
+def open_sink(path, output_format='csv', batch_size=SINK_BATCH, fields=None):
+    """Opens an output sink that writes product records as they are produced.
     
-    Iterates through all pages of the current product category, extracts
-    product links from each page, and collects detailed product information.
-    Includes error handling and retry logic for failed pages.
+    Records are buffered and written out every `batch_size` records, so
+    memory use stays flat regardless of catalog size. CSV output has the
+    same header as always; JSONL writes one object per line; Parquet writes
+    one row group per batch (requires pyarrow).
     
     Args:
-        driver (webdriver.Chrome): Chrome WebDriver instance positioned on a category page.
+        path (str): Output file path.
+        output_format (str, optional): 'csv', 'jsonl' or 'parquet'. Defaults to 'csv'.
+        batch_size (int, optional): Records buffered per write. Defaults to SINK_BATCH.
+        fields (list[str], optional): Columns to write. Defaults to PRODUCT_FIELDS.
         
     Returns:
-        list[dict]: List of dictionaries containing detailed product information
-                   from all successfully processed products in the category.
+        dict: Sink handle used by `sink_write()` and `sink_close()`.
+        
+    Raises:
+        ValueError: If the format is unknown or its library is not installed.
     """
-    # Process products - retry pages instead of giving up
-    try:
-        all_products = []
-        total_pages = get_total_pages(driver)
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown output format: {output_format}")
+    
+    fields = fields or PRODUCT_FIELDS
+    sink = {'path': path, 'format': output_format, 'batch_size': batch_size, 'fields': fields,
+            'buffer': [], 'count': 0, 'lock': threading.Lock()}
+    if output_format == 'parquet':
+        if pa is None:
+            raise ValueError("Parquet output needs pyarrow (pip install pyarrow)")
+        sink['schema'] = pa.schema([(field, pa.string()) for field in fields])
+        sink['writer'] = pq.ParquetWriter(path, sink['schema'])
+    else:
+        sink['file'] = open(path, 'w', newline='', encoding='utf-8')
+        if output_format == 'csv':
+            sink['writer'] = csv.DictWriter(sink['file'], fieldnames=fields)
+            sink['writer'].writeheader()
+    return sink
+
+def _sink_write_batch(sink):
+    """Writes out the buffered records of a sink (caller holds the sink lock)."""
+    batch = sink['buffer']
+    if not batch:
+        return
+    if sink['format'] == 'parquet':
+        columns = {field: [record.get(field, "N/A") for record in batch] for field in sink['fields']}
+        sink['writer'].write_table(pa.table(columns, schema=sink['schema']))
+    elif sink['format'] == 'csv':
+        sink['writer'].writerows(batch)
+        sink['file'].flush()
+    else:
+        sink['file'].write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch))
+        sink['file'].flush()
+    sink['buffer'] = []
+
+def sink_write(sink, product_details):
+    """Adds a product record to a sink, writing the batch out once it is full."""
+    with sink['lock']:
+        sink['buffer'].append({field: product_details.get(field, "N/A") for field in sink['fields']})
+        sink['count'] += 1
+        if len(sink['buffer']) >= sink['batch_size']:
+            _sink_write_batch(sink)
+
+def sink_close(sink):
+    """Writes any buffered records and closes the sink.
+    
+    Returns:
+        int: Total number of records written.
+    """
+    with sink['lock']:
+        _sink_write_batch(sink)
+        if sink['format'] == 'parquet':
+            sink['writer'].close()
+        else:
+            sink['file'].close()
+    return sink['count']
+
+def record_product(options, product_link, product_details):
+    """Hands a freshly extracted product to the run's journal and output sink."""
+    if options.get('journal'):
+        journal_add_product(options['journal'], product_link, product_details)
+    if options.get('sink'):
+        sink_write(options['sink'], product_details)
+    count_event('products')
+
+def iter_output_records(path, output_format='csv'):
+    """Reads back the records of an output file written by `open_sink()`.
+    
+    Args:
+        path (str): Output file path.
+        output_format (str, optional): 'csv', 'jsonl' or 'parquet'. Defaults to 'csv'.
         
-        print(f"Starting to process {total_pages} pages")
+    Yields:
+        dict: One record per row, one batch at a time for Parquet.
+    """
+    if output_format == 'parquet':
+        if pa is None:
+            raise ValueError("Parquet output needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=SINK_BATCH):
+            yield from batch.to_pylist()
+        return
+    
+    with open(path, newline='', encoding='utf-8') as file:
+        if output_format == 'csv':
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+def image_cache_key(image_url):
+    """Content address of a product image in the image cache.
+    
+    The CDN serves images as `mediacdn.sysco.com/.../rendition?id=<hash>`,
+    and many products share one rendition, so its `id` names the cached
+    file. Other URLs fall back to a hash of the whole URL.
+    
+    Args:
+        image_url (str): Image URL from a product record.
         
-        category_url = driver.current_url  # Store category page URL
-        consecutive_failed_pages = 0  # Track failed pages
-        max_failed_pages = 3  # Stop after 3 consecutive failures
+    Returns:
+        str or None: Cache key, or None if the record has no image.
+    """
+    if not image_url or image_url == "N/A":
+        return None
+    rendition_id = dict(parse_qsl(urlsplit(image_url).query)).get('id')
+    if rendition_id and re.fullmatch(r'[\w-]+', rendition_id):
+        return rendition_id
+    return hashlib.sha1(image_url.encode('utf-8')).hexdigest()
+
+def scan_image_cache(cache_dir):
+    """Maps the cache key of every image already in the cache to its path."""
+    cached = {}
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            key, extension = os.path.splitext(name)
+            if extension != '.part':  # Leftover of an interrupted download
+                cached[key] = os.path.join(root, name)
+    return cached
+
+@timed
+def download_image(session, image_url, key, cache_dir, retry_count=2):
+    """Downloads one image into the image cache.
+    
+    The image is streamed to a temporary file and renamed into place, so an
+    interrupted download never leaves a truncated image under its key.
+    
+    Args:
+        session (requests.Session): Pooled session shared by the downloads.
+        image_url (str): URL of the image.
+        key (str): Cache key from `image_cache_key()`.
+        cache_dir (str): Root of the image cache.
+        retry_count (int, optional): Retries after a failed request. Defaults to 2.
         
-        for page in range(1, total_pages + 1):
-            print(f"\nProcessing page {page} of {total_pages}")
-            
-            # Get and process products from current page
-            product_links = get_product_links(driver)
-            
-            if not product_links:
-                consecutive_failed_pages += 1
-                print(f"No products found on page {page} (failure #{consecutive_failed_pages})")
-                
-                # If we've failed too many times in a row, give up on this category
-                if consecutive_failed_pages >= max_failed_pages:
-                    print(f"Failed to find products on {consecutive_failed_pages} consecutive pages")
-                    print("Giving up on this category")
-                    break
-                
-                # Try to continue to next page anyway - maybe it's just a loading issue
-                if page < total_pages:
-                    print("Trying to continue to next page anyway...")
-                    driver.get(category_url)
-                    time.sleep(5)  # Wait longer for page to load
-                    
-                    if not go_to_next_page(driver):
-                        print("Could not navigate to next page either")
-                        break
-                    else:
-                        continue  # Try next page
-                else:
-                    break  # Last page anyway
-            
-            else:
-                # Reset failure counter when we find products
-                consecutive_failed_pages = 0
-                print(f"Found {len(product_links)} products on page {page}")
-                
-                # Process all products on this page
-                for index, link in enumerate(product_links, 1):
-                    print(f"Processing product {index}/{len(product_links)} on page {page}/{total_pages}")
-                    product_details = extract_product_details(driver, link)
-                    if product_details:
-                        all_products.append(product_details)
-            
-            # Go to next page if not on last page
-            if page < total_pages:
-                print("Returning to category page...")
-                driver.get(category_url)
-                time.sleep(3)  # Wait for category page to load
+    Returns:
+        str or None: Path of the cached image, or None if the download failed.
+    """
+    folder = os.path.join(cache_dir, key[:2])
+    for attempt in range(retry_count + 1):
+        partial = None
+        try:
+            with session.get(image_url, timeout=IMAGE_TIMEOUT, stream=True) as response:
+                if response.status_code in THROTTLE_STATUSES and attempt < retry_count:
+                    record_retry('download_image')
+                    wait_backoff(attempt)
+                    continue
+                if response.status_code != 200:
+                    print(f"Image download failed for {image_url}: HTTP {response.status_code}")
+                    return None
                 
-                if not go_to_next_page(driver):
-                    print("Could not navigate to next page, stopping here")
-                    break
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                extension = IMAGE_EXTENSIONS.get(content_type) or os.path.splitext(urlsplit(image_url).path)[1]
+                os.makedirs(folder, exist_ok=True)
+                path = os.path.join(folder, key + (extension or '.img'))
+                partial = f"{path}.{threading.get_ident()}.part"
+                with open(partial, 'wb') as file:
+                    for chunk in response.iter_content(64 * 1024):
+                        file.write(chunk)
+            os.replace(partial, path)
+            return path
+        except Exception as e:
+            if partial and os.path.exists(partial):
+                os.remove(partial)
+            if attempt == retry_count:
+                print(f"Image download failed for {image_url}: {str(e)}")
+                return None
+            record_retry('download_image')
+            wait_backoff(attempt)
+    return None
+
+def download_images(image_urls, cache_dir, threads=IMAGE_THREADS, session=None):
+    """Fetches product images into the content-addressed image cache.
+    
+    Every rendition is downloaded once however many URLs point to it, by a
+    bounded thread pool sharing one keep-alive connection pool. Images that
+    are already cached are not requested at all, so a re-run only fetches
+    images it has not seen. Downloads go to the image CDN rather than the
+    site, so they do not draw on the request scheduler's budget.
+    
+    Args:
+        image_urls (iterable[str]): Image URLs; duplicates and "N/A" are skipped.
+        cache_dir (str): Root of the image cache, sharded by the first two
+            characters of each key.
+        threads (int, optional): Concurrent downloads. Defaults to IMAGE_THREADS.
+        session (requests.Session, optional): Session to download with.
+            Defaults to a new pooled session.
+        
+    Returns:
+        dict: Local path keyed by cache key, for every image in the cache.
+    """
+    cached = scan_image_cache(cache_dir)
+    pending = {}
+    for image_url in image_urls:
+        key = image_cache_key(image_url)
+        if key and key not in cached:
+            pending.setdefault(key, image_url)
+    print(f"Images: {len(cached)} already cached, {len(pending)} to download")
+    if not pending:
+        return cached
+    
+    if session is None:
+        if requests is None:
+            print("requests is not installed, image download disabled")
+            return cached
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=threads, pool_maxsize=threads)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        paths = executor.map(lambda item: download_image(session, item[1], item[0], cache_dir),
+                             pending.items())
+        downloaded = 0
+        for key, path in zip(pending, paths):
+            if path:
+                cached[key] = path
+                downloaded += 1
+    count_event('images', downloaded)
+    print(f"Images: downloaded {downloaded} of {len(pending)}")
+    return cached
+
+def add_image_paths(path, output_format, fields, cache_dir, threads=IMAGE_THREADS):
+    """Post-extraction stage that downloads an output's images and links them.
+    
+    Reads the finished output once for its image URLs and once more to
+    rewrite it with an `image_path` column holding each record's cached
+    image ("N/A" if it has none or the download failed), so memory stays
+    flat however large the output is.
+    
+    Args:
+        path (str): Output file written by the run.
+        output_format (str): Format of the output file.
+        fields (list[str]): Columns of the output file.
+        cache_dir (str): Root of the image cache.
+        threads (int, optional): Concurrent downloads. Defaults to IMAGE_THREADS.
+        
+    Returns:
+        int: Number of records that point at a cached image.
+    """
+    images = download_images((record.get('image_url') for record in iter_output_records(path, output_format)),
+                             cache_dir, threads)
+    
+    base, extension = os.path.splitext(path)
+    rewritten = f"{base}_images{extension}"
+    sink = open_sink(rewritten, output_format,
+                     fields=fields if 'image_path' in fields else fields + ['image_path'])
+    linked = 0
+    try:
+        for record in iter_output_records(path, output_format):
+            record['image_path'] = images.get(image_cache_key(record.get('image_url')), "N/A")
+            linked += record['image_path'] != "N/A"
+            sink_write(sink, record)
+    except Exception:
+        sink_close(sink)
+        os.remove(rewritten)
+        raise
+    sink_close(sink)
+    os.replace(rewritten, path)
+    print(f"Linked {linked} of {sink['count']} records to images in {cache_dir}")
+    return linked
+
+def canonical_product_url(url):
+    """Normalises a product URL so the same product always gets the same key.
+    
+    Lower-cases scheme and host, drops the fragment, tracking and paging
+    parameters and any trailing slash, and sorts the remaining parameters.
+    
+    Args:
+        url (str): Product URL as found on a listing page.
+        
+    Returns:
+        str: Canonical form of the URL.
+    """
+    parts = urlsplit(url)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in DEDUP_IGNORED_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/') or '/',
+                       urlencode(query), ''))
+
+def sku_from_url(url):
+    """Returns the SKU embedded in a product URL (its last run of 5+ digits), or None."""
+    numbers = re.findall(r'\d{5,}', urlsplit(url).path)
+    return numbers[-1] if numbers else None
+
+def open_dedup_index(path=None):
+    """Creates the index of products already scraped in this run.
+    
+    Products are keyed by canonical URL and by SKU. With a path, the index
+    is loaded from (and later saved to) a JSON file so that products from
+    earlier runs are skipped too.
+    
+    Args:
+        path (str, optional): JSON file persisting the index. Defaults to None.
+        
+    Returns:
+        dict: Index handle used by the other `dedup_*` functions.
+    """
+    index = {'path': path, 'urls': set(), 'skus': set(), 'lock': threading.Lock(),
+             'url_hits': 0, 'sku_hits': 0, 'misses': 0}
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        index['urls'].update(data.get('urls', []))
+        index['skus'].update(data.get('skus', []))
+        print(f"Loaded dedup index with {len(index['urls'])} URLs and {len(index['skus'])} SKUs")
+    return index
+
+def dedup_claim(index, url):
+    """Claims a product URL for extraction unless the product was already seen.
+    
+    The check and the claim happen under one lock, so two workers never load
+    the same product.
+    
+    Args:
+        index (dict): Index from `open_dedup_index()`.
+        url (str): Product URL found on a listing page.
+        
+    Returns:
+        bool: True if the product is new and should be loaded, False for a duplicate.
+    """
+    key = canonical_product_url(url)
+    sku = sku_from_url(url)
+    with index['lock']:
+        if key in index['urls']:
+            index['url_hits'] += 1
+            return False
+        if sku and sku in index['skus']:
+            index['sku_hits'] += 1
+            return False
+        index['misses'] += 1
+        index['urls'].add(key)
+        if sku:
+            index['skus'].add(sku)
+        return True
+
+def dedup_release(index, url):
+    """Releases a claimed URL whose product could not be extracted, so it can be tried again."""
+    key = canonical_product_url(url)
+    sku = sku_from_url(url)
+    with index['lock']:
+        index['urls'].discard(key)
+        if sku:
+            index['skus'].discard(sku)
+
+def dedup_add_sku(index, sku, url):
+    """Records the SKU of a product extracted from a claimed URL.
+    
+    Args:
+        index (dict): Index from `open_dedup_index()`.
+        sku (str): SKU read from the product page.
+        url (str): Product URL claimed with `dedup_claim()`.
+    
+    Returns:
+        bool: True if the SKU is new, False if another URL already produced it.
+    """
+    # The claim already registered the SKU embedded in the URL
+    if not sku or sku == "N/A" or sku == sku_from_url(url):
+        return True
+    with index['lock']:
+        if sku in index['skus']:
+            index['sku_hits'] += 1
+            return False
+        index['skus'].add(sku)
+        return True
+
+def dedup_save(index):
+    """Writes the index to its JSON file, if it has one."""
+    if not index['path']:
+        return
+    with index['lock']:
+        data = {'urls': sorted(index['urls']), 'skus': sorted(index['skus'])}
+    temp_path = f"{index['path']}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(temp_path, index['path'])
+
+def dedup_report(index):
+    """Prints how many product loads the index saved."""
+    hits = index['url_hits'] + index['sku_hits']
+    print(f"Dedup: {hits} duplicates skipped ({index['url_hits']} by URL, "
+          f"{index['sku_hits']} by SKU), {index['misses']} new products")
+
+def read_listing_cards(driver):
+    """Reads the link, name and pack size shown on every product card of the current page.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on a listing page.
         
-        print(f"\nSuccessfully processed {len(all_products)} total products from this category")
-        return all_products
+    Returns:
+        list[dict]: One dict per card with keys 'url', 'name' and 'packaging'
+            (None where the card does not show the value).
+    """
+    return driver.execute_script(READ_CARDS_SCRIPT, LISTING_CARD_SELECTORS) or []
+
+def normalize_signal(value):
+    """Normalises a listing value for comparison (whitespace and case insensitive)."""
+    return ' '.join(str(value or '').split()).lower()
+
+def open_incremental(previous_path, delta_path, output_format='csv'):
+    """Loads the previous snapshot for an incremental re-scrape.
+    
+    Args:
+        previous_path (str): CSV written by an earlier run.
+        delta_path (str): File that receives added, changed and removed products.
+        output_format (str, optional): Format of the delta file. Defaults to 'csv'.
+        
+    Returns:
+        dict: Incremental state used by the other `incremental_*` functions.
+    """
+    previous = {}
+    with open(previous_path, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            if row.get('sku') and row['sku'] != "N/A":
+                previous[row['sku']] = {field: row.get(field, "N/A") for field in PRODUCT_FIELDS}
+    print(f"Loaded {len(previous)} products from previous snapshot {previous_path}")
+    
+    return {'previous': previous, 'seen': set(), 'lock': threading.Lock(),
+            'counts': {'unchanged': 0, 'added': 0, 'changed': 0, 'removed': 0},
+            'delta': open_sink(delta_path, output_format, fields=['change'] + PRODUCT_FIELDS)}
+
+def incremental_unchanged(driver, product_links, incremental):
+    """Finds the products on the current listing page that did not change.
+    
+    A product is unchanged if its SKU is in the previous snapshot and the
+    card's name and pack size match the snapshot; those rows are reused
+    without loading the product page. Cards missing either signal are
+    treated as changed.
+    
+    Args:
+        driver (webdriver.Chrome): Chrome WebDriver instance on the listing page.
+        product_links (list[str]): Product URLs that still need details.
+        incremental (dict): State from `open_incremental()`.
         
+    Returns:
+        dict: Previous snapshot rows keyed by product URL.
+    """
+    try:
+        cards = {card['url']: card for card in read_listing_cards(driver) if card.get('url')}
     except Exception as e:
-        print(f"Error processing products: {str(e)}")
-        return all_products if 'all_products' in locals() else []
+        print(f"Could not read listing cards: {str(e)}")
+        return {}
+    
+    unchanged = {}
+    for link in product_links:
+        card = cards.get(link)
+        previous = incremental['previous'].get(sku_from_url(link))
+        if not card or not previous or not card.get('name') or not card.get('packaging'):
+            continue
+        if (normalize_signal(card['name']) == normalize_signal(previous['name'])
+                and normalize_signal(card['packaging']) == normalize_signal(previous['packaging'])):
+            unchanged[link] = previous
+    return unchanged
+
+def incremental_record(incremental, product_details, unchanged=False):
+    """Classifies a product of the new snapshot and writes it to the delta if it changed.
+    
+    Args:
+        incremental (dict): State from `open_incremental()`.
+        product_details (dict): Product emitted to the new snapshot.
+        unchanged (bool, optional): The row was reused from the previous snapshot.
+    """
+    sku = product_details.get('sku')
+    previous = incremental['previous'].get(sku)
+    if unchanged or previous == {field: product_details.get(field, "N/A") for field in PRODUCT_FIELDS}:
+        change = 'unchanged'
+    else:
+        change = 'changed' if previous else 'added'
+    
+    with incremental['lock']:
+        incremental['seen'].add(sku)
+        incremental['counts'][change] += 1
+    if change != 'unchanged':
+        sink_write(incremental['delta'], dict(product_details, change=change))
 
-def save_to_csv(products):
-    """Saves product data to a CSV file with timestamp.
+def incremental_finish(incremental, complete):
+    """Writes removed products to the delta, closes it and reports the counts.
     
-    Creates a CSV file containing all collected product information,
-    with filename including current timestamp for uniqueness.
+    Args:
+        incremental (dict): State from `open_incremental()`.
+        complete (bool): The whole catalog was crawled, so products that were
+            not seen have really been removed.
+    """
+    if complete:
+        for sku, row in incremental['previous'].items():
+            if sku not in incremental['seen']:
+                incremental['counts']['removed'] += 1
+                sink_write(incremental['delta'], dict(row, change='removed'))
+    else:
+        print("Incremental: some categories were not crawled completely, so removed products are not reported")
+    sink_close(incremental['delta'])
+    counts = incremental['counts']
+    print(f"Incremental: {counts['unchanged']} unchanged, {counts['added']} added, "
+          f"{counts['changed']} changed, {counts['removed']} removed "
+          f"(delta written to {incremental['delta']['path']})")
+
+def browser_memory_mb(driver):
+    """Returns the resident memory of a browser's whole process tree in MB.
     
     Args:
-        products (list[dict]): List of dictionaries containing product information
-                              with keys matching CSV fieldnames.
-                              
+        driver (webdriver.Chrome): Chrome WebDriver instance.
+        
     Returns:
-        bool: True if save operation was successful, False otherwise.
+        float or None: RSS of chromedriver, Chrome and all its renderers, or
+            None if psutil is not installed or the processes cannot be read.
     """
-    # Save products data to CSV file
-    if not products:
-        print("No products to save")
-        return False
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(process.memory_info().rss for process in processes) / 2 ** 20
+    except Exception:
+        return None
+
+def start_supervisor(driver, options=None):
+    """Starts supervising a freshly authenticated browser.
     
-    # Generate filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"sysco_products_{timestamp}.csv"
+    Args:
+        driver (webdriver.Chrome): Browser with an open guest session.
+        options (dict, optional): Run options ('recycle_pages', 'recycle_rss_mb', and
+            'home_url', the shop dashboard recycled browsers reopen; defaults to the
+            driver's current URL). Defaults to None.
+        
+    Returns:
+        dict: Supervisor handle; its 'driver' key always holds the current browser.
+    """
+    options = options or {}
+    return {'driver': driver, 'pages': 0, 'options': options,
+            'home_url': options.get('home_url') or driver.current_url,
+            'max_pages': options.get('recycle_pages', RECYCLE_PAGES),
+            'max_rss_mb': options.get('recycle_rss_mb', RECYCLE_RSS_MB)}
+
+def recycle_driver(supervisor):
+    """Replaces the supervised browser with a fresh one carrying the same session.
+    
+    The guest session is captured from the old browser and loaded into the new
+    one, so the full `initial_auth()` flow only runs if that fails.
     
+    Args:
+        supervisor (dict): Supervisor from `start_supervisor()`.
+        
+    Returns:
+        webdriver.Chrome: The new browser.
+        
+    Raises:
+        RuntimeError: If no session could be opened in the new browser.
+    """
+    old_driver = supervisor['driver']
     try:
-        with open(filename, 'w') as file:
-            writer = csv.DictWriter(file, fieldnames=['sku', 'brand', 'name', 'packaging', 'image_url', 'description'])
-            writer.writeheader()
-            writer.writerows(products)
-        print(f"\nData saved to {filename}")
-        return True
+        session = capture_session(old_driver, supervisor['home_url'])
     except Exception as e:
-        print(f"Error saving to CSV: {str(e)}")
-        return False
+        print(f"Could not capture session from old browser: {str(e)}")
+        session = None
+    try:
+        old_driver.quit()
+    except:
+        pass
+    
+    supervisor['driver'] = None
+    driver = setup_browser(supervisor['options'])
+    if not (session and restore_session(driver, session)) and not start_session(driver, supervisor['options']):
+        try:
+            driver.quit()
+        except:
+            pass
+        raise RuntimeError("could not open a session in the recycled browser")
+    
+    supervisor.update({'driver': driver, 'pages': 0})
+    return driver
+
+def supervise_driver(supervisor):
+    """Counts a finished listing page and recycles the browser once it is worn out.
+    
+    Call between pages; the caller continues with the returned browser at the
+    page it was about to process.
+    
+    Args:
+        supervisor (dict): Supervisor from `start_supervisor()`.
+        
+    Returns:
+        webdriver.Chrome: Browser to continue with (new if it was recycled).
+    """
+    supervisor['pages'] += 1
+    memory = browser_memory_mb(supervisor['driver'])
+    
+    reason = None
+    if supervisor['max_pages'] and supervisor['pages'] >= supervisor['max_pages']:
+        reason = f"{supervisor['pages']} pages served"
+    elif memory and supervisor['max_rss_mb'] and memory >= supervisor['max_rss_mb']:
+        reason = f"browser RSS at {memory:.0f} MB"
+    
+    if reason:
+        print(f"Recycling browser ({reason})...")
+        count_event('browser_recycles')
+        recycle_driver(supervisor)
+    return supervisor['driver']
+
+def zip_code_list(value):
+    """Parses ZIP codes given as a comma-separated list or as @file with one per line."""
+    if value.startswith('@'):
+        with open(value[1:], encoding='utf-8') as file:
+            value = file.read().replace('\n', ',')
+    zip_codes = list(dict.fromkeys(code.strip() for code in value.split(',') if code.strip()))
+    if not zip_codes:
+        raise argparse.ArgumentTypeError("no ZIP codes given")
+    return zip_codes
+
+def parse_args(argv=None):
+    """Parses command line options.
+    
+    Args:
+        argv (list[str], optional): Arguments to parse. Defaults to sys.argv.
+        
+    Returns:
+        argparse.Namespace: Parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Scrape the Sysco product catalog to CSV.")
+    parser.add_argument('--zip', default=ZIP_CODE,
+                        help=f"ZIP code of the guest session (default: {ZIP_CODE})")
+    parser.add_argument('--zips', type=zip_code_list, metavar='ZIPS', default=None,
+                        help="scrape listings for several ZIP codes (comma-separated, or @file) into one "
+                             "SKU x ZIP table; product pages are fetched once and shared")
+    parser.add_argument('--base-url', default=HOME_URL,
+                        help=f"site home page to sign in from, e.g. a local mock site (default: {HOME_URL})")
+    parser.add_argument('--cache', default=CACHE_PATH,
+                        help=f"cache of guest sessions and category URLs (default: {CACHE_PATH})")
+    parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                        help="always run the full sign-in and category discovery")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of browsers scraping in parallel (default: 1)")
+    parser.add_argument('--profile', choices=['default', 'lean'], default='default',
+                        help="browser profile; 'lean' runs headless with eager page loads and "
+                             "blocks images, media, fonts and trackers (default: default)")
+    parser.add_argument('--block', action='append', metavar='PATTERN', default=[],
+                        help="extra URL pattern for the lean profile to block (repeatable)")
+    parser.add_argument('--unblock', action='append', metavar='PATTERN', default=[],
+                        help="default pattern the lean profile should not block, e.g. '*.svg' "
+                             "(repeatable)")
+    parser.add_argument('--recycle-pages', type=int, default=RECYCLE_PAGES,
+                        help=f"restart each browser after this many listing pages, 0 to disable "
+                             f"(default: {RECYCLE_PAGES})")
+    parser.add_argument('--recycle-rss-mb', type=int, default=RECYCLE_RSS_MB,
+                        help=f"restart a browser whose processes use more memory than this, 0 to "
+                             f"disable; needs psutil (default: {RECYCLE_RSS_MB})")
+    parser.add_argument('--rate', type=float, default=REQUEST_RATE,
+                        help=f"global budget of page loads and fetches per second, 0 for none "
+                             f"(default: {REQUEST_RATE})")
+    parser.add_argument('--burst', type=int, default=REQUEST_BURST,
+                        help=f"requests allowed back to back after an idle period (default: {REQUEST_BURST})")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="most requests in flight at once; the limit adapts below this to errors "
+                             "and latency (default: every worker, tab and HTTP thread)")
+    parser.add_argument('--tabs', type=int, default=1,
+                        help="product pages each browser loads in parallel tabs (default: 1)")
+    parser.add_argument('--http', action='store_true',
+                        help="fetch product pages over HTTP with the browser's session, "
+                             "falling back to the browser for pages that need JavaScript")
+    parser.add_argument('--capture', action='store_true',
+                        help="decode products from the listing pages' API responses and only "
+                             "visit product pages for fields those responses lack")
+    parser.add_argument('--http-threads', type=int, default=HTTP_THREADS,
+                        help=f"concurrent HTTP requests per browser (default: {HTTP_THREADS})")
+    parser.add_argument('--page-param', default=PAGE_PARAM,
+                        help=f"listing URL parameter that selects the page (default: {PAGE_PARAM})")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                        help="output format, written as products are extracted (default: csv)")
+    parser.add_argument('--output', default=None,
+                        help="output file (default: sysco_products_<timestamp>.<format>)")
+    parser.add_argument('--images', metavar='DIR', default=None,
+                        help="after scraping, download every product image into this content-addressed "
+                             "cache and add each record's local copy as an image_path column")
+    parser.add_argument('--image-threads', type=int, default=IMAGE_THREADS,
+                        help=f"concurrent image downloads (default: {IMAGE_THREADS})")
+    parser.add_argument('--dedup-index', default=None, metavar='PATH',
+                        help="persist the URL/SKU dedup index to this JSON file so later runs "
+                             "skip products it already holds")
+    parser.add_argument('--incremental', metavar='PREVIOUS_CSV', default=None,
+                        help="only refetch products that are new or whose listing card changed "
+                             "since this snapshot; also writes a <output>_delta file")
+    parser.add_argument('--journal', default=None,
+                        help="journal file recording progress (default: sysco_journal_<timestamp>.db)")
+    parser.add_argument('--resume', metavar='JOURNAL', default=None,
+                        help="resume an interrupted run from its journal, skipping finished work")
+    parser.add_argument('--retry-attempts', type=int, default=DEAD_LETTER_ATTEMPTS,
+                        help=f"attempts per failed page or product, counting the first "
+                             f"(default: {DEAD_LETTER_ATTEMPTS})")
+    parser.add_argument('--retry-every', type=float, metavar='MINUTES', default=None,
+                        help="also run the retry pass between categories this often (single browser only)")
+    parser.add_argument('--retry-only', action='store_true',
+                        help="with --resume, only retry the journal's dead-lettered pages and products")
+    parser.add_argument('--frontier', metavar='PATH', default=None,
+                        help="split one crawl across processes or machines through this shared SQLite "
+                             "work frontier")
+    parser.add_argument('--role', choices=['coordinator', 'worker'], default='worker',
+                        help="with --frontier: the coordinator seeds categories, works units and writes the "
+                             "merged output; workers only work units (default: worker)")
+    parser.add_argument('--log-json', metavar='PATH', default=None,
+                        help="append structured JSON events (timings, retries, run summary) to this file")
+    parser.add_argument('--metrics-file', metavar='PATH', default=None,
+                        help="write the run's metrics to this Prometheus textfile (.prom)")
+    args = parser.parse_args(argv)
+    if args.retry_only and not args.resume:
+        parser.error("--retry-only needs the journal to retry, given with --resume")
+    if (args.block or args.unblock) and args.profile != 'lean':
+        parser.error("--block and --unblock only apply to --profile lean")
+    unknown = [pattern for pattern in args.unblock if pattern not in LEAN_BLOCKED_URLS]
+    if unknown:
+        parser.error(f"--unblock {unknown[0]} is not one of the lean profile's default patterns")
+    return args
 
-def main():
+def main(argv=None):
     """Main execution function that orchestrates the complete web scraping workflow.
     
     Coordinates the entire scraping process including driver setup, authentication,
@@ -486,72 +3897,226 @@ def main():
     error recovery throughout the process.
     
     The function processes all available categories and collects product information
-    until completion, then saves all collected data to a CSV file.
+    until completion, then saves all collected data to a CSV file. With more than
+    one worker, categories and their pages are spread over a pool of browsers.
+    
+    Args:
+        argv (list[str], optional): Command line arguments. Defaults to sys.argv.
     """
     # Main execution function
+    args = parse_args(argv)
+    options = vars(args)
     driver = None
-    all_products = []
+    total_products = 0
+    completed = False  # Every category was crawled without stopping early
+    finished = False  # The run got to the end without crashing or being interrupted
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    if args.log_json:
+        open_metrics_log(args.log_json)
+    frontier = open_frontier(args.frontier) if args.frontier else None
+    
+    # One request budget and adaptive concurrency limit for every browser, tab and HTTP thread
+    per_worker = max(args.tabs, 1) + (args.http_threads if args.http else 0)
+    configure_scheduler(args.rate, args.burst, args.max_concurrency or max(args.workers, 1) * per_worker)
+    
+    # A frontier worker stores its products in the frontier; the coordinator journals and writes them
+    # (options is vars(args), so --journal is read before its key is reused for the handle)
+    worker = frontier is not None and args.role == 'worker' and not args.zips
+    journal_path = args.resume or args.journal or f"sysco_journal_{timestamp}.db"
+    journal = options['journal'] = None
+    sink = options['sink'] = None
+    saved = 0
+    if not worker:
+        journal = options['journal'] = open_journal(journal_path)
+        print(f"{'Resuming from' if args.resume else 'Journaling to'} {journal_path}")
+        
+        # Products are streamed to the output as they are extracted; a resumed run
+        # first replays what the journal already holds
+        output_path = args.output or f"sysco_products_{timestamp}.{args.format}"
+        sink = options['sink'] = open_sink(output_path, args.format,
+                                           fields=MULTI_ZIP_FIELDS if args.zips else None)
+    dedup = options['dedup'] = open_dedup_index(args.dedup_index)
+    
+    incremental = None
+    if args.incremental and not worker:
+        # Products missing from the snapshot only count as removed after a full crawl
+        options['target_items'] = None
+        base, extension = os.path.splitext(output_path)
+        incremental = options['incremental'] = open_incremental(
+            args.incremental, f"{base}_delta{extension}", args.format)
+    
+    # A resumed multi-ZIP run reuses the journaled product content but reads every listing again
+    if args.resume and not args.zips and not worker:
+        for product in iter_journal_products(journal):
+            sink_write(sink, product)
+        total_products = sink['count']
+        print(f"Replayed {total_products} journaled products")
     
     try:
-        driver = setup_driver()
+        if args.zips:
+            # Every ZIP code runs its own guest session; the steps below happen per ZIP
+            total_products = scrape_multi_zip(args.zips, options)
+            print(f"\nSUCCESS! Wrote {total_products} SKU x ZIP rows")
+            finished = True
+            return
+        
+        driver = setup_browser(options)
         
-        # Step 1: Authenticate as guest
-        if not initial_auth(driver):
+        # Step 1: Authenticate as guest (or restore a cached guest session)
+        if not start_session(driver, options):
             print("Authentication failed!")
             return
         
         print("Authentication successful!")
+        options['home_url'] = driver.current_url  # Where recycled browsers reopen the session
         
-        # Step 2: Get category URLs 
-        categories = get_all_categories(driver)
+        # A frontier worker only works the shared units; the coordinator seeds and merges them
+        if worker:
+            print(f"Working units of the shared frontier {args.frontier} as {frontier['node']}")
+            http_session = build_http_session(driver, args.http_threads) if args.http else None
+            driver = run_frontier_worker(driver, frontier, options, http_session)
+            return
+        
+        # Step 2: Get category URLs (a resumed run reuses the ones it discovered)
+        categories = journal_get(journal, 'categories') if args.resume else None
+        if not categories:
+            categories = get_categories(driver, options)
+            if categories:
+                journal_set(journal, 'categories', categories)
         if not categories:
             print("No categories found!")
             return
         
+        all_categories = categories
+        categories = [cat for cat in categories if not journal_is_done(journal, 'category', cat['url'])]
+        if args.retry_only:
+            categories = []  # Only work through the journal's dead-letter queue
         print(f"Found {len(categories)} categories to process")
         
-        # Step 3: Process each category until we get 3000+ items
-        for category in categories:
-            print(f"\nProcessing category: {category['name']}")
-            
-            # Navigate to category page
-            driver.get(category['url'])
-            time.sleep(3)
-            
-            # Get all products from this category
-            products = process_products(driver)
-            
-            if products:
-                all_products.extend(products)
-                print(f"Collected {len(products)} products from {category['name']}")
-                print(f"Total items so far: {len(all_products)}")
+        if frontier:
+            # Seed the shared frontier, work it alongside the worker nodes, then merge their results
+            for category in categories:
+                frontier_add(frontier, 'category', category['url'], {'name': category['name']})
+            frontier_set(frontier, 'seeded', True)
+            print(f"Seeded {args.frontier} with {len(categories)} categories")
+            http_session = build_http_session(driver, args.http_threads) if args.http else None
+            driver = run_frontier_worker(driver, frontier, options, http_session)
+            total_products += merge_frontier_products(frontier, options)
+            print(f"Merged {total_products} products from the frontier: {frontier_status(frontier)}")
+            categories = []
+        
+        # Step 3: Process categories until we get 3000+ items
+        http_session = None
+        if args.workers > 1 and categories:
+            print(f"Scraping with {args.workers} parallel workers")
+            # The pool takes ownership of this browser and closes it when done
+            total_products += scrape_with_pool(categories, args.workers, driver, options)
+            driver = None
+        else:
+            http_session = build_http_session(driver, args.http_threads) if args.http else None
+            supervisor = start_supervisor(driver, options)
+            last_retry = time.time()
+            for category in categories:
+                print(f"\nProcessing category: {category['name']}")
                 
-                # Check if we've reached our goal
-                if len(all_products) >= 3000:
-                    print("Reached 3000 items target!")
-                    break
-            else:
-                print(f"No products collected from {category['name']}")
-
+                # Navigate to category page
+                with request_slot() as slot:
+                    driver.get(category['url'])
+                    slot['failed'] = not wait_until(driver, EC.presence_of_element_located(
+                        (By.CLASS_NAME, "catalog-cards-wrapper")), 'category', required=False)
+                
+                # Get all products from this category (the supervisor may swap the browser)
+                products = process_products(driver, options, http_session, category['url'], supervisor)
+                driver = supervisor['driver']
+                
+                if products:
+                    total_products += products
+                    print(f"Collected {products} products from {category['name']}")
+                    print(f"Total items so far: {total_products}")
+                    
+                    # Check if we've reached our goal
+                    if target_reached(options, total_products):
+                        print(f"Reached {target_items(options)} items target!")
+                        break
+                else:
+                    print(f"No products collected from {category['name']}")
+                
+                if driver is None:
+                    print("Browser could not be recycled, stopping")
+                    return
+                
+                # Work through the dead-letter queue on a schedule as well as at the end
+                if args.retry_every and time.time() - last_retry >= args.retry_every * 60:
+                    total_products += retry_dead_letters(driver, options, http_session, until_exhausted=False)
+                    last_retry = time.time()
+        
+        # Step 4: Retry pass over the pages and products that failed above (or in the resumed run)
+        if not target_reached(options, total_products):
+            if driver is None:
+                driver = setup_browser(options)
+                if not start_session(driver, options):
+                    print("Authentication failed, leaving the dead-letter queue for a later --retry-only run")
+                    return
+            if args.http and http_session is None:
+                http_session = build_http_session(driver, args.http_threads)
+            total_products += retry_dead_letters(driver, options, http_session)
+        
         # print("\nFinished processing ALL categories")
+        left = len(dead_letters(journal, 'page')) + len(dead_letters(journal, 'product', args.retry_attempts))
+        if left:
+            print(f"{left} pages and products are still dead-lettered in {journal_path}")
+        # Complete only if every category had all its pages journaled (a target stop leaves some undone)
+        completed = not left and all(journal_is_done(journal, 'category', category['url'])
+                                     for category in all_categories)
         
-        # Step 4: Save results
-        if all_products:
-            save_to_csv(all_products)
-            print(f"\nSUCCESS! Processed {len(all_products)} products total")
+        # Step 5: Results were streamed to the output while scraping
+        if total_products:
+            print(f"\nSUCCESS! Processed {total_products} products total")
         else:
             print("\nNo products collected at all")
+        finished = True
             
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
         
     finally:
+        if incremental:
+            # Products missing from a run that stopped early were not necessarily removed
+            incremental_finish(incremental, complete=completed)
+        dedup_report(dedup)
+        dedup_save(dedup)
+        if sink:
+            saved = sink_close(sink)
+            if saved:
+                print(f"\nData saved to {output_path}")
+            else:
+                os.remove(output_path)
+        if journal:
+            journal_close(journal)
+        if frontier:
+            frontier['conn'].close()
         print("Closing browser...")
         if driver:
             try:
                 driver.quit()
             except:
                 pass  # Ignore errors when closing crashed driver
+        
+        # Images are only fetched for a run that finished, once its browser is gone
+        if args.images and saved and finished:
+            try:
+                add_image_paths(output_path, args.format, sink['fields'], args.images, args.image_threads)
+            except Exception as e:
+                print(f"Image download stage failed: {str(e)}")
+        
+        # Per-phase timing report for the whole run
+        summary = metrics_summary()
+        print_metrics_report(summary)
+        log_event('summary', **summary)
+        close_metrics_log()
+        if args.metrics_file:
+            write_prometheus_textfile(args.metrics_file, summary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
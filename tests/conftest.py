@@ -0,0 +1,16 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import pytest  # noqa: E402
+
+import sysco_scraper  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_scheduler(monkeypatch):
+    """Gives each test its own copy of the global request scheduler (main() and some tests reconfigure it)."""
+    monkeypatch.setattr(sysco_scraper, '_scheduler', dict(sysco_scraper._scheduler))
@@ -0,0 +1,25 @@
+"""URL patterns blocked by the lean browser profile."""
+import pytest
+
+import sysco_scraper
+
+
+def blocked(argv, monkeypatch):
+    seen = []
+    monkeypatch.setattr(sysco_scraper, 'setup_driver', lambda **kwargs: seen.append(kwargs['block_patterns']))
+    sysco_scraper.setup_browser(vars(sysco_scraper.parse_args(argv)))
+    return seen[0]
+
+
+def test_defaults_can_be_unblocked(monkeypatch):
+    patterns = blocked(['--profile', 'lean', '--block', '*chat-widget*', '--unblock', '*.svg'], monkeypatch)
+    assert '*.svg' not in patterns
+    assert '*.png' in patterns and patterns[-1] == '*chat-widget*'
+    assert blocked(['--profile', 'lean'], monkeypatch) is None  # setup_driver's defaults
+
+
+@pytest.mark.parametrize('argv', [['--block', '*chat-widget*'], ['--unblock', '*.svg'],
+                                  ['--profile', 'lean', '--unblock', '*.bmp']])
+def test_block_options_are_checked(argv):
+    with pytest.raises(SystemExit):
+        sysco_scraper.parse_args(argv)
@@ -0,0 +1,50 @@
+"""Content cache shared by the ZIP sessions of a multi-ZIP run."""
+import threading
+
+import sysco_scraper
+
+LINK = 'https://shop.example/app/product-details/opco/056/product/1000001'
+
+
+class WatchedEvent(threading.Event):
+    """Event that signals once somebody is waiting on it."""
+    
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Event()
+    
+    def wait(self, timeout=None):
+        self.waiting.set()
+        return super().wait(timeout)
+
+
+def test_waiters_get_the_owners_partial_record(tmp_path):
+    journal = sysco_scraper.open_journal(str(tmp_path / 'journal.db'))
+    cache = sysco_scraper.open_content_cache(journal)
+    partial = {'sku': '1000001', 'name': "Banana"}
+    started, release = threading.Event(), threading.Event()
+    fetches = []
+    
+    def slow_fetch(link):
+        fetches.append(link)
+        started.set()
+        release.wait(5)
+        return partial
+    owner = threading.Thread(target=sysco_scraper.cached_content, args=(cache, LINK, slow_fetch))
+    owner.start()
+    started.wait(5)
+    inflight = cache['inflight'][sysco_scraper.canonical_product_url(LINK)]
+    inflight['done'] = WatchedEvent()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(
+        sysco_scraper.cached_content(cache, LINK + '?ref=zip', slow_fetch)))
+    waiter.start()
+    inflight['done'].waiting.wait(5)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    
+    assert results == [partial]
+    assert fetches == [LINK]
+    assert sysco_scraper.journal_get_product(journal, LINK) is None  # Too few fields to cache
+    sysco_scraper.journal_close(journal)
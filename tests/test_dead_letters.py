@@ -0,0 +1,55 @@
+"""Retry pass over the dead-letter queue kept in the run journal."""
+
+import pytest
+
+import sysco_scraper
+
+LINK = 'https://shop.example/app/product-details/opco/056/product/1234567'
+
+
+@pytest.fixture
+def options(tmp_path):
+    options = {'journal': sysco_scraper.open_journal(str(tmp_path / 'journal.db')),
+               'sink': sysco_scraper.open_sink(str(tmp_path / 'products.csv')),
+               'dedup': sysco_scraper.open_dedup_index(None), 'retry_attempts': 3}
+    yield options
+    sysco_scraper.sink_close(options['sink'])
+    sysco_scraper.journal_close(options['journal'])
+
+
+def test_partial_product_is_written_once_attempts_run_out(options, monkeypatch):
+    partial = dict.fromkeys(sysco_scraper.PRODUCT_FIELDS, "N/A")
+    partial.update(sku='1234567', name='Banana Petite Fresh')
+    calls = []
+    monkeypatch.setattr(sysco_scraper, 'extract_product_details',
+                        lambda driver, link, *args: calls.append(link) or dict(partial))
+    sysco_scraper.dead_letter_add(options['journal'], 'product', LINK, "partial record", {'partial': partial})
+    
+    assert sysco_scraper.retry_dead_letters(None, options) == 1
+    assert len(calls) == 2  # Attempts 2 and 3; the main pass was attempt 1
+    assert options['sink']['count'] == 1
+    assert sysco_scraper.dead_letters(options['journal'], 'product', 3) == []
+
+
+def test_periodic_pass_runs_a_single_round(options, monkeypatch):
+    monkeypatch.setattr(sysco_scraper, 'extract_product_details', lambda driver, link, *args: None)
+    sysco_scraper.dead_letter_add(options['journal'], 'product', LINK, "extraction failed")
+    
+    assert sysco_scraper.retry_dead_letters(None, options, until_exhausted=False) == 0
+    assert [item['attempts'] for item in sysco_scraper.dead_letters(options['journal'], 'product')] == [2]
+
+
+def test_units_that_raise_stay_queued(options, monkeypatch):
+    def dead_browser(*args, **kwargs):
+        raise sysco_scraper.WebDriverException("no such window")
+    monkeypatch.setattr(sysco_scraper, 'extract_product_details', dead_browser)
+    monkeypatch.setattr(sysco_scraper, 'scrape_page', dead_browser)
+    sysco_scraper.dead_letter_add(options['journal'], 'product', LINK, "extraction failed")
+    sysco_scraper.dead_letter_page(options['journal'], 'https://shop.example/app/catalog', 2, 4, "could not open page")
+    
+    assert sysco_scraper.retry_dead_letters(None, options) == 0
+    assert sysco_scraper.dead_letters(options['journal'], 'page', 3) == []
+    assert sysco_scraper.dead_letters(options['journal'], 'product', 3) == []
+    queued = [item for kind in ('page', 'product') for item in sysco_scraper.dead_letters(options['journal'], kind)]
+    assert [item['attempts'] for item in queued] == [3, 3]
+    assert all(item['reason'].startswith("error:") for item in queued)
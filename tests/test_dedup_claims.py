@@ -0,0 +1,31 @@
+"""URL claims of the dedup index around product extraction."""
+import pytest
+
+import sysco_scraper
+
+LINKS = [f'https://shop.example/app/product-details/opco/056/product/{sku}' for sku in ('1000001', '1000002')]
+
+
+def test_claims_are_released_when_extraction_raises(monkeypatch):
+    options = {'dedup': sysco_scraper.open_dedup_index(None)}
+    
+    def dead_browser(*args, **kwargs):
+        raise sysco_scraper.WebDriverException("no such window")
+    monkeypatch.setattr(sysco_scraper, 'extract_products_in_browser', dead_browser)
+    with pytest.raises(sysco_scraper.WebDriverException):
+        sysco_scraper.scrape_current_page(None, 1, 1, options, product_links=list(LINKS))
+    
+    # The page's retry must be able to claim its links again
+    assert all(sysco_scraper.dedup_claim(options['dedup'], link) for link in LINKS)
+
+
+def test_recorded_products_stay_claimed(monkeypatch):
+    options = {'dedup': sysco_scraper.open_dedup_index(None)}
+    full = {field: 'x' for field in sysco_scraper.PRODUCT_FIELDS}
+    monkeypatch.setattr(sysco_scraper, 'extract_products_in_browser',
+                        lambda driver, links, *args: {link: dict(full, sku=link[-7:]) for link in links[:1]})
+    products = sysco_scraper.scrape_current_page(None, 1, 1, options, product_links=list(LINKS))
+    
+    assert len(products) == 1
+    assert not sysco_scraper.dedup_claim(options['dedup'], LINKS[0])
+    assert sysco_scraper.dedup_claim(options['dedup'], LINKS[1])  # Failed without a journal: released
@@ -0,0 +1,32 @@
+"""Shared work frontier of a multi-node crawl."""
+import sysco_scraper
+
+
+def test_target_stop_leaves_units_pending(tmp_path):
+    frontier = sysco_scraper.open_frontier(str(tmp_path / 'frontier.db'))
+    full = {field: 'x' for field in sysco_scraper.PRODUCT_FIELDS}
+    for sku in ('1000001', '1000002'):
+        sysco_scraper.frontier_add_product(frontier, f'https://shop.example/product/{sku}', dict(full, sku=sku))
+    sysco_scraper.frontier_add(frontier, 'product', 'https://shop.example/product/1000003')
+    
+    options = {'target_items': 2, 'home_url': 'https://shop.example/app/dashboard'}
+    assert sysco_scraper.run_frontier_worker(None, frontier, options) is None
+    
+    # Stopping for the target neither leases the next unit nor charges it an attempt
+    state, attempts = frontier['conn'].execute("SELECT state, attempts FROM units").fetchone()
+    assert (state, attempts) == ('pending', 0)
+    frontier['conn'].close()
+
+
+def test_worker_node_writes_no_journal_or_output(tmp_path, monkeypatch):
+    seen = []
+    
+    def no_browser(options):
+        seen.append((options['journal'], options['sink']))
+        raise RuntimeError("chrome not reachable")
+    monkeypatch.setattr(sysco_scraper, 'setup_browser', no_browser)
+    sysco_scraper.main(['--frontier', str(tmp_path / 'frontier.db'), '--role', 'worker',
+                        '--output', str(tmp_path / 'out.csv'), '--journal', str(tmp_path / 'journal.db')])
+    
+    assert seen == [(None, None)]
+    assert sorted(path.name for path in tmp_path.iterdir() if not path.name.startswith('frontier.db')) == []
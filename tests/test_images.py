@@ -0,0 +1,61 @@
+"""Post-extraction image stage against the mock site's image route."""
+import csv
+
+import pytest
+
+import mock_sysco_server
+import sysco_scraper
+
+
+@pytest.fixture
+def server():
+    server = mock_sysco_server.start_server()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_output(path, image_urls):
+    sink = sysco_scraper.open_sink(str(path), 'csv')
+    for index, image_url in enumerate(image_urls):
+        sysco_scraper.sink_write(sink, {'sku': str(1000000 + index), 'name': f"Product {index}",
+                                        'image_url': image_url})
+    sysco_scraper.sink_close(sink)
+    return str(path)
+
+
+def test_image_paths_are_written_back_and_cached(server, tmp_path):
+    rendition = server.base_url + "images/rendition?id="
+    image_urls = [rendition + 'aa11', rendition + 'bb22', rendition + 'aa11', "N/A"]
+    cache_dir = str(tmp_path / 'images')
+    output = write_output(tmp_path / 'run1.csv', image_urls)
+    
+    linked = sysco_scraper.add_image_paths(output, 'csv', list(sysco_scraper.PRODUCT_FIELDS), cache_dir, threads=2)
+    with open(output, newline='', encoding='utf-8') as file:
+        records = list(csv.DictReader(file))
+    
+    assert linked == 3
+    assert server.stats['images'] == 2  # The shared rendition is fetched once
+    assert records[0]['image_path'] == records[2]['image_path'] != records[1]['image_path']
+    assert records[0]['image_path'].startswith(cache_dir) and records[0]['image_path'].endswith('.gif')
+    assert records[3]['image_path'] == "N/A"
+    
+    # A re-run finds every image in the cache and requests none
+    output = write_output(tmp_path / 'run2.csv', image_urls[:2])
+    assert sysco_scraper.add_image_paths(output, 'csv', list(sysco_scraper.PRODUCT_FIELDS), cache_dir) == 2
+    assert server.stats['images'] == 2
+
+
+def test_crashed_run_skips_images(tmp_path, monkeypatch):
+    def crashing_browser(options):
+        # Something was written before the crash, so the output is kept
+        sysco_scraper.sink_write(options['sink'], {'sku': '1000001', 'image_url': "N/A"})
+        raise RuntimeError("chrome not reachable")
+    called = []
+    monkeypatch.setattr(sysco_scraper, 'setup_browser', crashing_browser)
+    monkeypatch.setattr(sysco_scraper, 'add_image_paths', lambda *args, **kwargs: called.append(args))
+    sysco_scraper.main(['--output', str(tmp_path / 'out.csv'), '--journal', str(tmp_path / 'journal.db'),
+                        '--images', str(tmp_path / 'images')])
+    
+    assert (tmp_path / 'out.csv').exists()
+    assert not called
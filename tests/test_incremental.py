@@ -0,0 +1,30 @@
+"""Incremental re-scrapes against a previous snapshot."""
+import csv
+
+import sysco_scraper
+
+LINKS = ['https://shop.example/app/product-details/opco/056/product/1000001',
+         'https://shop.example/app/catalog/banana-petite-fresh']  # No SKU in the second URL
+
+
+def test_reused_rows_are_deduplicated_by_sku(tmp_path, monkeypatch):
+    previous = dict.fromkeys(sysco_scraper.PRODUCT_FIELDS, 'x')
+    previous['sku'] = '1000001'
+    with open(tmp_path / 'previous.csv', 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=sysco_scraper.PRODUCT_FIELDS)
+        writer.writeheader()
+        writer.writerow(previous)
+    incremental = sysco_scraper.open_incremental(str(tmp_path / 'previous.csv'), str(tmp_path / 'delta.csv'))
+    options = {'incremental': incremental, 'dedup': sysco_scraper.open_dedup_index(None),
+               'sink': sysco_scraper.open_sink(str(tmp_path / 'products.csv'))}
+    monkeypatch.setattr(sysco_scraper, 'incremental_unchanged',
+                        lambda driver, links, incremental: {link: incremental['previous']['1000001'] for link in links})
+    
+    # The same SKU listed under two URLs is reused once, even when only the record names it
+    products = sysco_scraper.scrape_current_page(None, 1, 1, options, product_links=list(LINKS))
+    
+    assert len(products) == 1
+    assert options['sink']['count'] == 1
+    assert incremental['counts']['unchanged'] == 1
+    sysco_scraper.sink_close(options['sink'])
+    sysco_scraper.sink_close(incremental['delta'])
@@ -0,0 +1,34 @@
+"""Wait timeouts learned from observed readiness latencies."""
+import pytest
+
+import sysco_scraper
+
+
+@pytest.fixture(autouse=True)
+def fresh_samples(monkeypatch):
+    monkeypatch.setattr(sysco_scraper, '_wait_samples', {})
+
+
+def test_conditions_on_one_page_type_learn_separately():
+    for _ in range(50):
+        sysco_scraper.record_wait('product', 0.1, 'presence_of_element_located')
+    
+    assert sysco_scraper.learned_timeout('product', 'presence_of_element_located') == sysco_scraper.WAIT_MIN_TIMEOUT
+    assert sysco_scraper.learned_timeout('product', 'product_fields_rendered') == sysco_scraper.WAIT_TIMEOUTS['product']
+
+
+def test_timeouts_let_the_limit_recover_after_a_slow_spell():
+    for _ in range(50):
+        sysco_scraper.record_wait('listing', 0.1, 'element_count_stable')
+    limit = sysco_scraper.learned_timeout('listing', 'element_count_stable')
+    for _ in range(10):
+        sysco_scraper.record_wait('listing', limit, 'element_count_stable')  # Waits that gave up
+    
+    assert sysco_scraper.learned_timeout('listing', 'element_count_stable') > limit
+
+
+def test_condition_names():
+    assert sysco_scraper.condition_name(sysco_scraper.EC.presence_of_element_located(('id', 'x'))) == \
+        'presence_of_element_located'
+    assert sysco_scraper.condition_name(sysco_scraper.element_count_stable('div')) == 'element_count_stable'
+    assert sysco_scraper.condition_name(sysco_scraper.document_ready) == 'document_ready'
@@ -0,0 +1,80 @@
+"""Direct paging through the page URL parameter, and its fallback to pagination clicks."""
+from types import SimpleNamespace
+
+import pytest
+
+import sysco_scraper
+
+CATEGORY = 'https://shop.example/app/catalog?category=produce'
+
+
+class FakeSite:
+    """Listing pages whose page number is not shown, with or without a working page parameter."""
+
+    def __init__(self, honours_param):
+        self.honours_param = honours_param
+        self.page = None
+        self.loads = []
+
+    def load(self, driver, url):
+        self.loads.append(url)
+        page = int(dict(sysco_scraper.parse_qsl(sysco_scraper.urlsplit(url).query)).get('page', 1))
+        self.page = page if self.honours_param else 1
+
+    def first_link(self, driver):
+        return f"https://shop.example/product/{self.page}-1"
+
+    def next_page(self, driver):
+        self.page += 1
+        return True
+
+
+@pytest.fixture
+def site(monkeypatch):
+    def install(honours_param):
+        fake = FakeSite(honours_param)
+        monkeypatch.setattr(sysco_scraper, '_direct_paging', {'supported': None, 'first_links': {}})
+        monkeypatch.setattr(sysco_scraper, 'load_listing', fake.load)
+        monkeypatch.setattr(sysco_scraper, 'first_card_link', fake.first_link)
+        monkeypatch.setattr(sysco_scraper, 'go_to_next_page', fake.next_page)
+        monkeypatch.setattr(sysco_scraper, 'current_page_number', lambda driver: None)
+        return fake
+    return install
+
+
+def test_ignored_parameter_without_page_number_falls_back_to_clicks(site):
+    fake = site(honours_param=False)
+    assert sysco_scraper.open_category_page(None, CATEGORY, 3)
+    assert fake.page == 3
+    assert sysco_scraper._direct_paging['supported'] is False
+
+
+def test_honoured_parameter_without_page_number_is_proven_by_the_cards(site):
+    fake = site(honours_param=True)
+    assert sysco_scraper.open_category_page(None, CATEGORY, 3)
+    assert fake.page == 3
+    assert sysco_scraper._direct_paging['supported'] is True
+    
+    fake.loads.clear()
+    assert sysco_scraper.open_category_page(None, CATEGORY, 4)
+    assert fake.loads == [sysco_scraper.category_page_url(CATEGORY, 4)]
+
+
+def test_unreadable_cards_do_not_decide_for_later_pages(site, monkeypatch):
+    fake = site(honours_param=False)
+    monkeypatch.setattr(sysco_scraper, 'first_card_link', lambda driver: None)
+    assert sysco_scraper.open_category_page(None, CATEGORY, 2)
+    assert fake.page == 2
+    assert sysco_scraper._direct_paging['supported'] is None
+
+
+def test_page_one_cards_are_kept_per_browser_session(site):
+    fake = site(honours_param=True)
+    first, second = SimpleNamespace(session_id='a'), SimpleNamespace(session_id='b')
+    assert sysco_scraper.open_category_page(first, CATEGORY, 1)
+    
+    # Another session (e.g. another ZIP code) may list other products, so it loads its own page 1
+    fake.loads.clear()
+    assert sysco_scraper.open_category_page(second, CATEGORY, 3)
+    assert fake.loads == [CATEGORY, sysco_scraper.category_page_url(CATEGORY, 3)]
+    assert sysco_scraper._direct_paging == {'supported': True, 'first_links': {}}
@@ -0,0 +1,53 @@
+"""HTML fallback parser against the saved product page fixture."""
+import os
+
+import pytest
+
+import sysco_scraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'fixtures')
+
+
+@pytest.fixture
+def product_html():
+    with open(os.path.join(FIXTURES, 'product_page.html'), encoding='utf-8') as file:
+        return file.read()
+
+
+def test_fixture_fields(product_html):
+    assert sysco_scraper.parse_product_html(product_html) == {
+        'sku': '3641412',
+        'brand': 'Packer',
+        'name': 'Banana Petite Fresh',
+        'packaging': '1/75CT',
+        'image_url': 'https://mediacdn.sysco.com/images/rendition?id=fe256956b13d5c939b1c66569401c8851ec99870',
+        'description': 'Product description is not available',
+    }
+
+
+@pytest.mark.parametrize('markup', ['Line one<br/>Line two <b>bold</b>',
+                                    'Line one<br>Line two <b>bold</b>',
+                                    'Line one<br />Line two<img src="x.png"/> <b>bold</b>'])
+def test_void_tags_do_not_truncate_description(product_html, markup):
+    html = product_html.replace('Product description is not available', markup)
+    details = sysco_scraper.parse_product_html(html)
+    assert details['description'] == 'Line one Line two bold'
+    assert details['name'] == 'Banana Petite Fresh'
+
+
+def test_nested_markup_closes_field_at_its_own_end_tag(product_html):
+    html = product_html.replace('Product description is not available',
+                                '<p>First <span>part</span></p>\n<p>second</p>')
+    assert sysco_scraper.parse_product_html(html)['description'] == 'First part second'
+
+
+def test_json_ld_fills_missing_fields():
+    html = ('<html><body><div data-id="product_name">Lime Fresh</div>'
+            '<script type="application/ld+json">{"@type": "Product", "sku": "4543013", '
+            '"brand": {"name": "Packer"}, "name": "Ignored", "description": "Limes"}</script></body></html>')
+    details = sysco_scraper.parse_product_html(html)
+    assert details['name'] == 'Lime Fresh'
+    assert details['sku'] == '4543013'
+    assert details['brand'] == 'Packer'
+    assert details['description'] == 'Limes'
+    assert details['packaging'] == 'N/A'
@@ -0,0 +1,33 @@
+"""Products a resumed run already replayed from its journal."""
+import sysco_scraper
+
+LINKS = [f'https://shop.example/app/product-details/opco/056/product/{sku}' for sku in ('1000001', '1000002')]
+
+
+def test_journaled_products_are_not_counted_again(tmp_path, monkeypatch):
+    journal = sysco_scraper.open_journal(str(tmp_path / 'journal.db'))
+    full = {field: 'x' for field in sysco_scraper.PRODUCT_FIELDS}
+    sysco_scraper.journal_add_product(journal, LINKS[0], dict(full, sku='1000001'))
+    extracted = []
+    
+    def extract(driver, links, *args):
+        extracted.extend(links)
+        return {link: dict(full, sku=link[-7:]) for link in links}
+    monkeypatch.setattr(sysco_scraper, 'extract_products_in_browser', extract)
+    products = sysco_scraper.scrape_current_page(None, 1, 1, {'journal': journal}, product_links=list(LINKS))
+    
+    assert extracted == LINKS[1:]
+    assert [product['sku'] for product in products] == ['1000002']
+    sysco_scraper.journal_close(journal)
+
+
+def test_journal_is_written_to_the_given_path(tmp_path, monkeypatch):
+    def no_browser(options):
+        raise RuntimeError("chrome not reachable")
+    monkeypatch.setattr(sysco_scraper, 'setup_browser', no_browser)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'runs').mkdir()
+    sysco_scraper.main(['--output', str(tmp_path / 'out.csv'), '--journal', str(tmp_path / 'runs' / 'journal.db')])
+    
+    assert (tmp_path / 'runs' / 'journal.db').exists()
+    assert not list(tmp_path.glob('sysco_journal_*'))
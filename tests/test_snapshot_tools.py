@@ -0,0 +1,93 @@
+import csv
+
+import pytest
+
+import snapshot_tools
+
+FIELDS = ['sku', 'name', 'packaging']
+
+PACKAGING_CASES = [
+    ('1/75CT', (1, 75.0, 75.0, 'CT')),
+    ('4/10#AVG', (4, 10.0, 10.0, 'LB')),
+    ('9/16Z', (9, 16.0, 16.0, 'OZ')),
+    ('228/.7 OZ', (228, 0.7, 0.7, 'OZ')),
+    ('5 LB', (1, 5.0, 5.0, 'LB')),
+    ('80/5.00', (80, 5.0, 5.0, None)),
+    ('9/16"', (9, 16.0, 16.0, 'IN')),
+    ('1/22-25#', (1, 22.0, 25.0, 'LB')),
+    ('5/EACH', (5, 1.0, 1.0, 'EA')),
+    ('1/BLK', (1, 1.0, 1.0, 'BLK')),
+    ('36/9X6X2', (None, None, None, None)),
+    ('360/3/8OZ', (None, None, None, None)),
+    ('Read More"', (None, None, None, None)),
+    ('', (None, None, None, None)),
+    (None, (None, None, None, None)),
+]
+
+def parsed(columns, index):
+    return tuple(columns[name][index] for name in snapshot_tools.PACKAGING_COLUMNS)
+
+@pytest.mark.parametrize('value,expected', PACKAGING_CASES)
+def test_normalize_packaging_rows(value, expected):
+    assert parsed(snapshot_tools.normalize_packaging_rows([value]), 0) == expected
+
+@pytest.mark.skipif(snapshot_tools.pa is None, reason="pyarrow not installed")
+def test_vectorized_matches_row_path():
+    values = [value for value, _ in PACKAGING_CASES]
+    with open(snapshot_tools.__file__.replace('snapshot_tools.py', 'sysco_products_20250807_233732.csv'),
+              newline='', encoding='utf-8') as file:
+        values += [record['packaging'] for record in csv.DictReader(file)]
+    assert snapshot_tools.normalize_packaging(values) == snapshot_tools.normalize_packaging_rows(values)
+
+def write_snapshot(path, records):
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    return str(path)
+
+@pytest.fixture
+def snapshots(tmp_path):
+    old = [{'sku': str(sku), 'name': f"Product {sku}", 'packaging': '1/5#'} for sku in range(100, 160)]
+    new = [dict(record) for record in old[5:]]
+    for record in new[:7]:
+        record['packaging'] = '2/5#'
+    new[10]['name'] += " NEW"
+    new += [{'sku': str(sku), 'name': f"New {sku}", 'packaging': '1/EA'} for sku in range(200, 204)]
+    new.append({'sku': 'N/A', 'name': "No SKU", 'packaging': ''})
+    paths = {
+        'old': write_snapshot(tmp_path / 'old.csv', list(reversed(old))),
+        'new': write_snapshot(tmp_path / 'new.csv', new[::2] + new[1::2]),
+        'old_sorted': write_snapshot(tmp_path / 'old_sorted.csv', old),
+        'new_sorted': write_snapshot(tmp_path / 'new_sorted.csv',
+                                     sorted((r for r in new if r['sku'] != 'N/A'), key=lambda r: r['sku'])),
+    }
+    return paths
+
+def run_diff(old_path, new_path, **kwargs):
+    stats = snapshot_tools.new_diff_stats()
+    changes = {(change['change'], change['sku']): sorted(change['changed_fields'])
+               for change in snapshot_tools.diff_snapshots(old_path, new_path, stats=stats, **kwargs)}
+    return changes, stats
+
+def test_diff_strategies_agree(snapshots):
+    hashed, stats = run_diff(snapshots['old'], snapshots['new'])
+    partitioned, _ = run_diff(snapshots['old'], snapshots['new'], partition_mb=0.001)
+    merged, _ = run_diff(snapshots['old_sorted'], snapshots['new_sorted'], strategy='merge')
+    
+    assert {key for key in hashed if key[0] == 'removed'} == {('removed', str(sku)) for sku in range(100, 105)}
+    assert {key for key in hashed if key[0] == 'added'} == {('added', str(sku)) for sku in range(200, 204)}
+    assert hashed[('changed', '105')] == ['packaging']
+    assert hashed[('changed', '115')] == ['name']
+    assert len([key for key in hashed if key[0] == 'changed']) == 8
+    assert (stats['added'], stats['removed'], stats['changed'], stats['unkeyed']) == (4, 5, 8, 1)
+    assert partitioned == hashed
+    assert merged == hashed
+
+def test_diff_fields_limits_comparison(snapshots):
+    changes, _ = run_diff(snapshots['old'], snapshots['new'], fields=['name'])
+    assert [key for key in changes if key[0] == 'changed'] == [('changed', '115')]
+
+def test_merge_rejects_unsorted_input(snapshots):
+    with pytest.raises(ValueError):
+        run_diff(snapshots['old'], snapshots['new'], strategy='merge')
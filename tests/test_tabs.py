@@ -0,0 +1,75 @@
+"""Parallel-tab product extraction against a fake browser."""
+import time
+
+import sysco_scraper
+
+
+class FakeTabs:
+    """Browser whose product pages show their description `late` seconds after the other fields."""
+
+    def __init__(self, late=0.3, loaded_after=0.3):
+        self.handles = ['main']
+        self.current = 'main'
+        self.opened = {}
+        self.late = late
+        self.loaded_after = loaded_after
+        self.switch_to = self
+
+    def window(self, handle):
+        self.current = handle
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    def age(self):
+        return time.time() - self.opened[self.current][1]
+
+    def execute_script(self, script, *args):
+        if script == sysco_scraper.TAB_SETTLED_SCRIPT:
+            return self.age() > self.loaded_after
+        handle = f'tab{len(self.opened) + 1}'
+        self.handles.append(handle)
+        self.opened[handle] = (args[0], time.time())
+
+    def find_elements(self, by, value):
+        return [object()]
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def fields(self):
+        link = self.opened[self.current][0]
+        details = {field: f'{field} of {link}' for field in sysco_scraper.PRODUCT_FIELDS}
+        if self.age() < self.late:
+            details['description'] = "N/A"
+        return details
+
+
+def run(monkeypatch, driver, links, timeout=5):
+    monkeypatch.setattr(sysco_scraper, 'read_product_fields', lambda d, verbose=True: d.fields())
+    monkeypatch.setattr(sysco_scraper, 'extract_product_details',
+                        lambda d, link, *args: {'sku': 'fallback'})
+    sysco_scraper.configure_scheduler(rate=0)  # Undone by the isolated_scheduler fixture in conftest.py
+    return sysco_scraper.extract_products_in_tabs(driver, links, 2, timeout=timeout)
+
+
+def test_tabs_wait_for_late_fields_before_harvesting(monkeypatch):
+    driver = FakeTabs()
+    results = run(monkeypatch, driver, ['a', 'b', 'c'])
+    
+    assert [results[link]['description'] for link in 'abc'] == ['description of a', 'description of b',
+                                                                 'description of c']
+    assert driver.handles == ['main'] and driver.current == 'main'
+
+
+def test_loaded_page_is_harvested_without_its_missing_field(monkeypatch):
+    driver = FakeTabs(late=60, loaded_after=0.2)
+    results = run(monkeypatch, driver, ['a'])
+    
+    assert results['a']['description'] == "N/A"
+    assert results['a']['name'] == 'name of a'